@@ -1,4 +1,7 @@
-from typing import Iterator, Optional
+import pickle
+from array import array
+import numpy as np
+from typing import Callable, Iterator, Optional, SupportsIndex
 from Event import Event
 from abc import abstractmethod
 
@@ -6,14 +9,22 @@ class BoundList:
     """
     A list-like container for managing bounds (pairs of start and end positions).
     
-    This class maintains a list of bounds (tuples of integers representing start and end positions)
+    This class maintains a list of bounds (pairs of integers representing start and end positions)
     and tracks statistics about the events within and between these bounds.
+
+    Starts and ends are stored in two parallel compact arrays. A slice is a view
+    sharing the arrays of the sliced list (O(1)), it is copied only when it is
+    modified. Positions stored before the end of a list are never overwritten:
+    a list appends in place only if it ends at the end of its arrays.
     
     Attributes:
         durty (bool): Flag indicating if the bound list has been modified
-        _list (list[tuple[int, int]]): Internal list of bounds
-        __nbEventsInsideBounds (int): Total number of events within all bounds
-        __nbEventBetweenBounds (int): Total number of events between consecutive bounds
+        _starts (array[int]): Start position of the bounds (possibly shared)
+        _ends (array[int]): End position of the bounds (possibly shared)
+        _begin (int): Index in the arrays of the first bound of the list
+        _end (int): Index in the arrays following the last bound of the list
+        __nbEventsInsideBounds (Optional[int]): Total number of events within all bounds, None until computed for a view
+        __nbEventBetweenBounds (Optional[int]): Total number of events between consecutive bounds, None until computed for a view
     """
     def __init__(self, initial_list:list[tuple[int, int]]) -> None:
         """
@@ -22,13 +33,16 @@ class BoundList:
         Args:
             initial_list (list[tuple[int, int]]): Initial list of bounds to copy
         """
-        # Initialiser la liste
-        self._list:list[tuple[int, int]] = []
+        # Initialiser les tableaux des débuts et des fins
+        self._starts:array[int] = array('i')
+        self._ends:array[int] = array('i')
+        self._begin:int = 0
+        self._end:int = 0
 
         # Accumulation du nombre d'évènements de chaque bounds
-        self.__nbEventsInsideBounds:int = 0
+        self.__nbEventsInsideBounds:Optional[int] = 0
         # Accumulation du nombre d'évènement entre les différents bounds
-        self.__nbEventBetweenBounds:int = 0
+        self.__nbEventBetweenBounds:Optional[int] = 0
 
         # Copie de la liste
         for bound in initial_list:
@@ -36,6 +50,16 @@ class BoundList:
         
         self.durty:bool = True
 
+    # Calcule les compteurs de proximité à partir des tableaux (cas d'une vue dont les compteurs n'ont pas encore été calculés)
+    def __computeCounters(self) -> None:
+        size:int = self._end - self._begin
+        starts:memoryview = memoryview(self._starts)[self._begin:self._end]
+        ends:memoryview = memoryview(self._ends)[self._begin:self._end]
+        self.__nbEventsInsideBounds = sum(ends) - sum(starts) + size
+        self.__nbEventBetweenBounds = sum(starts[1:]) - sum(ends[:-1]) - (size-1) if size > 0 else 0
+        starts.release()
+        ends.release()
+
     @property
     def nbEventsInsideBounds(self) -> int:
         """
@@ -44,7 +68,9 @@ class BoundList:
         Returns:
             int: Total number of events within bounds
         """
-        return self.__nbEventsInsideBounds
+        if self.__nbEventsInsideBounds == None:
+            self.__computeCounters()
+        return self.__nbEventsInsideBounds # type: ignore
     
     @property
     def nbEventsBetweenBounds(self) -> int:
@@ -54,7 +80,33 @@ class BoundList:
         Returns:
             int: Total number of events between bounds
         """
-        return self.__nbEventBetweenBounds
+        if self.__nbEventBetweenBounds == None:
+            self.__computeCounters()
+        return self.__nbEventBetweenBounds # type: ignore
+
+    @property
+    def starts(self) -> memoryview:
+        """
+        Get the start positions of the bounds without copying them.
+
+        The returned view must be released (or dropped) before appending to the list.
+
+        Returns:
+            memoryview: Start position of each bound
+        """
+        return memoryview(self._starts)[self._begin:self._end]
+
+    @property
+    def ends(self) -> memoryview:
+        """
+        Get the end positions of the bounds without copying them.
+
+        The returned view must be released (or dropped) before appending to the list.
+
+        Returns:
+            memoryview: End position of each bound
+        """
+        return memoryview(self._ends)[self._begin:self._end]
 
     def __getitem__(self, index:int) -> tuple[int, int]:
         """
@@ -65,8 +117,16 @@ class BoundList:
             
         Returns:
             tuple[int, int]: The bound at the specified index
+
+        Raises:
+            IndexError: If the index is out of range
         """
-        return self._list[index]
+        size:int = self._end - self._begin
+        if index < 0:
+            index += size
+        if index < 0 or index >= size:
+            raise IndexError("BoundList index out of range")
+        return (self._starts[self._begin+index], self._ends[self._begin+index])
         
     def __iter__(self) -> Iterator[tuple[int, int]]:
         """
@@ -75,7 +135,7 @@ class BoundList:
         Returns:
             Iterator[tuple[int, int]]: Iterator over the bounds
         """
-        return iter(self._list)  # Renvoie un itérateur de la liste
+        return zip(self._starts[self._begin:self._end], self._ends[self._begin:self._end])
 
     def __len__(self) -> int:
         """
@@ -84,7 +144,7 @@ class BoundList:
         Returns:
             int: Number of bounds
         """
-        return len(self._list)
+        return self._end - self._begin
         
     def __eq__ (self, other:object) -> bool:
         """
@@ -96,11 +156,13 @@ class BoundList:
         Returns:
             bool: True if the lists contain the same bounds in the same order
         """
-        return isinstance(other, BoundList) and len(self._list) == len(other._list) and self._list == other._list
+        return isinstance(other, BoundList) and len(self) == len(other) and self.starts == other.starts and self.ends == other.ends
     
     def slice(self, start:int, stop:int, step:int=1) -> "BoundList":
         """
         Create a new BoundList containing a slice of bounds.
+
+        A contiguous slice is a view sharing the arrays of this list.
         
         Args:
             start (int): Start index
@@ -110,7 +172,25 @@ class BoundList:
         Returns:
             BoundList: New BoundList containing the specified slice
         """
-        return BoundList(self._list[start:stop:step])
+        start, stop, step = slice(start, stop, step).indices(len(self))
+        if step != 1:
+            return BoundList(list(self)[start:stop:step])
+        view:BoundList = BoundList([])
+        view._starts = self._starts
+        view._ends = self._ends
+        view._begin = self._begin + start
+        view._end = self._begin + max(start, stop)
+        # Les compteurs de la vue ne sont calculés qu'à la demande
+        view.__nbEventsInsideBounds = None
+        view.__nbEventBetweenBounds = None
+        return view
+
+    # Copie les bounds de la liste dans des tableaux propres (avant une modification d'une liste qui ne termine pas ses tableaux)
+    def __detach(self) -> None:
+        self._starts = self._starts[self._begin:self._end]
+        self._ends = self._ends[self._begin:self._end]
+        self._begin = 0
+        self._end = len(self._starts)
 
     def append(self, newBound:tuple[int, int]) -> None:
         """
@@ -119,19 +199,57 @@ class BoundList:
         Args:
             newBound (tuple[int, int]): New bound to append
         """
+        if self.__nbEventsInsideBounds == None:
+            self.__computeCounters()
+        if self._end != len(self._starts):
+            self.__detach()
         # ajout du nouveau bound à la liste
-        self._list.append(newBound)
+        self._starts.append(newBound[0])
+        self._ends.append(newBound[1])
+        self._end += 1
         # mise à jour des données utiles au calcul des proximités
-        self.__nbEventsInsideBounds += newBound[1] - newBound[0] + 1
-        if len(self._list) > 1:
-            self.__nbEventBetweenBounds += self._list[-1][0] - self._list[-2][1] - 1 # comptabiliser le nombre d'évènement entre le dernier bound (celui que l'on vient d'ajouter) et l'avant dernier
+        self.__nbEventsInsideBounds += newBound[1] - newBound[0] + 1 # type: ignore
+        if len(self) > 1:
+            self.__nbEventBetweenBounds += newBound[0] - self._ends[self._end-2] - 1 # type: ignore # comptabiliser le nombre d'évènement entre le dernier bound (celui que l'on vient d'ajouter) et l'avant dernier
         self.durty = True
     
     def reverse(self) -> None:
         """
         Reverse the order of bounds in the list.
         """
-        self._list.reverse()
+        self.__detach()
+        self._starts.reverse()
+        self._ends.reverse()
+
+    @classmethod
+    def fromArrays(cls, starts:'array[int]', ends:'array[int]', nbEventsInsideBounds:int, nbEventsBetweenBounds:int) -> 'BoundList':
+        """
+        Create a BoundList owning the given arrays of bounds.
+
+        Args:
+            starts (array[int]): Start position of the bounds, kept without copy
+            ends (array[int]): End position of the bounds, kept without copy
+            nbEventsInsideBounds (int): Total number of events within all bounds
+            nbEventsBetweenBounds (int): Total number of events between consecutive bounds
+
+        Returns:
+            BoundList: New bound list using the arrays as storage
+        """
+        boundlist:BoundList = cls([])
+        boundlist._starts = starts
+        boundlist._ends = ends
+        boundlist._end = len(starts)
+        boundlist.__nbEventsInsideBounds = nbEventsInsideBounds
+        boundlist.__nbEventBetweenBounds = nbEventsBetweenBounds
+        return boundlist
+
+    # Sérialisation sans copie intermédiaire : avec le protocole 5 (transmission aux processus de travail) les tableaux sont exposés directement au pickler
+    def __reduce_ex__(self, protocol:SupportsIndex) -> tuple[Callable[..., "BoundList"], tuple[bytes | pickle.PickleBuffer, bytes | pickle.PickleBuffer, int, int, bool]]:
+        starts:memoryview = self.starts
+        ends:memoryview = self.ends
+        if protocol.__index__() >= 5:
+            return (_rebuildBoundList, (pickle.PickleBuffer(starts), pickle.PickleBuffer(ends), self.nbEventsInsideBounds, self.nbEventsBetweenBounds, self.durty))
+        return (_rebuildBoundList, (starts.tobytes(), ends.tobytes(), self.nbEventsInsideBounds, self.nbEventsBetweenBounds, self.durty))
 
     def __repr__(self) -> str:
         """
@@ -141,7 +259,7 @@ class BoundList:
             str: Debug representation of the BoundList
         """
         # Représentation pour l'impression
-        return repr(self._list)
+        return repr(list(self))
 
     def __str__(self) -> str:
         """
@@ -151,7 +269,17 @@ class BoundList:
             str: String representation of the bounds
         """
         # Représentation pour l'impression
-        return str(self._list)
+        return str(list(self))
+
+# Reconstruit une BoundList sérialisée par BoundList.__reduce_ex__
+def _rebuildBoundList(starts:bytes, ends:bytes, nbEventsInsideBounds:int, nbEventsBetweenBounds:int, durty:bool) -> BoundList:
+    startsArray:array[int] = array('i')
+    startsArray.frombytes(memoryview(starts).cast('B'))
+    endsArray:array[int] = array('i')
+    endsArray.frombytes(memoryview(ends).cast('B'))
+    boundlist:BoundList = BoundList.fromArrays(startsArray, endsArray, nbEventsInsideBounds, nbEventsBetweenBounds)
+    boundlist.durty = durty
+    return boundlist
 
 class Episode:
     """
@@ -204,6 +332,122 @@ class Episode:
         """
         return isinstance(other, Episode) and self.event == other.event and self.boundlist == other.boundlist
 
+# Journal des comparaisons de scores. Pour des statistiques fixées, le score ne dépend que de WEIGHT_SUPPORT et PROXIMITY_BALANCING : le journal permet de savoir si d'autres valeurs de ces paramètres donnent le même résultat à chacune des comparaisons (voir MAP.Behaviour)
+class ScoreLog:
+    """
+    Log of the comparisons of scores.
+
+    Each comparison is logged with the statistics the two scores depend on
+    (see getStatistics) and its outcome. Replaying these statistics with
+    other values of WEIGHT_SUPPORT and PROXIMITY_BALANCING tells whether every
+    comparison would have had the same outcome. The logs of sub-computations
+    are kept by reference (see extend), they must not be modified afterwards:
+    a log shared by several others is only replayed once for given values.
+
+    Attributes:
+        statistics (list[tuple[bool, int, int, int, int, int, int]]): The
+            distinct statistics of the compared scores (see getStatistics)
+        comparisons (set[tuple[int, int, int]]): For each comparison, the
+            indices of the statistics of both scores and the sign of their difference
+        children (dict[int, ScoreLog]): Logs of the sub-computations, by id
+        complete (bool): False if some comparisons were made in other processes
+            and could not be logged
+    """
+    def __init__(self) -> None:
+        """
+        Initialize a new empty ScoreLog.
+        """
+        self.statistics:list[tuple[bool, int, int, int, int, int, int]] = []
+        self.comparisons:set[tuple[int, int, int]] = set()
+        self.children:dict[int, ScoreLog] = {}
+        self.complete:bool = True
+        # Résultat de isEquivalent pour les paramètres déjà testés
+        self._verdicts:dict[tuple[float, float], bool] = {}
+        self._indices:dict[tuple[bool, int, int, int, int, int, int], int] = {}
+        # Statistiques et comparaisons sous forme de tableaux (voir isEquivalent)
+        self._arrays:Optional[tuple[np.ndarray, np.ndarray]] = None
+
+    @staticmethod
+    def getStatistics(item:"Scorable") -> tuple[bool, int, int, int, int, int, int]:
+        """
+        Get the statistics the score of an item depends on.
+
+        Args:
+            item (Scorable): The scored item
+
+        Returns:
+            tuple[bool, int, int, int, int, int, int]: Whether the item is a
+                BoundGraph, its support, the number of events inside and between
+                its bounds, the length of its event and of its episode and MAX_SUP
+        """
+        return (isinstance(item, BoundGraph), item.getSupport(), item.getNbEventsInsideBounds(), item.getNbEventsBetweenBounds(), item.getEventLength(), item.getEpisodeLength(), NonOverlappedEpisode.MAX_SUP)
+
+    def compare(self, a:"Scorable", b:"Scorable") -> None:
+        """
+        Log the comparison of the scores of two items.
+
+        Args:
+            a (Scorable): The first item
+            b (Scorable): The second item
+        """
+        scoreA:float = a.getScore()
+        scoreB:float = b.getScore()
+        indices:list[int] = []
+        for item in (a, b):
+            statistics:tuple[bool, int, int, int, int, int, int] = item.getStatistics()
+            if statistics not in self._indices:
+                self._indices[statistics] = len(self.statistics)
+                self.statistics.append(statistics)
+            indices.append(self._indices[statistics])
+        self.comparisons.add((indices[0], indices[1], 1 if scoreA > scoreB else (0 if scoreA == scoreB else -1)))
+
+    def extend(self, other:"ScoreLog") -> None:
+        """
+        Add the log of a sub-computation to this one (by reference).
+
+        Args:
+            other (ScoreLog): The log to add, not to be modified afterwards
+        """
+        if other is not self:
+            self.children[id(other)] = other
+            self.complete = self.complete and other.complete
+
+    def isEquivalent(self, ws:float, pb:float) -> bool:
+        """
+        Check whether every logged comparison, including those of the
+        sub-computations, has the same outcome with other values of
+        WEIGHT_SUPPORT and PROXIMITY_BALANCING.
+
+        Args:
+            ws (float): Weight support factor
+            pb (float): Proximity balancing factor
+
+        Returns:
+            bool: True if all the comparisons have the same outcome
+        """
+        if (ws, pb) not in self._verdicts:
+            self._verdicts[(ws, pb)] = self.__replay(ws, pb) and all(child.isEquivalent(ws, pb) for child in self.children.values())
+        return self._verdicts[(ws, pb)]
+
+    def __replay(self, ws:float, pb:float) -> bool:
+        # Rejoue les comparaisons propres à ce journal
+        if len(self.comparisons) == 0:
+            return True
+        if self._arrays == None or self._arrays[0].shape[0] != len(self.statistics) or self._arrays[1].shape[0] != len(self.comparisons):
+            self._arrays = (np.array(self.statistics, dtype=np.int64), np.array(sorted(self.comparisons), dtype=np.int64))
+        statistics, comparisons = self._arrays
+        # Mêmes opérations que Scorable.getScore (via scoreBatch) et BoundGraph.getScore pour obtenir exactement les mêmes valeurs
+        previous:tuple[float, float] = (NonOverlappedEpisode.WEIGHT_SUPPORT, NonOverlappedEpisode.PROXIMITY_BALANCING)
+        NonOverlappedEpisode.WEIGHT_SUPPORT, NonOverlappedEpisode.PROXIMITY_BALANCING = ws, pb
+        try:
+            scores:np.ndarray = scoreBatch(statistics[:, 1], statistics[:, 2], statistics[:, 3], statistics[:, 4], statistics[:, 5], statistics[:, 6])
+        finally:
+            NonOverlappedEpisode.WEIGHT_SUPPORT, NonOverlappedEpisode.PROXIMITY_BALANCING = previous
+        scores = np.where(statistics[:, 0] == 1, statistics[:, 1]+scores, scores)
+        left:np.ndarray = scores[comparisons[:, 0]]
+        right:np.ndarray = scores[comparisons[:, 1]]
+        return bool(np.array_equal(np.where(left > right, 1, np.where(left == right, 0, -1)), comparisons[:, 2]))
+
 class Scorable:
     """
     Abstract base class for objects that can be scored.
@@ -214,12 +458,21 @@ class Scorable:
     
     Attributes:
         _score (float): Cached score value, -1 indicates not yet calculated
+        _statistics (Optional[tuple[bool, int, int, int, int, int, int]]): Cached
+            statistics of the score for the ScoreLog, None if not yet computed
+
+    Class Attributes:
+        SCORE_LOG (Optional[ScoreLog]): If set, the comparisons of scores are logged
     """
+    # SCORE_LOG records the comparisons of scores (see ScoreLog). None disables the log.
+    SCORE_LOG:Optional[ScoreLog] = None
+
     def __init__ (self) -> None:
         """
         Initialize a new Scorable object with an invalid score.
         """
         self._score:float = -1
+        self._statistics:Optional[tuple[bool, int, int, int, int, int, int]] = None
         
     @abstractmethod
     def getSupport(self) -> int:
@@ -303,6 +556,8 @@ class Scorable:
         Returns:
             bool: True if this object should be considered less than the other
         """
+        if Scorable.SCORE_LOG != None:
+            Scorable.SCORE_LOG.compare(self, other)
         # Détermine si un Scorable est plus petit qu'un autre Scorable en fonction de son score. Comme on veut en premier le Scorable avec le score le plus fort (voir insort de PTKE::saveInTopK) on considère qu'un Scorable avec un score plus fort est considéré plus petit qu'un scorable avec un code plus faible. En inversant ainsi la logique on maintient la liste des topk triée du meilleur score au moins bon score
         if self.getScore() > other.getScore() or (self.getScore() == other.getScore() and self.getSupport() > other.getSupport()):
             return True
@@ -352,12 +607,77 @@ class Scorable:
                 print ("BUUUG")
 
             # Si WEIGHT_SUPPORT == 1 prise en compte uniquement du support, si == 0 prise en compte uniquement de la longueur du pattern du support
-            self._score = NonOverlappedEpisode.WEIGHT_SUPPORT*part1 + (1-NonOverlappedEpisode.WEIGHT_SUPPORT)*part2
-
-            self.setDurty(False)
+            self.setScore(NonOverlappedEpisode.WEIGHT_SUPPORT*part1 + (1-NonOverlappedEpisode.WEIGHT_SUPPORT)*part2)
         
         return self._score        
 
+    def getStatistics(self) -> tuple[bool, int, int, int, int, int, int]:
+        """
+        Get the statistics of the score of this object (see ScoreLog.getStatistics).
+
+        Returns:
+            tuple[bool, int, int, int, int, int, int]: Cached statistics of the score
+        """
+        # Les statistiques sont conservées tant que le score n'est pas recalculé
+        if self._statistics == None:
+            self._statistics = ScoreLog.getStatistics(self)
+        return self._statistics
+
+    def setScore(self, score:float) -> None:
+        """
+        Cache a score computed elsewhere (see NonOverlappedEpisode.scoreAll).
+
+        Args:
+            score (float): The score, computed as getScore would do
+        """
+        self._score = score
+        self._statistics = None
+        self.setDurty(False)
+
+    def invalidateScore(self) -> None:
+        """
+        Invalidate the cached score and statistics so that they are recalculated.
+        """
+        self._score = -1
+        self._statistics = None
+        self.setDurty(True)
+
+# Calcule en une fois les scores d'un lot d'épisodes, selon la même formule que Scorable.getScore (les opérations sont effectuées dans le même ordre pour obtenir exactement les mêmes valeurs)
+#
+# :return: le score de chaque épisode, -1 pour ceux dont le support est inférieur à 2
+def scoreBatch(supports:np.ndarray, nbEventsInsideBounds:np.ndarray, nbEventsBetweenBounds:np.ndarray, eventLengths:np.ndarray, episodeLengths:np.ndarray, maxSups:Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Compute the scores of a batch of episodes at once.
+
+    The formula and the order of the floating point operations are those of
+    Scorable.getScore, so that both give exactly the same scores. The class
+    attributes of NonOverlappedEpisode (WEIGHT_SUPPORT, PROXIMITY_BALANCING
+    and MAX_SUP) are used.
+
+    Args:
+        supports (np.ndarray): Support of each episode
+        nbEventsInsideBounds (np.ndarray): Number of events within the bounds of each episode
+        nbEventsBetweenBounds (np.ndarray): Number of events between the bounds of each episode
+        eventLengths (np.ndarray): Length of the event of each episode
+        episodeLengths (np.ndarray): Span of each episode
+        maxSups (Optional[np.ndarray], optional): MAX_SUP of each episode, if
+            they were not all scored in the same sequence. Defaults to None
+            (NonOverlappedEpisode.MAX_SUP)
+
+    Returns:
+        np.ndarray: Score of each episode, -1 for the episodes whose support is lower than 2
+    """
+    valid:np.ndarray = supports >= 2
+    part1:np.ndarray = supports/(maxSups if maxSups is not None else NonOverlappedEpisode.MAX_SUP)
+    # Proximité interne (0 si aucun évènement dans les bounds) et externe, les divisions par zéro ne concernent que des épisodes invalides
+    insideProx:np.ndarray = np.zeros(len(supports))
+    np.divide(eventLengths*supports, nbEventsInsideBounds, out=insideProx, where=nbEventsInsideBounds > 0)
+    insideProx = np.where(nbEventsInsideBounds > 0, 1-insideProx, 0)
+    outsideProx:np.ndarray = np.zeros(len(supports))
+    np.divide(nbEventsBetweenBounds, episodeLengths, out=outsideProx, where=valid)
+    part2:np.ndarray = (1-NonOverlappedEpisode.PROXIMITY_BALANCING) * (1-insideProx) + NonOverlappedEpisode.PROXIMITY_BALANCING * (1-outsideProx)
+    return np.where(valid, NonOverlappedEpisode.WEIGHT_SUPPORT*part1 + (1-NonOverlappedEpisode.WEIGHT_SUPPORT)*part2, -1)
+
 class NonOverlappedEpisode(Episode, Scorable):
     """
     An episode implementation that ensures non-overlapping occurrences.
@@ -456,6 +776,33 @@ class NonOverlappedEpisode(Episode, Scorable):
             int: Distance between start of first bound and end of last bound
         """
         return self.boundlist[-1][1] - self.boundlist[0][0]
+
+    @staticmethod
+    def scoreAll(episodes:list["NonOverlappedEpisode"]) -> np.ndarray:
+        """
+        Compute the scores of a list of episodes at once (see scoreBatch).
+
+        The score of each episode is cached as getScore would do.
+
+        Args:
+            episodes (list[NonOverlappedEpisode]): The episodes to score
+
+        Returns:
+            np.ndarray: The score of each episode, as returned by getScore
+        """
+        supports:np.ndarray = np.fromiter((len(e.boundlist) for e in episodes), dtype=np.int64, count=len(episodes))
+        scores:np.ndarray = scoreBatch(supports,
+            np.fromiter((e.boundlist.nbEventsInsideBounds for e in episodes), dtype=np.int64, count=len(episodes)),
+            np.fromiter((e.boundlist.nbEventsBetweenBounds for e in episodes), dtype=np.int64, count=len(episodes)),
+            np.fromiter((e.event.getLength() for e in episodes), dtype=np.int64, count=len(episodes)),
+            np.fromiter((e.getEpisodeLength() if len(e.boundlist) > 0 else 0 for e in episodes), dtype=np.int64, count=len(episodes)))
+        for i, episode in enumerate(episodes):
+            if supports[i] >= 2:
+                episode.setScore(float(scores[i]))
+            else:
+                # Un épisode sans répétition conserve son score courant (voir getScore)
+                scores[i] = episode.getScore()
+        return scores
     
 class BoundGraph (Scorable):
     """
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from abc import abstractmethod
-from typing import Optional
+from typing import Iterator, Optional, overload
 import copy
+import bisect
 
 class Event:
     """
@@ -187,7 +188,8 @@ class Sequence(Event):
     a root sequence or as an optional sequence.
     
     Attributes:
-        event_list (list[Event]): List of events in the sequence
+        event_list (list[Event] | EventRope): List of events in the sequence,
+            the roots built by MAP reference the events of their parent (see EventRope)
         isRoot (bool): Flag indicating if this is a root sequence
         opt (bool): Inherited from Event, indicates if the sequence is optional
     """
@@ -196,7 +198,7 @@ class Sequence(Event):
         Initializes a new empty sequence.
         """
         super().__init__()
-        self.event_list:list[Event] = []
+        self.event_list:list[Event] | EventRope = []
         self.isRoot:bool = False
 
     def __str__(self) -> str:
@@ -613,6 +615,363 @@ class Root:
     def __repr__(self) -> str:
         return "(Op: "+str(self.countOpt)+", Al: "+str(self.countAlign)+", Me: "+str(self.countMerge)+") "+str(self.content)
 
+# Liste d'évènements représentée par une table de morceaux (piece table). Chaque morceau référence un intervalle d'une liste source (typiquement la liste d'évènements du root parent) sans la recopier, seuls les évènements ajoutés par append sont stockés dans un tampon propre à la table. Un root compressé ne coûte ainsi en mémoire que ses modifications par rapport à son parent.
+# Index des structures principales d'une liste source d'EventRope, partagé par toutes les tables de morceaux qui la référencent et complété paresseusement
+class SourceIndex:
+    """
+    Main structures of the events of a list and their positions.
+
+    The index is shared by all the ropes referencing the list and is completed
+    lazily, up to the last position they need. The list must only grow (it is
+    the original trace, a parent's buffer or a compression).
+
+    Attributes:
+        source (list[Event]): The indexed list
+        mainStructures (list[Event]): Main structure of the first events of source
+        positions (dict[Event, list[int]]): Positions in source of each main
+            structure of mainStructures, in the order of their first appearance
+    """
+    def __init__(self, source:list[Event]) -> None:
+        self.source:list[Event] = source
+        self.mainStructures:list[Event] = []
+        self.positions:dict[Event, list[int]] = {}
+
+    def complete(self, stop:int) -> None:
+        """
+        Indexes the events of source up to a position.
+
+        Args:
+            stop (int): Position (exclusive) up to which source is indexed
+        """
+        for i in range(len(self.mainStructures), stop):
+            mainStructure:Event = self.source[i].getMainStructure()
+            self.mainStructures.append(mainStructure)
+            self.positions.setdefault(mainStructure, []).append(i)
+
+class EventRope:
+    """
+    List of events stored as a piece table referencing segments of other lists.
+
+    A compressed root mostly copies long runs of its parent's events, the rope
+    references these runs instead of copying them so that the memory of a root
+    is proportional to its edits. Events appended one by one are stored in a
+    buffer owned by the rope. Random access is O(log p) with p the number of
+    pieces, iteration is linear.
+
+    Only the operations used to build new roots are supported (append, pop,
+    appendSlice), reading follows the list interface (len, indexing, slicing,
+    iteration, equality). Slicing returns a rope referencing the same runs, so
+    that a root can be spliced in O(p) (rope[:i], new events, rope[j:]).
+    Copying or pickling a rope materialises it into a list.
+
+    The rope takes ownership of the lists it references: they must not be
+    modified afterwards, except by appending events at their end (a rope only
+    references the events present when the run was appended). Callers pass
+    a copy of a list they intend to modify.
+
+    Attributes:
+        _sources (list[list[Event]]): Source list of each piece
+        _starts (list[int]): Start index (inclusive) of each piece in its source
+        _stops (list[int]): Stop index (exclusive) of each piece in its source
+        _offsets (list[int]): Position in the rope of the first event of each piece
+        _buffer (list[Event]): Events appended to this rope
+        _length (int): Number of events in the rope
+        _indexes (dict[int, SourceIndex]): Index of each source (by id), shared
+            by all the ropes referencing this source
+    """
+    def __init__(self) -> None:
+        self._sources:list[list[Event]] = []
+        self._starts:list[int] = []
+        self._stops:list[int] = []
+        self._offsets:list[int] = []
+        self._buffer:list[Event] = []
+        self._length:int = 0
+        self._indexes:dict[int, SourceIndex] = {id(self._buffer): SourceIndex(self._buffer)}
+
+    # Ajoute un morceau à la fin de la table en le fusionnant avec le dernier morceau s'il le prolonge
+    def _appendPiece(self, source:list[Event], start:int, stop:int) -> None:
+        if stop <= start:
+            return
+        if len(self._sources) > 0 and self._sources[-1] is source and self._stops[-1] == start:
+            self._stops[-1] = stop
+        else:
+            self._sources.append(source)
+            self._starts.append(start)
+            self._stops.append(stop)
+            self._offsets.append(self._length)
+        self._length += stop-start
+
+    def append(self, event:Event) -> None:
+        """
+        Appends an event at the end of the rope.
+
+        Args:
+            event (Event): The event to append
+        """
+        self._buffer.append(event)
+        self._appendPiece(self._buffer, len(self._buffer)-1, len(self._buffer))
+
+    def pop(self) -> Event:
+        """
+        Removes and returns the last event of the rope.
+
+        Returns:
+            Event: The removed event
+
+        Raises:
+            IndexError: If the rope is empty
+        """
+        if self._length == 0:
+            raise IndexError("pop from empty EventRope")
+        event:Event = self._sources[-1][self._stops[-1]-1]
+        self._stops[-1] -= 1
+        self._length -= 1
+        if self._stops[-1] == self._starts[-1]:
+            self._sources.pop()
+            self._starts.pop()
+            self._stops.pop()
+            self._offsets.pop()
+        return event
+
+    def appendSlice(self, source:list[Event] | EventRope, start:int, stop:int) -> None:
+        """
+        Appends source[start:stop] at the end of the rope without copying it.
+
+        If source is itself a rope, its pieces are referenced directly so that
+        ropes never chain. A plain list is referenced, not copied: the rope
+        takes ownership of it (see EventRope).
+
+        Args:
+            source (list[Event] | EventRope): The events to reference
+            start (int): Start index (inclusive), clamped as for a slice
+            stop (int): Stop index (exclusive), clamped as for a slice
+        """
+        start, stop, _ = slice(start, stop).indices(len(source))
+        if stop <= start:
+            return
+        if isinstance(source, EventRope):
+            piece:int = source._locate(start)
+            while piece < len(source._sources) and source._offsets[piece] < stop:
+                offset:int = source._offsets[piece]
+                pieceStart:int = source._starts[piece] + max(0, start-offset)
+                pieceStop:int = min(source._stops[piece], source._starts[piece] + stop-offset)
+                self._appendPiece(source._sources[piece], pieceStart, pieceStop)
+                # L'index de la source est partagé avec la table d'origine
+                sourceId:int = id(source._sources[piece])
+                if sourceId not in self._indexes:
+                    self._indexes[sourceId] = source._indexes[sourceId]
+                piece += 1
+        else:
+            self._appendPiece(source, start, stop)
+            if id(source) not in self._indexes:
+                self._indexes[id(source)] = SourceIndex(source)
+
+    # Retourne l'indice du morceau contenant la position "pos" (supposée valide)
+    def _locate(self, pos:int) -> int:
+        return bisect.bisect_right(self._offsets, pos)-1
+
+    def materialize(self) -> list[Event]:
+        """
+        Builds the plain list of the events of the rope.
+
+        Returns:
+            list[Event]: A new list containing the events (not copied)
+        """
+        result:list[Event] = []
+        for source, start, stop in zip(self._sources, self._starts, self._stops):
+            result += source[start:stop]
+        return result
+
+    def getMainStructures(self) -> list[Event]:
+        """
+        Builds the list of the main structures of the events of the rope.
+
+        Main structures are memoised per source position: a rope built from
+        another one only computes the main structures of the events it adds,
+        the ones of the referenced runs are those already computed for the
+        parent (or any other rope sharing the source).
+
+        Returns:
+            list[Event]: The main structure of each event, in the rope order
+        """
+        result:list[Event] = []
+        for source, start, stop in zip(self._sources, self._starts, self._stops):
+            index:SourceIndex = self._indexes[id(source)]
+            index.complete(stop)
+            result += index.mainStructures[start:stop]
+        return result
+
+    def getPositions(self) -> dict[Event, list[int]]:
+        """
+        Builds the positions in the rope of the main structure of its events.
+
+        The positions of a piece are those of the index of its source (see
+        SourceIndex) within the piece, shifted by the offset of the piece: a
+        rope built from another one only indexes the events it adds.
+
+        Returns:
+            dict[Event, list[int]]: Positions of each main structure, in the
+                order of their first appearance in the rope
+        """
+        result:dict[Event, list[int]] = {}
+        for source, start, stop, offset in zip(self._sources, self._starts, self._stops, self._offsets):
+            index:SourceIndex = self._indexes[id(source)]
+            index.complete(stop)
+            shift:int = offset-start
+            if stop-start <= len(index.positions):
+                # Morceau court (typiquement des évènements insérés) : parcours direct de ses positions
+                for i in range(start, stop):
+                    result.setdefault(index.mainStructures[i], []).append(i+shift)
+                continue
+            # Structures présentes dans le morceau, dans l'ordre de leur première apparition dans celui-ci
+            present:list[tuple[int, int, Event, list[int]]] = []
+            for mainStructure, positions in index.positions.items():
+                first:int = bisect.bisect_left(positions, start)
+                if first < len(positions) and positions[first] < stop:
+                    present.append((positions[first], first, mainStructure, positions))
+            present.sort(key=lambda item: item[0])
+            for _, first, mainStructure, positions in present:
+                shifted:list[int] = [position+shift for position in positions[first:bisect.bisect_left(positions, stop, first)]]
+                if mainStructure in result:
+                    result[mainStructure] += shifted
+                else:
+                    result[mainStructure] = shifted
+        return result
+
+    def __len__(self) -> int:
+        return self._length
+
+    @overload
+    def __getitem__(self, index:int) -> Event: ...
+    @overload
+    def __getitem__(self, index:slice) -> EventRope: ...
+    def __getitem__(self, index:int | slice) -> Event | EventRope:
+        sliced:EventRope = EventRope()
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                # Pas de morceau contigu : les évènements sont placés dans le tampon de la nouvelle table
+                for event in self.materialize()[index]:
+                    sliced.append(event)
+                return sliced
+            # Vue sur les mêmes morceaux, sans recopie des évènements
+            sliced.appendSlice(self, start, stop)
+            return sliced
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("EventRope index out of range")
+        piece:int = self._locate(index)
+        return self._sources[piece][self._starts[piece] + index-self._offsets[piece]]
+
+    def __iter__(self) -> Iterator[Event]:
+        for source, start, stop in zip(self._sources, self._starts, self._stops):
+            for i in range(start, stop):
+                yield source[i]
+
+    def __eq__(self, other:object) -> bool:
+        if isinstance(other, EventRope):
+            return len(self) == len(other) and all(e1 == e2 for e1, e2 in zip(self, other))
+        return isinstance(other, list) and self.materialize() == other
+
+    def __ne__(self, other:object) -> bool:
+        return not self.__eq__(other)
+
+    # Une table de morceaux est mutable, elle n'est donc pas hashable (comme une liste)
+    __hash__ = None # type: ignore
+
+    def __deepcopy__(self, memo:dict[int, object]) -> list[Event]:
+        # Seuls les évènements effectivement référencés sont copiés, et non l'intégralité des listes sources
+        return copy.deepcopy(self.materialize(), memo)
+
+    def __reduce__(self) -> tuple[type[list[Event]], tuple[list[Event]]]:
+        # Seuls les évènements effectivement référencés sont transmis aux autres processus
+        return (list, (self.materialize(),))
+
+    def __repr__(self) -> str:
+        return "EventRope("+repr(self.materialize())+")"
+
+# Caractères réservés par l'encodage compact des évènements
+ENCODING_RESERVED:str = "[]*{}"
+
+# Encode une liste d'évènements sous une forme textuelle compacte et non ambigüe. L'encodage reprend la forme de Sequence.__str__ (ex : A[B*C]*D) mais les Call dont le nom ne tient pas sur un caractère (ou utilise un caractère réservé) sont encadrés par des accolades (ex : {PP_Open}), les caractères '}' et '\' de leur nom étant précédés d'un '\'
+def encodeEvents(event_list:list[Event] | EventRope) -> str:
+    """
+    Encodes a list of events into a compact and unambiguous string.
+
+    The encoding follows Sequence.__str__ (e.g. A[B*C]*D) except that calls whose
+    name is not a single non reserved character are enclosed in braces, '}'
+    and '\\' being escaped by a '\\' in these names.
+    Two event lists are equal if and only if their encodings are equal.
+
+    Args:
+        event_list (list[Event] | EventRope): The events to encode
+
+    Returns:
+        str: The encoded events
+    """
+    export:str = ''
+    for e in event_list:
+        if isinstance(e, Call):
+            export += e.call if len(e.call) == 1 and e.call not in ENCODING_RESERVED else '{'+e.call.replace('\\', '\\\\').replace('}', '\\}')+'}'
+        elif isinstance(e, Sequence):
+            export += '['+encodeEvents(e.event_list)+']'
+        export += '*' if e.opt else ''
+    return export
+
+# Décode une liste d'évènements encodée par encodeEvents
+def decodeEvents(encoding:str) -> list[Event]:
+    """
+    Decodes a string produced by encodeEvents into a list of events.
+
+    Args:
+        encoding (str): The encoded events
+
+    Returns:
+        list[Event]: The decoded events
+
+    Raises:
+        ValueError: If the encoding is malformed
+    """
+    # Pile des listes d'évènements en cours de construction, la première est la liste résultat
+    stack:list[list[Event]] = [[]]
+    i:int = 0
+    while i < len(encoding):
+        char:str = encoding[i]
+        if char == '[':
+            newSeq:Sequence = Sequence()
+            newEvents:list[Event] = []
+            newSeq.event_list = newEvents
+            stack[-1].append(newSeq)
+            stack.append(newEvents)
+        elif char == ']':
+            if len(stack) == 1:
+                raise ValueError("Event.py => decodeEvents: unbalanced ']' at position "+str(i))
+            stack.pop()
+        elif char == '*':
+            if len(stack[-1]) == 0:
+                raise ValueError("Event.py => decodeEvents: '*' without event at position "+str(i))
+            stack[-1][-1].opt = True
+        elif char == '{':
+            # Nom jusqu'à l'accolade fermante, en retirant les '\' d'échappement
+            name:str = ''
+            end:int = i+1
+            while end < len(encoding) and encoding[end] != '}':
+                if encoding[end] == '\\':
+                    end += 1
+                name += encoding[end:end+1]
+                end += 1
+            if end >= len(encoding):
+                raise ValueError("Event.py => decodeEvents: unclosed '{' at position "+str(i))
+            stack[-1].append(Call(name))
+            i = end
+        else:
+            stack[-1].append(Call(char))
+        i += 1
+    if len(stack) != 1:
+        raise ValueError("Event.py => decodeEvents: unbalanced '['")
+    return stack[0]
+
 # Vérifie si l'évènement à la position "pos" dans "eventList" est optionnel ainsi que l'ensemble des Séquences dans lesquelles cet évènement est inclus
 # Exemple des évènements vérifiés
 #         +---------------+----+
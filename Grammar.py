@@ -0,0 +1,130 @@
+from typing import Optional
+
+# Nombre maximal de règles construites par buildRePairRules
+MAX_RULES:int = 256
+
+# Construit une grammaire Re-Pair sur une séquence de symboles entiers. A chaque tour, la paire de symboles consécutifs la plus fréquente (sans chevauchement) est remplacée par un nouveau symbole (une règle). On s'arrête quand plus aucune paire n'apparaît au moins deux fois
+#
+# :param symbols: la séquence à compresser (non modifiée), les symboles sont des entiers positifs ou nuls
+# :param maxRules: nombre maximal de règles à construire
+# :return: les règles dans leur ordre de création, chaque règle associe son symbole à la paire qu'il remplace
+def buildRePairRules(symbols:list[int], maxRules:int = MAX_RULES) -> dict[int, tuple[int, int]]:
+    """
+    Build a Re-Pair grammar over a sequence of integer symbols.
+
+    At each round the most frequent pair of consecutive symbols (counting non
+    overlapping occurrences) is replaced by a new symbol, i.e. a new rule.
+    Ties are broken by the first occurrence of the pair so that the grammar
+    is deterministic. The construction stops when no pair occurs twice.
+    Each round is linear in the length of the (shrinking) sequence.
+
+    Args:
+        symbols (list[int]): The sequence to compress (not modified), symbols are non negative
+        maxRules (int, optional): Maximum number of rules to build. Defaults to MAX_RULES
+
+    Returns:
+        dict[int, tuple[int, int]]: The rules in creation order, each new symbol
+            being associated to the pair it replaces
+    """
+    rules:dict[int, tuple[int, int]] = {}
+    sequence:list[int] = list(symbols)
+    nextSymbol:int = max(sequence)+1 if len(sequence) > 0 else 0
+    while len(rules) < maxRules:
+        # Comptage des paires sans chevauchement (dans "aaa" la paire "aa" ne compte qu'une fois)
+        counts:dict[tuple[int, int], int] = {}
+        lastPos:dict[tuple[int, int], int] = {}
+        for i in range(len(sequence)-1):
+            pair:tuple[int, int] = (sequence[i], sequence[i+1])
+            if lastPos.get(pair, -2) < i-1:
+                counts[pair] = counts.get(pair, 0)+1
+                lastPos[pair] = i
+        # Paire la plus fréquente, à égalité la première rencontrée (les dictionnaires conservent l'ordre d'insertion)
+        best:Optional[tuple[int, int]] = None
+        for pair, count in counts.items():
+            if count >= 2 and (best == None or count > counts[best]):
+                best = pair
+        if best == None:
+            break
+        rules[nextSymbol] = best
+        # Remplacement de la paire, de gauche à droite
+        newSequence:list[int] = []
+        i:int = 0
+        while i < len(sequence):
+            if i+1 < len(sequence) and sequence[i] == best[0] and sequence[i+1] == best[1]:
+                newSequence.append(nextSymbol)
+                i += 2
+            else:
+                newSequence.append(sequence[i])
+                i += 1
+        sequence = newSequence
+        nextSymbol += 1
+    return rules
+
+# Développe un symbole de la grammaire en la séquence de symboles terminaux qu'il représente
+def expandSymbol(symbol:int, rules:dict[int, tuple[int, int]]) -> list[int]:
+    """
+    Expand a symbol of the grammar into the terminal symbols it stands for.
+
+    Args:
+        symbol (int): The symbol to expand
+        rules (dict[int, tuple[int, int]]): The rules of the grammar
+
+    Returns:
+        list[int]: The terminal symbols (the symbol itself if it is terminal)
+    """
+    expansion:list[int] = []
+    stack:list[int] = [symbol]
+    while len(stack) > 0:
+        current:int = stack.pop()
+        if current in rules:
+            stack.append(rules[current][1])
+            stack.append(rules[current][0])
+        else:
+            expansion.append(current)
+    return expansion
+
+# Trouve les occurrences sans chevauchement (de gauche à droite) d'un motif contigu dans une séquence
+def findOccurrences(symbols:list[int], pattern:list[int]) -> list[tuple[int, int]]:
+    """
+    Find the non overlapping occurrences of a contiguous pattern, from left to right.
+
+    Args:
+        symbols (list[int]): The sequence to search in
+        pattern (list[int]): The pattern to find
+
+    Returns:
+        list[tuple[int, int]]: Start and end (both inclusive) of each occurrence
+    """
+    occurrences:list[tuple[int, int]] = []
+    length:int = len(pattern)
+    i:int = 0
+    while i+length <= len(symbols):
+        if symbols[i] == pattern[0] and symbols[i:i+length] == pattern:
+            occurrences.append((i, i+length-1))
+            i += length
+        else:
+            i += 1
+    return occurrences
+
+# Calcule les répétitions contiguës d'une séquence (le développement de chacune des règles Re-Pair) avec leurs occurrences sans chevauchement
+def getRepeats(symbols:list[int], maxRules:int = MAX_RULES) -> list[tuple[list[int], list[tuple[int, int]]]]:
+    """
+    Get the contiguous repeats of a sequence found by a Re-Pair grammar.
+
+    Args:
+        symbols (list[int]): The sequence to analyse
+        maxRules (int, optional): Maximum number of rules to build. Defaults to MAX_RULES
+
+    Returns:
+        list[tuple[list[int], list[tuple[int, int]]]]: For each rule, in creation
+            order, its expansion and the non overlapping occurrences of this
+            expansion in symbols (only repeats occurring at least twice are kept)
+    """
+    rules:dict[int, tuple[int, int]] = buildRePairRules(symbols, maxRules)
+    repeats:list[tuple[list[int], list[tuple[int, int]]]] = []
+    for symbol in rules:
+        expansion:list[int] = expandSymbol(symbol, rules)
+        occurrences:list[tuple[int, int]] = findOccurrences(symbols, expansion)
+        if len(occurrences) > 1:
+            repeats.append((expansion, occurrences))
+    return repeats
@@ -1,13 +1,32 @@
+from __future__ import annotations
 import copy
+import json
+import os
 import time
-from Episode import NonOverlappedEpisode
-from Event import Event, LinearEventWithStats, Root, Sequence, LinearEvent, mergeLinearSequences
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, wait
+from typing import Any, Iterator, Optional
+import numpy as np
+from Episode import NonOverlappedEpisode, Scorable, ScoreLog
+from Event import Event, EventRope, LinearEventWithStats, Root, Sequence, LinearEvent, decodeEvents, encodeEvents, mergeLinearSequences
 from PTKE import PTKE
 
 
 # init constant values
 PTKE.K = 10
-TIME_LIMIT:int = 5
+TIME_LIMIT:float = 5
+# Intervalle minimal (en secondes) entre deux sauvegardes de l'état d'une exploration (voir MAPState)
+CHECKPOINT_INTERVAL:float = 30
+# Nombre d'évènements de fin de la compression courante réexaminés par OnlineMAP à chaque ajout d'évènements
+ONLINE_CONTEXT:int = 30
+# Version des résultats produits par MAP, à incrémenter à chaque modification de l'algorithme changeant les compressions obtenues (invalide les résultats stockés, voir ResultStore)
+ALGORITHM_VERSION:int = 1
+# Taille nominale (en nombre d'évènements) des segments compressés indépendamment par chunkedMAP
+CHUNK_SIZE:int = 200
+# Journal des tests de fusion des bounds (voir isBoundCloseEnough et MAPWithBehaviour), None si désactivé
+g_fusionLog:Optional[list[tuple[int, int]]] = None
+# Journal des compressions d'évènements intercalés interrompues par TIME_LIMIT, à tout niveau de récursion (voir compressGap et MAPWithBehaviour), None si désactivé
+g_gapOverTimeLog:Optional[list[tuple[str, float, float, float, float]]] = None
 
 class CompressionStats:
     """
@@ -148,11 +167,15 @@ class CompressionSet:
     def to_dict(self) ->list[CompressionStats]:
         """
         Convert the CompressionSet to a list for serialization.
+
+        The compressions are sorted by their string representation so that the
+        serialization doesn't depend on the iteration order of the set (which
+        depends on the process that built it).
         
         Returns:
             list[CompressionStats]: List containing all compression stats
         """
-        return list(self.set)
+        return sorted(self.set, key=str)
      
     @classmethod
     def from_dict(cls, list_:list[CompressionStats]) -> 'CompressionSet':
@@ -168,6 +191,16 @@ class CompressionSet:
         # Convertir la liste en ensemble pour la désérialisation
         return cls(set=set(list_)) # type: ignore
 	
+    # Vérifie si l'exploration ayant produit l'ensemble a été interrompue par TIME_LIMIT (présence du marqueur "OverTime")
+    def isOverTime(self) -> bool:
+        """
+        Check whether the set contains the "OverTime" marker.
+
+        Returns:
+            bool: True if the exploration that built the set was cut by TIME_LIMIT
+        """
+        return any(len(stats.compression.event_list) == 0 for stats in self.set)
+
 	# \brief Vérifie si au moins une des "compressions" est égale à la solution "solution". Retourne 1 si au moins une des compressions est égale à la solution ou -1 si la compression n'est pas allée au bout ("OverTime") ou 2 sinon
 	#
 	# @solution : représente la solution de référence sous la forme d'une liste
@@ -188,13 +221,114 @@ class CompressionSet:
         return 2
 
 
+class CompressionCache:
+    """
+    LRU cache of the compressions computed by MAP.
+    
+    MAP recursively compresses the events intercalated between fused bounds and,
+    in loop structured traces, the same intercalated content is compressed many
+    times. The cache associates a fingerprint of the compressed events and the
+    parameters of the compression with the resulting CompressionSet.
+    
+    A cache is shared by default across one MAP recursion tree. It can also be
+    given explicitly to MAP to be shared across several calls in one process.
+    
+    Attributes:
+        maxSize (int): Maximum number of compressions kept in the cache
+        hits (int): Number of lookups answered by the cache
+        misses (int): Number of lookups not answered by the cache
+    """
+    def __init__(self, maxSize:int = 1024) -> None:
+        """
+        Initialize a new empty CompressionCache.
+        
+        Args:
+            maxSize (int, optional): Maximum number of compressions kept. Defaults to 1024
+        """
+        self.maxSize:int = maxSize
+        self.hits:int = 0
+        self.misses:int = 0
+        self._entries:OrderedDict[tuple[str, float, float, float, float], CompressionSet] = OrderedDict()
+    
+    @property
+    def hitRate(self) -> float:
+        """
+        Get the proportion of lookups answered by the cache.
+        
+        Returns:
+            float: Hit rate in [0, 1], 0 if no lookup has been done
+        """
+        lookups:int = self.hits + self.misses
+        return self.hits/lookups if lookups > 0 else 0
+    
+    def __len__(self) -> int:
+        """
+        Get the number of compressions stored in the cache.
+        
+        Returns:
+            int: Number of stored compressions
+        """
+        return len(self._entries)
+    
+    def __contains__(self, key:tuple[str, float, float, float, float]) -> bool:
+        """
+        Check if a compression is stored in the cache without counting a lookup.
+        
+        Args:
+            key (tuple[str, float, float, float, float]): Fingerprint of the events, gr, ws, pb and time limit
+            
+        Returns:
+            bool: True if the compression is stored
+        """
+        return key in self._entries
+    
+    def get(self, key:tuple[str, float, float, float, float]) -> Optional[CompressionSet]:
+        """
+        Look for a compression in the cache.
+        
+        Args:
+            key (tuple[str, float, float, float, float]): Fingerprint of the events, gr, ws, pb and time limit
+            
+        Returns:
+            Optional[CompressionSet]: A copy of the cached compression or None if not found
+        """
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        # Les compressions sont modifiées par l'appelant (options...), on retourne une copie
+        return copy.deepcopy(self._entries[key])
+    
+    def put(self, key:tuple[str, float, float, float, float], compressions:CompressionSet) -> None:
+        """
+        Store a compression in the cache, evicting the least recently used one if full.
+        
+        Args:
+            key (tuple[str, float, float, float, float]): Fingerprint of the events, gr, ws, pb and time limit
+            compressions (CompressionSet): The compression to store (a copy is stored)
+        """
+        self._entries[key] = copy.deepcopy(compressions)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """
+        Remove all compressions and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
 # Recherche dans la liste "l", l'évènement e à partir de l'indice "start" (inclus), jusqu'à l'indice "end" (exclus) avec comme pas de parcours "step"
-def getIndex(l:list[Event], e:Event, start:int, end:int, step:int)-> int:
+def getIndex(l:list[Event] | EventRope, e:Event, start:int, end:int, step:int)-> int:
     """
     Search for an event in a list with specified direction and range.
     
     Args:
-        l (list[Event]): The list to search in
+        l (list[Event] | EventRope): The list to search in
         e (Event): The event to search for
         start (int): Starting index (inclusive)
         end (int): Ending index (exclusive)
@@ -215,6 +349,61 @@ def getIndex(l:list[Event], e:Event, start:int, end:int, step:int)-> int:
         start += step
     return -1
 
+# Calcule la clé d'une compression d'évènements intercalés dans le cache
+def getGapKey(event_list:list[Event] | EventRope, gr:float, ws:float, pb:float) -> tuple[str, float, float, float, float]:
+    """
+    Get the cache key of the compression of intercalated events.
+    
+    Args:
+        event_list (list[Event] | EventRope): The intercalated events
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        
+    Returns:
+        tuple[str, float, float, float, float]: Fingerprint of the events, gr, ws, pb and time limit
+    """
+    return (encodeEvents(event_list), gr, ws, pb, TIME_LIMIT)
+
+# Compresse des évènements intercalés par un appel récursif à MAP ou récupère leur compression dans le cache
+def compressGap(event_list:list[Event], gr:float, ws:float, pb:float, cache:CompressionCache) -> CompressionSet:
+    """
+    Compress events intercalated between fused bounds.
+    
+    The compression is looked for in the cache first, otherwise MAP is called
+    recursively on a copy of the events and the result is cached.
+    
+    Args:
+        event_list (list[Event]): The intercalated events (not modified)
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        cache (CompressionCache): Cache shared across the recursion tree
+        
+    Returns:
+        CompressionSet: The compressions of the intercalated events, a
+            compression cut by TIME_LIMIT is logged (see logGapOverTime)
+    """
+    key:tuple[str, float, float, float, float] = getGapKey(event_list, gr, ws, pb)
+    result:Optional[CompressionSet] = cache.get(key)
+    if result == None:
+        result = MAP(copy.deepcopy(event_list), gr, ws, pb, cache=cache)
+        cache.put(key, result)
+    logGapOverTime(key, result)
+    return result
+
+# Enregistre dans g_gapOverTimeLog, s'il est activé, la compression d'évènements intercalés qui a été interrompue par TIME_LIMIT
+def logGapOverTime(key:tuple[str, float, float, float, float], result:CompressionSet) -> None:
+    """
+    Log the compression of intercalated events if it was cut by TIME_LIMIT.
+
+    Args:
+        key (tuple[str, float, float, float, float]): Cache key of the compression (see getGapKey)
+        result (CompressionSet): The compressions of the intercalated events
+    """
+    if g_gapOverTimeLog != None and result.isOverTime():
+        g_gapOverTimeLog.append(key)
+
 # Aggrège dans newRoot les Events fusionnés en gérant les Event intercalés entre les bounds englobant les Events fusionnés.
 # newRoot: la nouvelle séquence dans laquelle le résultat de la fusion doit être inséré
 # mergedLinearSequence: le contenu du root fusionné dans l'intervalle mergedBound
@@ -301,152 +490,1347 @@ def aggregateMerge (newRoot:Root, mergedLinearSequence:LinearEventWithStats, mer
 
     # on termine en ajoutant les évènements intercalés jusqu'au début du prochain bound
     # Au final dans notre exemple on se retrouve avec un newRoot de la forme ...AB]C[F*E*G*D*HIF*E*G*D*]JK...
-    newRoot.content.event_list += root.content.event_list[newEndBound+1:nextBoundStart]
+    if isinstance(newRoot.content.event_list, EventRope):
+        # Les évènements repris du root sont référencés et non recopiés
+        newRoot.content.event_list.appendSlice(root.content.event_list, newEndBound+1, nextBoundStart)
+    else:
+        newRoot.content.event_list += root.content.event_list[newEndBound+1:nextBoundStart]
     # mise à jour des stats du nouveau root
     newRoot.countOpt += mergedLinearSequence.countOpt+intercaletedEvents.countOpt
     newRoot.countAlign += mergedLinearSequence.countAlign+intercaletedEvents.countAlign
     newRoot.countMerge += mergedLinearSequence.countMerge+intercaletedEvents.countMerge
 
-# MAP => Mining Algorithm Patterns
-def MAP (event_list:list[Event], gr:float, ws:float, pb:float) -> CompressionSet:
+# Vérifie si l'écart entre la fin de la fusion en cours et la fin du bound courant est inférieur au seuil de fusion
+def isBoundCloseEnough(mergedBound:tuple[int, int], currentBound:tuple[int, int], gr:float, pb:float) -> bool:
     """
-    Mining Algorithm Patterns (MAP) implementation.
+    Check if a bound is close enough to the current fusion to be merged with it.
     
-    This function implements the MAP algorithm which:
-    1. Takes a sequence of events and tries to find recurring patterns
-    2. Uses PTKE to find frequent episodes
-    3. Compresses the sequence by replacing patterns with shorter representations
-    4. Maintains multiple compression candidates in parallel
+    Args:
+        mergedBound (tuple[int, int]): Union of the bounds fused so far
+        currentBound (tuple[int, int]): The next bound of the episode
+        gr (float): Gap ratio
+        pb (float): Proximity balancing factor
+        
+    Returns:
+        bool: True if the bound has to be fused with mergedBound
+    """
+    #return currentBound[1] - mergedBound[1] <= (currentBound[1]-currentBound[0] + 1)*(1 + gr)
+    if g_fusionLog != None:
+        g_fusionLog.append((currentBound[1] - mergedBound[1], currentBound[1]-currentBound[0] + 1))
+    return currentBound[1] - mergedBound[1] <= (currentBound[1]-currentBound[0] + 1)*(1 + gr)*pb
+
+# Liste les intervalles [début, fin[ des évènements intercalés entre les bounds fusionnés d'un épisode, dans l'ordre où simulateCompression les compresse
+def listFusedGaps(bestEpisode:NonOverlappedEpisode, gr:float, pb:float) -> list[tuple[int, int]]:
+    """
+    List the gaps between fused bounds that simulateCompression compresses.
     
     Args:
-        event_list (list[Event]): List of events to analyze
+        bestEpisode (NonOverlappedEpisode): The episode to compress with
+        gr (float): Gap ratio
+        pb (float): Proximity balancing factor
+        
+    Returns:
+        list[tuple[int, int]]: Start (inclusive) and end (exclusive) of each gap in the root
+    """
+    gaps:list[tuple[int, int]] = []
+    mergedBound:tuple[int, int] = bestEpisode.boundlist[0]
+    for k in range(1, len(bestEpisode.boundlist)):
+        currentBound:tuple[int, int] = bestEpisode.boundlist[k]
+        if isBoundCloseEnough(mergedBound, currentBound, gr, pb):
+            if mergedBound[1]+1 < currentBound[0]:
+                gaps.append((mergedBound[1]+1, currentBound[0]))
+            mergedBound = (mergedBound[0], currentBound[1])
+        else:
+            mergedBound = currentBound
+    return gaps
+
+# Point d'entrée de compressGap pour un exécuteur de processus, les évènements intercalés sont transmis encodés (voir encodeEvents)
+def compressGapTask(params:tuple[str, float, float, float, float]) -> CompressionSet:
+    """
+    Entry point of compressGap for a process pool executor.
+    
+    Args:
+        params (tuple[str, float, float, float, float]): Tuple containing:
+            - str: The intercalated events encoded with encodeEvents
+            - float: Gap ratio
+            - float: Weight support factor
+            - float: Proximity balancing factor
+            - float: Time limit of the recursive compressions
+            
+    Returns:
+        CompressionSet: The compressions of the intercalated events
+    """
+    global g_workerCache
+    encodedGap, gr, ws, pb, timeLimit = params
+    setTimeLimit(timeLimit)
+    if g_workerCache == None:
+        g_workerCache = CompressionCache()
+    return compressGap(decodeEvents(encodedGap), gr, ws, pb, g_workerCache)
+
+# Soumet à un exécuteur la compression des évènements intercalés d'un épisode qui ne sont pas déjà dans le cache. Des évènements intercalés identiques ne sont soumis qu'une seule fois
+def submitFusedGaps(root:Root, bestEpisode:NonOverlappedEpisode, gr:float, ws:float, pb:float, cache:CompressionCache, executor:Executor) -> dict[tuple[int, int], tuple[tuple[str, float, float, float, float], Future[CompressionSet]]]:
+    """
+    Submit up front the compressions of the gaps of an episode to an executor.
+    
+    Gaps already cached are not submitted and identical gaps share the same
+    future. Nothing is submitted if less than two compressions are needed.
+    
+    Args:
+        root (Root): The root in which the best episode was found
+        bestEpisode (NonOverlappedEpisode): The episode to compress with
         gr (float): Gap ratio for PTKE
         ws (float): Weight support factor for scoring
         pb (float): Proximity balancing factor
+        cache (CompressionCache): Cache of the recursive compressions
+        executor (Executor): Process pool computing the compressions
         
     Returns:
-        CompressionSet: Set of different possible compressions with their stats
+        dict[tuple[int, int], tuple[tuple[str, float, float, float, float], Future[CompressionSet]]]: For each submitted gap, its cache key and its future
+    """
+    gapKeys:dict[tuple[int, int], tuple[str, float, float, float, float]] = {}
+    for gap in listFusedGaps(bestEpisode, gr, pb):
+        key:tuple[str, float, float, float, float] = getGapKey(root.content.event_list[gap[0]:gap[1]], gr, ws, pb)
+        if key not in cache:
+            gapKeys[gap] = key
+    distinctKeys:set[tuple[str, float, float, float, float]] = set(gapKeys.values())
+    if len(distinctKeys) < 2:
+        return {}
+    futures:dict[tuple[str, float, float, float, float], Future[CompressionSet]] = {key: executor.submit(compressGapTask, key) for key in distinctKeys}
+    return {gap: (key, futures[key]) for gap, key in gapKeys.items()}
+
+# Simule la compression du root à partir d'un des meilleurs épisodes calculés par PTKE. Cette simulation est indépendante des autres épisodes, elle peut donc être exécutée dans un autre processus (voir simulateCompressionTask)
+def simulateCompression(root:Root, bestEpisode:NonOverlappedEpisode, gr:float, ws:float, pb:float, cache:CompressionCache, gapExecutor:Optional[Executor] = None) -> Root:
+    """
+    Simulate the compression of a root with one of its best episodes.
+    
+    The bounds of the episode close enough to each other are fused with the
+    episode pattern, the events intercalated between fused bounds are
+    compressed recursively, replaced by their best compression (see
+    getBestCompression) and aggregated with aggregateMerge.
+    
+    Args:
+        root (Root): The root in which the best episode was found (not modified)
+        bestEpisode (NonOverlappedEpisode): The episode to compress with (support > 1)
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        cache (CompressionCache): Cache of the recursive compressions
+        gapExecutor (Optional[Executor], optional): Process pool on which the
+            compressions of the intercalated events are submitted up front, they
+            are then collected in order. Defaults to None (serial)
         
-    Note:
-        The algorithm stops after TIME_LIMIT seconds, adding an "OverTime"
-        compression stat if the limit is reached.
+    Returns:
+        Root: The new compressed root
     """
-    #gr = 8
-    #ws = 0.5
-    #pb = 0.5
+    # Les compressions des traces intercalées sont indépendantes, seule leur intégration dans intercaletedEvents dépend de l'ordre. On les soumet donc toutes d'avance à l'exécuteur
+    gapFutures:dict[tuple[int, int], tuple[tuple[str, float, float, float, float], Future[CompressionSet]]] = {}
+    if gapExecutor != None:
+        gapFutures = submitFusedGaps(root, bestEpisode, gr, ws, pb, cache, gapExecutor)
+
+    newRoot:Root = Root(Sequence())
+    newRoot.content.isRoot = True
+    # Le nouveau root référence les portions non compressées du root parent au lieu de les recopier
+    newRoot.content.event_list = EventRope()
+    # Transformation de cet épisode en une séquence linéarisée
+    bestPattern:list[LinearEvent] = bestEpisode.event.linearize()
+
+    #print (str(bestEpisode)+f" => {bestEpisode.score:.2f} (part1:{bestEpisode.part1:.2f}; part2:{bestEpisode.part2:.2f}) (inside:{bestEpisode.inside:.2f}; outside:{bestEpisode.outside:.2f})")
+
+    # On commence la compression avec le premier bound
+    mergedBound:tuple[int, int] = bestEpisode.boundlist[0]
+    # On injecte dans le nouveau root les traces précédant le premier bound
+    if mergedBound[0] > 0:
+        newRoot.content.event_list.appendSlice(root.content.event_list, 0, mergedBound[0])
+    # On fusionne le premier bound avec le meilleur pattern
+    mergedLinearSequence:LinearEventWithStats = mergeLinearSequences(root.content.getSubSequence(mergedBound[0], mergedBound[1]+1).linearize(), bestPattern)
+    mergedLinearSequence.countOpt += root.countOpt
+    mergedLinearSequence.countAlign += root.countAlign
+
+    # Une sequence linéarisée pour stocker les traces intercallées entre le bounds
+    intercaletedEvents:LinearEventWithStats = LinearEventWithStats()
+    # Parcourir tous les bounds
+    for k in range(1, len(bestEpisode.boundlist)):
+        currentBound:tuple[int, int] = bestEpisode.boundlist[k]
+        # vérifier si l'écart entre la fin du précédent et la fin de ce bound est inférieur au seuil
+        if isBoundCloseEnough(mergedBound, currentBound, gr, pb):
+            # extraction de la séquence linéarisée entre les deux bounds (on inclus toutes les traces intercallées entre la fin des épisodes précédement fusionnés et le debut du bound courrant)
+            if mergedBound[1]+1 < currentBound[0]:
+                # Le contenu intercallé
+                gapEvents:list[Event] = list(root.content.event_list[mergedBound[1]+1:currentBound[0]])
+                result:CompressionSet
+                if (mergedBound[1]+1, currentBound[0]) in gapFutures:
+                    # Récupération de la compression calculée par l'exécuteur et enregistrement dans le cache
+                    key, future = gapFutures[(mergedBound[1]+1, currentBound[0])]
+                    if key not in cache:
+                        cache.put(key, future.result())
+                    result = copy.deepcopy(future.result())
+                    logGapOverTime(key, result)
+                else:
+                    # Appel récursif de MAP (ou récupération dans le cache) pour compresser les traces intercalées
+                    result = compressGap(gapEvents, gr, ws, pb, cache)
+                linearSequenceInsertedEvents:list[LinearEvent]
+                # Choix de la meilleure compression (indépendant de l'ordre de parcours de l'ensemble, qu'il provienne du cache ou d'un autre processus, et ignorant le marqueur "OverTime")
+                bestGap:Optional[CompressionStats] = getBestCompression(result)
+                if bestGap != None:
+                    # transformation de cette compression en une séquence linéarisée et on fait sauter le Begin et le End
+                    linearSequenceInsertedEvents = bestGap.compression.linearize()[1:-1]
+                else:
+                    # Si pas de compression générée, on clone le contenu intercallé dans une séquence temporaire, on la linéarise simplement et on fait sauter le Begin et le End
+                    subSequence:Sequence = Sequence()
+                    subSequence.event_list = copy.deepcopy(gapEvents)
+                    linearSequenceInsertedEvents = subSequence.linearize()[1:-1]
+                # On merge cette partie avec les évènements intercalés, à noter que lors des premiers Event intercallés on va chercher à fusionner [] avec une liste d'Events non vide, ils seront donc tous mis en optionnel et c'est justement ce que l'on cherche.
+                result1:LinearEventWithStats = mergeLinearSequences(linearSequenceInsertedEvents, intercaletedEvents.linearEvent)
+                # Prise en compte du résultat et comptabilisation des stats d'option et d'alignement
+                intercaletedEvents.update(result1.linearEvent, result1.countOpt, result1.countAlign)
+
+            # linearisation du bound courrant
+            linearSequenceCurrentBound:list[LinearEvent] = root.content.getSubSequence(currentBound[0], currentBound[1]+1).linearize()
+            # calcule la fusion entre le dernier état de fusion et cette nouvelle séquence linéarisée
+            result2:LinearEventWithStats = mergeLinearSequences(linearSequenceCurrentBound, mergedLinearSequence.linearEvent)
+            mergedLinearSequence.update(result2.linearEvent, result2.countOpt, result2.countAlign)
+
+            # on étend la plage de la fusion pour englober ce nouvel épisode
+            mergedBound = (mergedBound[0], currentBound[1])
+        else:
+            # l'écart entre la fusion précédente et le bound courant est trop importante donc on injecte la fusion précédente dans le newRoot
+            aggregateMerge(newRoot, mergedLinearSequence, mergedBound, intercaletedEvents, currentBound[0], root)
+
+            # on réinitialise la fusion à la fusion du bound courant et du pattern fournit par TKE
+            mergedLinearSequence = mergeLinearSequences(root.content.getSubSequence(currentBound[0], currentBound[1]+1).linearize(), bestPattern)
+
+            # on réinitialise les traces intercallées
+            intercaletedEvents = LinearEventWithStats()
+            # Et on repositionne le bound de fusion sur le bound courrant
+            mergedBound = currentBound
+
+    aggregateMerge(newRoot, mergedLinearSequence, mergedBound, intercaletedEvents, len(root.content.event_list), root)
+
+    return newRoot
+
+# Cache des compressions récursives propre à chaque processus exécutant simulateCompressionTask
+g_workerCache:Optional[CompressionCache] = None
+
+# Fixe le budget de temps de MAP dans un processus de travail : il est transmis avec chaque tâche car le processus n'hérite pas forcément de la valeur du processus principal
+def setTimeLimit(timeLimit:float) -> None:
+    """
+    Set TIME_LIMIT in a worker process.
+
+    Args:
+        timeLimit (float): Time budget sent with the task
+    """
+    global TIME_LIMIT
+    TIME_LIMIT = timeLimit # pyright: ignore[reportConstantRedefinition]
+
+# Point d'entrée de simulateCompression pour un exécuteur de processus
+def simulateCompressionTask(params:tuple[Root, NonOverlappedEpisode, float, float, float, float]) -> Root:
+    """
+    Entry point of simulateCompression for a process pool executor.
+    
+    The parameters carried by class attributes and TIME_LIMIT are set in the
+    worker process, the recursive compressions use a cache local to the worker.
+    
+    Args:
+        params (tuple[Root, NonOverlappedEpisode, float, float, float, float]): Tuple containing:
+            - Root: The root in which the best episode was found
+            - NonOverlappedEpisode: The episode to compress with
+            - float: Gap ratio
+            - float: Weight support factor
+            - float: Proximity balancing factor
+            - float: Time limit of the recursive compressions
+            
+    Returns:
+        Root: The new compressed root
+    """
+    global g_workerCache
+    root, bestEpisode, gr, ws, pb, timeLimit = params
+    setTimeLimit(timeLimit)
     PTKE.GAP_RATIO = gr
     NonOverlappedEpisode.WEIGHT_SUPPORT = ws
     NonOverlappedEpisode.PROXIMITY_BALANCING = pb
+    if g_workerCache == None:
+        g_workerCache = CompressionCache()
+    return simulateCompression(root, bestEpisode, gr, ws, pb, g_workerCache)
+
+# Vérifie qu'un nouveau root n'est pas plus long d'un quart de la longueur initiale (le -2 est pour ne pas compter le premier Begin et le dernier End de la linéarisation) et qu'il contient moins de Call que le root original
+def isRootAcceptable(newRoot:Root, originalRootLength:int) -> bool:
+    """
+    Check the size constraints a new root must satisfy to be kept.
+    
+    Args:
+        newRoot (Root): The new compressed root
+        originalRootLength (int): Number of events of the original trace
+        
+    Returns:
+        bool: True if the linearized root is at most 25% longer than the original
+            trace and does not contain more calls than it
+    """
+    return len(newRoot.content.linearize())-2 <= originalRootLength*1.25 and newRoot.content.countCalls() <= originalRootLength
+
+# Forme compacte d'un root : son contenu encodé (voir encodeEvents) et ses compteurs d'options, d'alignements et de fusions
+EncodedRoot = tuple[str, int, int, int]
+
+# Encode un root sous sa forme compacte
+def encodeRoot(root:Root) -> EncodedRoot:
+    """
+    Encode a root into a compact form that is cheap to ship between processes.
+    
+    Args:
+        root (Root): The root to encode
+        
+    Returns:
+        EncodedRoot: The encoded content of the root and its counters
+    """
+    return (encodeEvents(root.content.event_list), root.countOpt, root.countAlign, root.countMerge)
+
+# Reconstruit un root à partir de sa forme compacte
+def decodeRoot(encodedRoot:EncodedRoot) -> Root:
+    """
+    Rebuild a root from its compact form.
+    
+    Args:
+        encodedRoot (EncodedRoot): The encoded root (see encodeRoot)
+        
+    Returns:
+        Root: The decoded root
+    """
+    root:Root = Root(Sequence())
+    root.content.isRoot = True
+    root.content.event_list = decodeEvents(encodedRoot[0])
+    root.countOpt, root.countAlign, root.countMerge = encodedRoot[1], encodedRoot[2], encodedRoot[3]
+    return root
+
+# Forme compacte d'une compression : son contenu encodé, si c'est un root (une compression interrompue est représentée par une séquence vide qui n'est pas un root) et ses compteurs
+EncodedCompression = tuple[str, bool, int, int, int]
+
+# Encode un ensemble de compressions sous une forme compacte et sérialisable en JSON
+def encodeCompressionSet(compressions:CompressionSet) -> list[EncodedCompression]:
+    """
+    Encode a set of compressions into a compact, JSON serializable form.
+
+    Args:
+        compressions (CompressionSet): The compressions to encode
 
+    Returns:
+        list[EncodedCompression]: The encoded compressions, sorted for a stable output
+    """
+    return sorted((encodeEvents(stats.compression.event_list), stats.compression.isRoot, stats.countOpt, stats.countAlign, stats.countMerge) for stats in compressions.set)
+
+# Reconstruit un ensemble de compressions à partir de sa forme compacte
+def decodeCompressionSet(encodedCompressions:list[EncodedCompression]) -> CompressionSet:
+    """
+    Rebuild a set of compressions from its compact form.
+
+    Args:
+        encodedCompressions (list[EncodedCompression]): The encoded compressions (see encodeCompressionSet)
+
+    Returns:
+        CompressionSet: The decoded compressions
+    """
     compressions:CompressionSet = CompressionSet()
+    for encoding, isRoot, countOpt, countAlign, countMerge in encodedCompressions:
+        compression:Sequence = Sequence()
+        compression.isRoot = isRoot
+        compression.event_list = decodeEvents(encoding)
+        compressions.set.add(CompressionStats(compression, countOpt, countAlign, countMerge))
+    return compressions
 
-    start_time:float = time.time()
+# Point d'entrée d'un processus de travail pour l'exploration distribuée de la frontière : calcule les meilleurs épisodes d'un root et simule les compressions associées
+def expandRootTask(params:tuple[EncodedRoot, float, float, float, float, int]) -> list[EncodedRoot]:
+    """
+    Expand one root of the frontier in a worker process.
+    
+    The root is decoded, its best episodes are computed with PTKE and the
+    compression of each episode is simulated. The new roots satisfying the size
+    constraints are returned encoded, in the order of the episodes.
+    Deduplication is left to the coordinator.
+    
+    Args:
+        params (tuple[EncodedRoot, float, float, float, float, int]): Tuple containing:
+            - EncodedRoot: The root to expand
+            - float: Gap ratio
+            - float: Weight support factor
+            - float: Proximity balancing factor
+            - float: Time limit of the recursive compressions
+            - int: Number of events of the original trace
+            
+    Returns:
+        list[EncodedRoot]: The new roots produced by the expansion
+    """
+    global g_workerCache
+    encodedRoot, gr, ws, pb, timeLimit, originalRootLength = params
+    setTimeLimit(timeLimit)
+    PTKE.GAP_RATIO = gr
+    NonOverlappedEpisode.WEIGHT_SUPPORT = ws
+    NonOverlappedEpisode.PROXIMITY_BALANCING = pb
+    if g_workerCache == None:
+        g_workerCache = CompressionCache()
+    root:Root = decodeRoot(encodedRoot)
+    newRoots:list[EncodedRoot] = []
+    for bestEpisode in PTKE().getBestEpisodes(root.content.event_list):
+        if bestEpisode.getSupport() > 1:
+            newRoot:Root = simulateCompression(root, bestEpisode, gr, ws, pb, g_workerCache)
+            if isRootAcceptable(newRoot, originalRootLength):
+                newRoots.append(encodeRoot(newRoot))
+    return newRoots
+
+# Caractères de structuration d'une compression sous forme de chaine (voir Sequence.__str__)
+STRUCTURE_SYMBOLS:frozenset[str] = frozenset("[]*")
+
+# Extrait l'ensemble des symboles de Call présents dans la forme textuelle d'une compression
+def getSymbols(compression:str) -> frozenset[str]:
+    """
+    Get the set of call symbols used in the string form of a compression.
+    
+    Args:
+        compression (str): A compression (or a solution) as produced by str(Sequence)
+        
+    Returns:
+        frozenset[str]: Call symbols found, structuring characters excluded
+    """
+    return frozenset(compression).difference(STRUCTURE_SYMBOLS)
+
+class MAPProgress:
+    """
+    Progress metadata of a running MAP exploration.
+    
+    An instance is yielded by iterMAP together with each accepted compression so
+    that callers can decide to stop the exploration early.
+    
+    Attributes:
+        rootsExpanded (int): Number of roots fully expanded so far
+        frontierSize (int): Number of roots accepted but not yet expanded
+        elapsed (float): Time (in seconds) spent inside the exploration
+        timeLimit (float): Time budget of the exploration (see TIME_LIMIT)
+        overTime (bool): True if the exploration has been stopped by the time budget
+    """
+    def __init__(self, rootsExpanded:int, frontierSize:int, elapsed:float, timeLimit:float, overTime:bool = False) -> None:
+        """
+        Initialize a new MAPProgress instance.
+        
+        Args:
+            rootsExpanded (int): Number of roots fully expanded so far
+            frontierSize (int): Number of roots accepted but not yet expanded
+            elapsed (float): Time (in seconds) spent inside the exploration
+            timeLimit (float): Time budget of the exploration
+            overTime (bool, optional): True if the time budget is exhausted. Defaults to False
+        """
+        self.rootsExpanded:int = rootsExpanded
+        self.frontierSize:int = frontierSize
+        self.elapsed:float = elapsed
+        self.timeLimit:float = timeLimit
+        self.overTime:bool = overTime
+    
+    def __repr__(self) -> str:
+        """
+        Get a string representation of the progress.
+        
+        Returns:
+            str: String representation showing the progress counters
+        """
+        return f'MAPProgress(expanded={self.rootsExpanded}, frontier={self.frontierSize}, elapsed={self.elapsed:.2f}/{self.timeLimit}, overTime={self.overTime})'
+
+class MAPState:
+    """
+    Saved state of a MAP exploration, used to resume a long exploration.
+    
+    The state is taken between two root expansions so that resuming from it
+    explores exactly the same roots in the same order as the uninterrupted
+    exploration. The partial CompressionSet and the fingerprints of visited
+    roots are not stored separately since they are given by the roots already
+    accepted (roots[1:] and their encodings). The cache of recursive
+    compressions is not saved, it only speeds up the exploration.
+    
+    Attributes:
+        gr (float): Gap ratio of the exploration
+        ws (float): Weight support factor of the exploration
+        pb (float): Proximity balancing factor of the exploration
+        target (Optional[str]): Compression looked for by the exploration
+        roots (list[EncodedRoot]): Roots accepted so far, the first one is the trace
+        rootIndex (int): Index in roots of the next root to expand
+        elapsed (float): Time (in seconds) already charged to the TIME_LIMIT budget
+    """
+    # Version du format de sauvegarde
+    VERSION:int = 1
+
+    def __init__(self, gr:float, ws:float, pb:float, target:Optional[str], roots:list[EncodedRoot], rootIndex:int, elapsed:float) -> None:
+        """
+        Initialize a new MAPState instance.
+        
+        Args:
+            gr (float): Gap ratio of the exploration
+            ws (float): Weight support factor of the exploration
+            pb (float): Proximity balancing factor of the exploration
+            target (Optional[str]): Compression looked for by the exploration
+            roots (list[EncodedRoot]): Roots accepted so far, the first one is the trace
+            rootIndex (int): Index in roots of the next root to expand
+            elapsed (float): Time already charged to the time budget
+        """
+        self.gr:float = gr
+        self.ws:float = ws
+        self.pb:float = pb
+        self.target:Optional[str] = target
+        self.roots:list[EncodedRoot] = roots
+        self.rootIndex:int = rootIndex
+        self.elapsed:float = elapsed
+
+    def save(self, path:str) -> None:
+        """
+        Save the state to a file.
+        
+        The file is written next to its destination then renamed so that an
+        interruption during the save never corrupts the previous checkpoint.
+        
+        Args:
+            path (str): The checkpoint file
+        """
+        tmpPath:str = path+".tmp"
+        with open(tmpPath, "w") as f:
+            json.dump({"version": MAPState.VERSION, "gr": self.gr, "ws": self.ws, "pb": self.pb, "target": self.target, "roots": self.roots, "rootIndex": self.rootIndex, "elapsed": self.elapsed}, f, separators=(",", ":"))
+        os.replace(tmpPath, path)
+
+    @staticmethod
+    def load(path:str) -> MAPState:
+        """
+        Load a state saved by save.
+        
+        Args:
+            path (str): The checkpoint file
+            
+        Returns:
+            MAPState: The loaded state
+            
+        Raises:
+            ValueError: If the file has not been written by a compatible version
+        """
+        with open(path, "r") as f:
+            data:dict[str, Any] = json.load(f)
+        if data.get("version") != MAPState.VERSION:
+            raise ValueError("MAP.py => MAPState.load: unsupported checkpoint version in "+path)
+        return MAPState(data["gr"], data["ws"], data["pb"], data["target"], [(r[0], r[1], r[2], r[3]) for r in data["roots"]], data["rootIndex"], data["elapsed"])
+
+    def check(self, event_list:list[Event], gr:float, ws:float, pb:float, target:Optional[str]) -> None:
+        """
+        Check that the state has been saved by an exploration of the same trace with the same parameters.
+        
+        Args:
+            event_list (list[Event]): The trace to explore
+            gr (float): Gap ratio
+            ws (float): Weight support factor
+            pb (float): Proximity balancing factor
+            target (Optional[str]): Compression looked for
+            
+        Raises:
+            ValueError: If the state belongs to another exploration
+        """
+        if (self.gr, self.ws, self.pb, self.target) != (gr, ws, pb, target) or self.roots[0][0] != encodeEvents(event_list):
+            raise ValueError("MAP.py => MAPState.check: the checkpoint belongs to another exploration (different trace or parameters)")
+
+# Charge l'état d'une exploration à reprendre s'il a été sauvegardé
+def loadCheckpoint(checkpointFile:Optional[str], event_list:list[Event], gr:float, ws:float, pb:float, target:Optional[str]) -> Optional[MAPState]:
+    """
+    Load the state of an exploration to resume, if any.
+    
+    Args:
+        checkpointFile (Optional[str]): The checkpoint file (may not exist yet)
+        event_list (list[Event]): The trace to explore
+        gr (float): Gap ratio
+        ws (float): Weight support factor
+        pb (float): Proximity balancing factor
+        target (Optional[str]): Compression looked for
+        
+    Returns:
+        Optional[MAPState]: The saved state, None if there is nothing to resume
+        
+    Raises:
+        ValueError: If the checkpoint belongs to another exploration
+    """
+    if checkpointFile == None or not os.path.exists(checkpointFile):
+        return None
+    state:MAPState = MAPState.load(checkpointFile)
+    state.check(event_list, gr, ws, pb, target)
+    return state
+
+# MAP => Mining Algorithm Patterns (version générateur)
+def iterMAP (event_list:list[Event], gr:float, ws:float, pb:float, target:Optional[str] = None, cache:Optional[CompressionCache] = None, executor:Optional[Executor] = None, distributeFrontier:bool = False, checkpointFile:Optional[str] = None) -> Iterator[tuple[CompressionStats, MAPProgress]]:
+    """
+    Anytime version of the Mining Algorithm Patterns (MAP).
+    
+    Same exploration as MAP but each compression is yielded as soon as its root
+    is accepted, together with the progress of the exploration. Callers can
+    therefore stop iterating once they have found what they are looking for.
+    Only the time spent inside the generator is charged to the TIME_LIMIT
+    budget, the time spent by the caller between two yields is not.
+    
+    Args:
+        event_list (list[Event]): List of events to analyze
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        target (Optional[str], optional): Compression looked for. If given, the
+            exploration stops as soon as a root whose string form equals target
+            is produced, and roots that can't lead to target are not expanded.
+            Defaults to None
+        cache (Optional[CompressionCache], optional): Cache of the recursive
+            compressions of intercalated events. If None, a new cache is shared
+            across the recursion tree of this call. Defaults to None
+        executor (Optional[Executor], optional): Process pool used to simulate
+            the compressions of all the best episodes of a root concurrently.
+            Roots are then merged in the order of the episodes so the result
+            does not depend on the executor. If a root has a single best
+            episode, the compressions of its intercalated events are
+            submitted to the executor instead. Defaults to None (serial)
+        distributeFrontier (bool, optional): If True and an executor is given,
+            the whole root frontier is distributed over the executor instead
+            (see iterDistributedMAP). Defaults to False
+        checkpointFile (Optional[str], optional): File where the state of the
+            exploration is saved every CHECKPOINT_INTERVAL seconds, when the
+            time budget is exhausted and at the end (see MAPState). If the file
+            already exists, the exploration resumes from the saved state: the
+            compressions already found are yielded first, then the exploration
+            continues exactly as it would have without interruption, the time
+            already spent being charged to the budget. Defaults to None
+        
+    Yields:
+        tuple[CompressionStats, MAPProgress]: Each new compression with the current progress
+        
+    Raises:
+        ValueError: If checkpointFile belongs to another exploration
+        
+    Note:
+        If the time budget is exhausted, a last "OverTime" compression stat
+        (empty compression and null counters) is yielded with progress.overTime set.
+    """
+    #gr = 8
+    #ws = 0.5
+    #pb = 0.5
+
+    # Distribution de la frontière des roots sur l'exécuteur
+    if executor != None and distributeFrontier:
+        yield from iterDistributedMAP(event_list, gr, ws, pb, executor, target, checkpointFile)
+        return
+
+    # Cache des compressions récursives partagé par tout l'arbre de récursion
+    if cache == None:
+        cache = CompressionCache()
+
+    # Temps passé dans l'exploration (le temps passé par l'appelant entre deux yield n'est pas décompté)
+    elapsed:float = 0
 
     # Ajout d'un root stabilisable et association de la liste d'évènement à ce root
     roots:list[Root] = [Root(Sequence())]
     roots[0].content.isRoot = True
-    roots[0].content.event_list = event_list
+    # La trace est référencée par une table de morceaux afin que les roots qui en dérivent partagent le mémo de ses structures principales. La table prend possession de la liste qu'elle référence : on lui en confie une copie pour que les compressions retournées ne dépendent pas des modifications ultérieures de la liste de l'appelant
+    roots[0].content.event_list = EventRope()
+    roots[0].content.event_list.appendSlice(list(event_list), 0, len(event_list))
 
     originalRootLength = len(event_list)
 
-    # tant qu'il y a au moins un root à explorer
+    # Reprise d'une exploration sauvegardée : on restaure les roots acceptés et on restitue les compressions déjà trouvées
     root_i:int = 0
+    state:Optional[MAPState] = loadCheckpoint(checkpointFile, event_list, gr, ws, pb, target)
+    if state != None:
+        roots += [decodeRoot(encodedRoot) for encodedRoot in state.roots[1:]]
+        root_i = state.rootIndex
+        elapsed = state.elapsed
+        for newRoot in roots[1:]:
+            yield (CompressionStats(newRoot.content, newRoot.countOpt, newRoot.countAlign, newRoot.countMerge), MAPProgress(root_i, len(roots)-root_i, elapsed, TIME_LIMIT))
+    # Roots déjà encodés pour la sauvegarde (seuls les nouveaux roots sont encodés à chaque sauvegarde)
+    encodedRoots:list[EncodedRoot] = state.roots if state != None else []
+    lastCheckpoint:float = time.time()
+    resume_time:float = time.time()
+
+    # Symboles nécessaires pour atteindre la cible. Tous les évènements d'un nouveau root proviennent du root dont il est issu, un root auquel il manque un de ces symboles ne peut donc pas mener à la cible
+    targetSymbols:frozenset[str] = getSymbols(target) if target != None else frozenset()
+
+    # tant qu'il y a au moins un root à explorer
     while root_i < len(roots):
         root:Root = roots[root_i]
+        # Sauvegarde périodique de l'état de l'exploration (entre deux expansions de root)
+        overTime:bool = elapsed+time.time()-resume_time > TIME_LIMIT
+        if checkpointFile != None and (overTime or time.time()-lastCheckpoint >= CHECKPOINT_INTERVAL):
+            encodedRoots += [encodeRoot(r) for r in roots[len(encodedRoots):]]
+            MAPState(gr, ws, pb, target, encodedRoots, root_i, elapsed+time.time()-resume_time).save(checkpointFile)
+            lastCheckpoint = time.time()
         # Couper si ça prend trop de temps
-        if time.time()-start_time > TIME_LIMIT:
-            compressions.set.add(CompressionStats(Sequence(), 0, 0, 0))
+        if overTime:
             #for r in roots:
             #      print (r.content)
-            break
+            yield (CompressionStats(Sequence(), 0, 0, 0), MAPProgress(root_i, len(roots)-root_i, elapsed+time.time()-resume_time, TIME_LIMIT, True))
+            return
+
+        # Ne pas étendre un root qui ne peut pas mener à la cible
+        if target != None and not targetSymbols.issubset(getSymbols(str(root.content))):
+            root_i += 1
+            continue
+
+        # Les paramètres sont portés par des attributs de classe, on les repositionne avant chaque expansion pour le cas où plusieurs explorations seraient entrelacées
+        PTKE.GAP_RATIO = gr
+        NonOverlappedEpisode.WEIGHT_SUPPORT = ws
+        NonOverlappedEpisode.PROXIMITY_BALANCING = pb
 
         ptke:PTKE = PTKE()
         bestEpisodes:list[NonOverlappedEpisode] = ptke.getBestEpisodes(root.content.event_list)
-        # Pour chaque épisode donné par tke, simuler la compression
-        best_i:int = 0
-        while best_i<len(bestEpisodes):
-            bestEpisode:NonOverlappedEpisode = bestEpisodes[best_i]
-            # On ne traite cet épisode que si son support est strictement supérieur à 1
-            if bestEpisode.getSupport() > 1:
-                newRoot:Root = Root(Sequence())
-                newRoot.content.isRoot = True
-                # Transformation de cet épisode en une séquence linéarisée
-                bestPattern:list[LinearEvent] = bestEpisode.event.linearize()
-
-                #print (str(bestEpisode)+f" => {bestEpisode.score:.2f} (part1:{bestEpisode.part1:.2f}; part2:{bestEpisode.part2:.2f}) (inside:{bestEpisode.inside:.2f}; outside:{bestEpisode.outside:.2f})")
-
-                # On commence la compression avec le premier bound
-                mergedBound:tuple[int, int] = bestEpisode.boundlist[0]
-                # On injecte dans le nouveau root les traces précédant le premier bound
-                if mergedBound[0] > 0:
-                    newRoot.content.event_list = root.content.event_list[:mergedBound[0]]
-                # On fusionne le premier bound avec le meilleur pattern
-                mergedLinearSequence:LinearEventWithStats = mergeLinearSequences(root.content.getSubSequence(mergedBound[0], mergedBound[1]+1).linearize(), bestPattern)
-                mergedLinearSequence.countOpt += root.countOpt
-                mergedLinearSequence.countAlign += root.countAlign
-
-                # Une sequence linéarisée pour stocker les traces intercallées entre le bounds
-                intercaletedEvents:LinearEventWithStats = LinearEventWithStats()
-                # Parcourir tous les bounds
-                for k in range(1, len(bestEpisode.boundlist)):
-                    currentBound:tuple[int, int] = bestEpisode.boundlist[k]
-                    # vérifier si l'écart entre la fin du précédent et la fin de ce bound est inférieur au seuil
-                    #if currentBound[1] - mergedBound[1] <= (currentBound[1]-currentBound[0] + 1)*(1 + PTKE.GAP_RATIO):
-                    if currentBound[1] - mergedBound[1] <= (currentBound[1]-currentBound[0] + 1)*(1 + PTKE.GAP_RATIO)*NonOverlappedEpisode.PROXIMITY_BALANCING:
-                        # extraction de la séquence linéarisée entre les deux bounds (on inclus toutes les traces intercallées entre la fin des épisodes précédement fusionnés et le debut du bound courrant)
-                        if mergedBound[1]+1 < currentBound[0]:
-                            # On crée une séquence temporaire
-                            subSequence:Sequence = Sequence()
-                            # On clone le contenu intercallé
-                            subSequence.event_list = copy.deepcopy(root.content.event_list[mergedBound[1]+1:currentBound[0]])
-                            # Appel récursif de MAP pour compresser les traces intercalées
-                            result:CompressionSet = MAP(subSequence.event_list, gr, ws, pb)
-                            linearSequenceInsertedEvents:list[LinearEvent]
-                            if len(result.set) > 0 :
-                                # transformation de la première compression trouvée en une séquence linéarisée et on fait sauter le Begin et le End
-                                linearSequenceInsertedEvents = result.set.pop().compression.linearize()[1:-1]
-                            else:
-                                # Si pas de compression générée, on linéarise simplement la séquence entercalée et on fait sauter le Begin et le End
-                                linearSequenceInsertedEvents = subSequence.linearize()[1:-1]
-                            # On merge cette partie avec les évènements intercalés, à noter que lors des premiers Event intercallés on va chercher à fusionner [] avec une liste d'Events non vide, ils seront donc tous mis en optionnel et c'est justement ce que l'on cherche.
-                            result1:LinearEventWithStats = mergeLinearSequences(linearSequenceInsertedEvents, intercaletedEvents.linearEvent)
-                            # Prise en compte du résultat et comptabilisation des stats d'option et d'alignement
-                            intercaletedEvents.update(result1.linearEvent, result1.countOpt, result1.countAlign)
-
-                        # linearisation du bound courrant
-                        linearSequenceCurrentBound:list[LinearEvent] = root.content.getSubSequence(currentBound[0], currentBound[1]+1).linearize()
-                        # calcule la fusion entre le dernier état de fusion et cette nouvelle séquence linéarisée
-                        result2:LinearEventWithStats = mergeLinearSequences(linearSequenceCurrentBound, mergedLinearSequence.linearEvent)
-                        mergedLinearSequence.update(result2.linearEvent, result2.countOpt, result2.countAlign)
-
-                        # on étend la plage de la fusion pour englober ce nouvel épisode
-                        mergedBound = (mergedBound[0], currentBound[1])
-                    else:
-                        # l'écart entre la fusion précédente et le bound courant est trop importante donc on injecte la fusion précédente dans le newRoot
-                        aggregateMerge(newRoot, mergedLinearSequence, mergedBound, intercaletedEvents, currentBound[0], root)
-
-                        # on réinitialise la fusion à la fusion du bound courant et du pattern fournit par TKE
-                        mergedLinearSequence = mergeLinearSequences(root.content.getSubSequence(currentBound[0], currentBound[1]+1).linearize(), bestPattern)
-
-                        # on réinitialise les traces intercallées
-                        intercaletedEvents = LinearEventWithStats()
-                        # Et on repositionne le bound de fusion sur le bound courrant
-                        mergedBound = currentBound
-                
-                aggregateMerge(newRoot, mergedLinearSequence, mergedBound, intercaletedEvents, len(root.content.event_list), root)
-
-                # on ne stocke le nouveau root que s'il n'est pas plus long d'un quart de la longueur initiale (le -2 est pour ne pas compter le premier Begin et le dernier End de la linéarisation) et qu'il contient moins de Call que le root original et qu'on ne l'a pas déjà exploré
-                if len(newRoot.content.linearize())-2 <= originalRootLength*1.25 and newRoot.content.countCalls() <= originalRootLength and not any(newRoot == r for r in roots):
-                    roots.append(newRoot)
-                
-            best_i += 1
+        # On ne traite que les épisodes dont le support est strictement supérieur à 1
+        bestEpisodes = [bestEpisode for bestEpisode in bestEpisodes if bestEpisode.getSupport() > 1]
+        # Pour chaque épisode donné par tke, simuler la compression. Les simulations sont indépendantes les unes des autres, si un exécuteur est fourni elles sont donc calculées en parallèle, les résultats étant récupérés dans l'ordre des épisodes
+        newRoots:Iterator[Root]
+        if executor != None and len(bestEpisodes) > 1:
+            newRoots = executor.map(simulateCompressionTask, [(root, bestEpisode, gr, ws, pb, TIME_LIMIT) for bestEpisode in bestEpisodes])
+        else:
+            # Si un exécuteur est fourni, il sert à compresser en parallèle les traces intercalées de l'épisode
+            newRoots = (simulateCompression(root, bestEpisode, gr, ws, pb, cache, executor) for bestEpisode in bestEpisodes)
+        for newRoot in newRoots:
+            # on ne stocke le nouveau root que s'il respecte les contraintes de taille et qu'on ne l'a pas déjà exploré
+            if isRootAcceptable(newRoot, originalRootLength) and not any(newRoot == r for r in roots):
+                roots.append(newRoot)
+                # Mise à disposition immédiate de cette compression
+                elapsed += time.time()-resume_time
+                yield (CompressionStats(newRoot.content, newRoot.countOpt, newRoot.countAlign, newRoot.countMerge), MAPProgress(root_i, len(roots)-root_i, elapsed, TIME_LIMIT))
+                resume_time = time.time()
+                # Arrêt anticipé si la cible est atteinte
+                if target != None and str(newRoot.content) == target:
+                    return
+
         root_i += 1
 
+    # Sauvegarde de l'état final, une reprise se contente alors de restituer les compressions trouvées
+    if checkpointFile != None:
+        encodedRoots += [encodeRoot(r) for r in roots[len(encodedRoots):]]
+        MAPState(gr, ws, pb, target, encodedRoots, root_i, elapsed+time.time()-resume_time).save(checkpointFile)
+
     #print ("Analyse terminée, temps de calcul : "+str(time.time()-start_time))
     #print("Meilleure compression trouvée :")
     #print(str(root))
     #print("Fin")
+
+# MAP => Mining Algorithm Patterns (version distribuée sur la frontière des roots)
+def iterDistributedMAP (event_list:list[Event], gr:float, ws:float, pb:float, executor:Executor, target:Optional[str] = None, checkpointFile:Optional[str] = None) -> Iterator[tuple[CompressionStats, MAPProgress]]:
+    """
+    Anytime version of MAP distributing the root frontier over an executor.
+    
+    The calling process acts as coordinator: it owns the list of roots, their
+    deduplication and the time budget. Every root accepted in the frontier is
+    submitted to the executor (see expandRootTask) as a compact encoding, and
+    the new roots returned by the workers are merged in the order of the roots
+    they come from. The exploration order, and so the result, are therefore the
+    same as iterMAP.
+    
+    Args:
+        event_list (list[Event]): List of events to analyze
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        executor (Executor): Process pool expanding the roots
+        target (Optional[str], optional): Compression looked for (see iterMAP). Defaults to None
+        checkpointFile (Optional[str], optional): File where the state of the
+            exploration is saved and from which it is resumed (see iterMAP).
+            Defaults to None
+        
+    Yields:
+        tuple[CompressionStats, MAPProgress]: Each new compression with the current progress
+        
+    Raises:
+        ValueError: If checkpointFile belongs to another exploration
+        
+    Note:
+        When the time budget is exhausted, the pending expansions are cancelled
+        but those already running in a worker are not interrupted.
+    """
+    # Temps passé dans l'exploration (le temps passé par l'appelant entre deux yield n'est pas décompté)
+    elapsed:float = 0
+
+    originalRootLength:int = len(event_list)
+    targetSymbols:frozenset[str] = getSymbols(target) if target != None else frozenset()
+
+    # Le coordinateur ne manipule que des roots encodés, l'encodage tient lieu d'empreinte pour la déduplication
+    firstRoot:Root = Root(Sequence())
+    firstRoot.content.event_list = event_list
+    roots:list[EncodedRoot] = [encodeRoot(firstRoot)]
+
+    # Reprise d'une exploration sauvegardée : on restaure les roots acceptés et on restitue les compressions déjà trouvées
+    root_i:int = 0
+    state:Optional[MAPState] = loadCheckpoint(checkpointFile, event_list, gr, ws, pb, target)
+    if state != None:
+        roots = state.roots
+        root_i = state.rootIndex
+        elapsed = state.elapsed
+        for encodedRoot in roots[1:]:
+            compression:Root = decodeRoot(encodedRoot)
+            yield (CompressionStats(compression.content, compression.countOpt, compression.countAlign, compression.countMerge), MAPProgress(root_i, len(roots)-root_i, elapsed, TIME_LIMIT))
+    knownRoots:set[str] = {encodedRoot[0] for encodedRoot in roots}
+    lastCheckpoint:float = time.time()
+    resume_time:float = time.time()
+    # Expansions soumises à l'exécuteur, dans l'ordre des roots (None pour un root qui ne peut pas mener à la cible). Les roots déjà étendus avant une reprise n'ont pas d'expansion
+    expansions:list[Optional[Future[list[EncodedRoot]]]] = [None]*root_i
+
+    try:
+        while root_i < len(roots):
+            # Soumettre l'expansion de tous les roots de la frontière qui ne l'ont pas encore été
+            while len(expansions) < len(roots):
+                encodedRoot:EncodedRoot = roots[len(expansions)]
+                if target != None and not targetSymbols.issubset(getSymbols(str(decodeRoot(encodedRoot).content))):
+                    expansions.append(None)
+                else:
+                    expansions.append(executor.submit(expandRootTask, (encodedRoot, gr, ws, pb, TIME_LIMIT, originalRootLength)))
+            # Attendre l'expansion du root courant dans la limite du temps restant
+            expansion:Optional[Future[list[EncodedRoot]]] = expansions[root_i]
+            if expansion != None:
+                wait([expansion], timeout=max(0, TIME_LIMIT-(elapsed+time.time()-resume_time)))
+            # Couper si ça prend trop de temps
+            overTime:bool = elapsed+time.time()-resume_time > TIME_LIMIT or (expansion != None and not expansion.done())
+            # Sauvegarde périodique de l'état de l'exploration (avant l'intégration de l'expansion du root courant)
+            if checkpointFile != None and (overTime or time.time()-lastCheckpoint >= CHECKPOINT_INTERVAL):
+                MAPState(gr, ws, pb, target, roots, root_i, elapsed+time.time()-resume_time).save(checkpointFile)
+                lastCheckpoint = time.time()
+            if overTime:
+                yield (CompressionStats(Sequence(), 0, 0, 0), MAPProgress(root_i, len(roots)-root_i, elapsed+time.time()-resume_time, TIME_LIMIT, True))
+                return
+            if expansion != None:
+                for newRoot in expansion.result():
+                    # on ne stocke le nouveau root que si on ne l'a pas déjà exploré
+                    if newRoot[0] not in knownRoots:
+                        knownRoots.add(newRoot[0])
+                        roots.append(newRoot)
+                        compression:Root = decodeRoot(newRoot)
+                        # Mise à disposition immédiate de cette compression
+                        elapsed += time.time()-resume_time
+                        yield (CompressionStats(compression.content, compression.countOpt, compression.countAlign, compression.countMerge), MAPProgress(root_i, len(roots)-root_i, elapsed, TIME_LIMIT))
+                        resume_time = time.time()
+                        # Arrêt anticipé si la cible est atteinte
+                        if target != None and str(compression.content) == target:
+                            return
+            root_i += 1
+        # Sauvegarde de l'état final, une reprise se contente alors de restituer les compressions trouvées
+        if checkpointFile != None:
+            MAPState(gr, ws, pb, target, roots, root_i, elapsed+time.time()-resume_time).save(checkpointFile)
+    finally:
+        # Annuler les expansions qui n'ont pas encore démarré
+        for expansion in expansions:
+            if expansion != None:
+                expansion.cancel()
+
+# MAP => Mining Algorithm Patterns
+def MAP (event_list:list[Event], gr:float, ws:float, pb:float, target:Optional[str] = None, cache:Optional[CompressionCache] = None, executor:Optional[Executor] = None, distributeFrontier:bool = False, checkpointFile:Optional[str] = None) -> CompressionSet:
+    """
+    Mining Algorithm Patterns (MAP) implementation.
+    
+    This function implements the MAP algorithm which:
+    1. Takes a sequence of events and tries to find recurring patterns
+    2. Uses PTKE to find frequent episodes
+    3. Compresses the sequence by replacing patterns with shorter representations
+    4. Maintains multiple compression candidates in parallel
+    
+    Args:
+        event_list (list[Event]): List of events to analyze
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        target (Optional[str], optional): Compression looked for (typically the
+            reference solution). If given, the exploration stops as soon as it is
+            found, the returned set is then partial. Defaults to None
+        cache (Optional[CompressionCache], optional): Cache of the recursive
+            compressions, give the same cache to several calls to share it
+            across them. Defaults to None
+        executor (Optional[Executor], optional): Process pool used to simulate
+            the compressions of the best episodes of a root concurrently.
+            Defaults to None (serial)
+        distributeFrontier (bool, optional): If True and an executor is given,
+            the root frontier itself is distributed over the executor.
+            Defaults to False
+        checkpointFile (Optional[str], optional): File used to save the state
+            of the exploration and to resume it after an interruption, the
+            returned set then also contains the compressions found before the
+            interruption (see iterMAP). Defaults to None
+        
+    Returns:
+        CompressionSet: Set of different possible compressions with their stats
+        
+    Note:
+        The algorithm stops after TIME_LIMIT seconds, adding an "OverTime"
+        compression stat if the limit is reached. See iterMAP to get the
+        compressions as soon as they are found.
+    """
+    compressions:CompressionSet = CompressionSet()
     # Enregistrement des compressions
-    for modelRoot in roots[1:]: # On saute le premier root (le root original)
-        compressions.set.add(CompressionStats(modelRoot.content, modelRoot.countOpt, modelRoot.countAlign, modelRoot.countMerge))
-    return compressions
\ No newline at end of file
+    for stats, _ in iterMAP(event_list, gr, ws, pb, target, cache, executor, distributeFrontier, checkpointFile):
+        compressions.set.add(stats)
+    return compressions
+
+# Comportement d'une exploration de MAP vis-à-vis des paramètres ws et pb : les comparaisons de scores effectuées par PTKE et les tests de fusion des bounds. Pour gr fixé, deux jeux de paramètres donnant les mêmes résultats à toutes ces comparaisons et à tous ces tests conduisent à la même exploration, donc aux mêmes compressions
+class Behaviour:
+    """
+    Decisions of a MAP exploration that depend on ws and pb.
+
+    For fixed statistics, a score only depends on WEIGHT_SUPPORT (ws) and
+    PROXIMITY_BALANCING (pb), it is linear in each of them. PTKE only uses
+    scores through comparisons: if, for other values of ws and pb, every
+    logged comparison (see ScoreLog) has the same outcome, PTKE takes the same
+    path and gives the same episodes. pb is also used by MAP to decide whether
+    two bounds are fused (see isBoundCloseEnough), these tests are replayed
+    too. If all of them agree, MAP explores the same roots and gives the same
+    compressions (unless it or one of its recursive compressions was cut by
+    TIME_LIMIT, such explorations have no Behaviour).
+
+    Attributes:
+        gr (float): Gap ratio of the exploration (the behaviour is only valid for it)
+        scoreLog (ScoreLog): Comparisons of scores made by the exploration
+    """
+    def __init__(self, scoreLog:ScoreLog, fusions:list[tuple[int, int]], gr:float, pb:float) -> None:
+        """
+        Build the behaviour of an exploration from its logs.
+
+        Args:
+            scoreLog (ScoreLog): Comparisons of scores made by the exploration
+            fusions (list[tuple[int, int]]): Fusion tests of the exploration, for
+                each the distance to the merged bound and the length of the bound
+            gr (float): Gap ratio of the exploration
+            pb (float): Proximity balancing factor of the exploration
+        """
+        self.gr:float = gr
+        self.scoreLog:ScoreLog = scoreLog
+        distinctFusions:np.ndarray = np.unique(np.array(fusions, dtype=np.int64).reshape(-1, 2), axis=0)
+        self._distances:np.ndarray = distinctFusions[:, 0]
+        self._lengths:np.ndarray = distinctFusions[:, 1]
+        self._fused:np.ndarray = self.__fusions(pb)
+
+    def __fusions(self, pb:float) -> np.ndarray:
+        # Même expression que isBoundCloseEnough
+        return self._distances <= self._lengths*(1 + self.gr)*pb
+
+    def isEquivalent(self, ws:float, pb:float) -> bool:
+        """
+        Check whether an exploration with other values of ws and pb (and the
+        same gr) takes the same decisions.
+
+        Args:
+            ws (float): Weight support factor
+            pb (float): Proximity balancing factor
+
+        Returns:
+            bool: True if MAP gives the same compressions with these parameters
+        """
+        return np.array_equal(self.__fusions(pb), self._fused) and self.scoreLog.isEquivalent(ws, pb)
+
+# Exécute MAP en enregistrant son comportement vis-à-vis des paramètres ws et pb (voir Behaviour)
+def MAPWithBehaviour(event_list:list[Event], gr:float, ws:float, pb:float, target:Optional[str] = None) -> tuple[CompressionSet, Optional[Behaviour]]:
+    """
+    Run MAP (serially) and record its behaviour with respect to ws and pb.
+
+    Args:
+        event_list (list[Event]): List of events to analyze
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        target (Optional[str], optional): Compression looked for (see MAP). Defaults to None
+
+    Returns:
+        tuple[CompressionSet, Optional[Behaviour]]: The compressions and the
+            behaviour of the exploration, None if the exploration or one of its
+            recursive compressions of intercalated events was cut by TIME_LIMIT
+            or if some scores were computed in other processes
+    """
+    global g_fusionLog, g_gapOverTimeLog
+    scoreLog:ScoreLog = ScoreLog()
+    fusions:list[tuple[int, int]] = []
+    gapOverTimes:list[tuple[str, float, float, float, float]] = []
+    Scorable.SCORE_LOG = scoreLog
+    g_fusionLog = fusions
+    g_gapOverTimeLog = gapOverTimes
+    try:
+        compressions:CompressionSet = MAP(event_list, gr, ws, pb, target)
+    finally:
+        Scorable.SCORE_LOG = None
+        g_fusionLog = None
+        g_gapOverTimeLog = None
+    if not scoreLog.complete or compressions.isOverTime() or len(gapOverTimes) > 0:
+        return compressions, None
+    return compressions, Behaviour(scoreLog, fusions, gr, pb)
+
+# Sélectionne la meilleure compression d'un ensemble : la plus courte une fois linéarisée, puis celle ayant le moins d'options
+def getBestCompression(compressions:CompressionSet) -> Optional[CompressionStats]:
+    """
+    Select the best compression of a set.
+    
+    The best compression is the shortest one once linearized, ties are broken
+    by the number of optional events then by the string form so that the
+    choice does not depend on the iteration order of the set.
+    
+    Args:
+        compressions (CompressionSet): The compressions to choose from
+        
+    Returns:
+        Optional[CompressionStats]: The best compression, None if the set does
+            not contain any (the "OverTime" marker is ignored)
+    """
+    candidates:list[CompressionStats] = [stats for stats in compressions.set if len(stats.compression.event_list) > 0]
+    if len(candidates) == 0:
+        return None
+    return min(candidates, key=lambda stats: (len(stats.compression.linearize()), stats.countOpt, str(stats.compression)))
+
+class OnlineMAP:
+    """
+    Online version of MAP for traces whose events arrive continuously.
+    
+    The current best compression of the trace is kept as a root. When events
+    are appended, only the episodes that can touch the new events are
+    re-examined: MAP is run on a window made of the last ONLINE_CONTEXT events
+    of the current compression followed by the new events, and the best
+    compression of this window replaces the end of the current compression.
+    The beginning of the compression is referenced, not copied (see EventRope).
+    Events that can no longer be re-examined are moved into a single list
+    owned by the exploration, only ever extended, so that every root
+    references its whole frozen beginning as one piece. The cost of an
+    append is therefore proportional to the size of the window and not to
+    the size of the whole trace.
+    
+    Appending all the events at once is equivalent to choosing the best
+    compression of MAP (see getBestCompression) on the whole trace. Appending
+    them in several parts only approximates it since an episode can't span
+    more than the window.
+    
+    Attributes:
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        context (int): Number of events of the current compression re-examined at each append
+        cache (CompressionCache): Cache of the recursive compressions shared by all the appends
+        root (Root): Current best compression of the events appended so far
+        length (int): Number of events appended so far
+        frozen (list[Event]): Frozen beginning of the compression (the first
+            events of root), only extended or replaced by a copy
+    """
+    def __init__(self, gr:float, ws:float, pb:float, context:int = ONLINE_CONTEXT, cache:Optional[CompressionCache] = None) -> None:
+        """
+        Initialize a new online exploration with an empty trace.
+        
+        Args:
+            gr (float): Gap ratio for PTKE
+            ws (float): Weight support factor for scoring
+            pb (float): Proximity balancing factor
+            context (int, optional): Number of events of the current compression
+                re-examined at each append. Defaults to ONLINE_CONTEXT
+            cache (Optional[CompressionCache], optional): Cache of the recursive
+                compressions. Defaults to None (a new cache)
+        """
+        self.gr:float = gr
+        self.ws:float = ws
+        self.pb:float = pb
+        self.context:int = context
+        self.cache:CompressionCache = cache if cache != None else CompressionCache()
+        self.root:Root = Root(Sequence())
+        self.root.content.isRoot = True
+        self.length:int = 0
+        self.frozen:list[Event] = []
+
+    def append(self, event_list:list[Event]) -> CompressionStats:
+        """
+        Append new events to the trace and update its compression.
+        
+        Args:
+            event_list (list[Event]): The new events (not modified)
+            
+        Returns:
+            CompressionStats: The updated compression of the whole trace
+        """
+        if len(event_list) == 0:
+            return self.getCompression()
+        # Fenêtre réexaminée : la fin de la compression courante suivie des nouveaux évènements
+        windowStart:int = max(0, len(self.root.content.event_list)-self.context)
+        window:list[Event] = list(self.root.content.event_list[windowStart:]) + copy.deepcopy(event_list)
+        best:Optional[CompressionStats] = getBestCompression(MAP(copy.deepcopy(window), self.gr, self.ws, self.pb, cache=self.cache))
+        # On ne remplace la fenêtre que si sa compression est plus courte que la fenêtre elle-même
+        windowSequence:Sequence = Sequence()
+        windowSequence.event_list = window
+        if best != None and len(best.compression.linearize()) >= len(windowSequence.linearize()):
+            best = None
+        # Le début de la compression courante est conservé tel quel, il est simplement référencé
+        self.__freeze(windowStart)
+        newRoot:Root = Root(Sequence())
+        newRoot.content.isRoot = True
+        newRoot.content.event_list = EventRope()
+        newRoot.content.event_list.appendSlice(self.frozen, 0, len(self.frozen))
+        newRoot.content.event_list.appendSlice(self.root.content.event_list, len(self.frozen), windowStart)
+        newRoot.countOpt, newRoot.countAlign, newRoot.countMerge = self.root.countOpt, self.root.countAlign, self.root.countMerge
+        if best != None:
+            newRoot.content.event_list.appendSlice(best.compression.event_list, 0, len(best.compression.event_list))
+            newRoot.countOpt += best.countOpt
+            newRoot.countAlign += best.countAlign
+            newRoot.countMerge += best.countMerge
+        else:
+            newRoot.content.event_list.appendSlice(window, 0, len(window))
+        self.root = newRoot
+        self.length += len(event_list)
+        return self.getCompression()
+
+    # Déplace dans la liste figée les évènements de la compression courante qui précèdent de plus d'une fenêtre le début de la fenêtre "windowStart" : la compression d'une fenêtre peut raccourcir la trace d'au plus sa longueur, les évènements figés ne peuvent donc en général plus être réexaminés par l'ajout suivant
+    def __freeze(self, windowStart:int) -> None:
+        if windowStart < len(self.frozen):
+            # La fenêtre déborde sur le début figé (trace fortement raccourcie par les compressions successives) : les roots précédents référencent la liste figée, elle est donc recopiée au lieu d'être tronquée
+            self.frozen = self.frozen[:windowStart]
+            return
+        # Les évènements ajoutés à la liste figée suivent ceux déjà référencés par les roots précédents, qui ne sont donc pas modifiés
+        if windowStart-self.context > len(self.frozen):
+            self.frozen += self.root.content.event_list[len(self.frozen):windowStart-self.context]
+
+    def getCompression(self) -> CompressionStats:
+        """
+        Get the current compression of the trace.
+        
+        Returns:
+            CompressionStats: The current compression of the events appended so far
+        """
+        return CompressionStats(self.root.content, self.root.countOpt, self.root.countAlign, self.root.countMerge)
+
+# Découpe une trace en segments d'environ chunkSize évènements. Chaque coupure est placée, dans une marge d'un quart de segment après la coupure nominale, devant l'évènement le moins fréquent de la trace : les évènements rares marquent typiquement les changements de phase du programme (début d'un nouveau tour de boucle englobante) et les motifs fréquents sont ainsi rarement coupés. À fréquence égale, la coupure est placée devant la plus petite suite d'évènements de la marge (ordre lexicographique) : dans une boucle plus courte que la marge toutes les coupures tombent ainsi au même endroit d'un tour, et les segments d'une même boucle en trouvent le même motif
+def splitTrace(event_list:list[Event], chunkSize:int) -> list[tuple[int, int]]:
+    """
+    Split a trace into chunks of about chunkSize events.
+    
+    Each cut is placed, within a quarter of chunk after the nominal cut, before
+    the event that is the least frequent in the whole trace. Rare events
+    typically mark a change of phase of the program so that frequent patterns
+    are seldom cut. Ties are broken by the smallest run of events following
+    the cut so that the cuts of a loop shorter than the margin fall at the same
+    place of an iteration.
+    
+    Args:
+        event_list (list[Event]): The trace to split
+        chunkSize (int): Nominal number of events of a chunk
+        
+    Returns:
+        list[tuple[int, int]]: Start (inclusive) and end (exclusive) of each chunk
+    """
+    frequencies:dict[Event, int] = {}
+    for e in event_list:
+        event:Event = e.getMainStructure()
+        frequencies[event] = frequencies.get(event, 0)+1
+    slack:int = chunkSize//4
+    chunks:list[tuple[int, int]] = []
+    start:int = 0
+    while len(event_list)-start > chunkSize+slack:
+        cut:int = min(range(start+chunkSize, start+chunkSize+slack+1), key=lambda i: (frequencies[event_list[i].getMainStructure()], [str(e.getMainStructure()) for e in event_list[i:i+slack]], i))
+        chunks.append((start, cut))
+        start = cut
+    chunks.append((start, len(event_list)))
+    return chunks
+
+# Compresse un segment de trace et retourne sa meilleure compression sous la forme d'un root
+def compressChunk(event_list:list[Event], gr:float, ws:float, pb:float, cache:CompressionCache) -> tuple[Optional[Root], bool]:
+    """
+    Compress one chunk of a trace and keep its best compression.
+    
+    Args:
+        event_list (list[Event]): The events of the chunk (not modified)
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        cache (CompressionCache): Cache of the recursive compressions
+        
+    Returns:
+        tuple[Optional[Root], bool]: The best compression of the chunk (see
+            getBestCompression), None if the chunk can't be compressed, and
+            whether the compression of the chunk was cut by TIME_LIMIT
+    """
+    compressions:CompressionSet = MAP(copy.deepcopy(event_list), gr, ws, pb, cache=cache)
+    overTime:bool = compressions.isOverTime()
+    best:Optional[CompressionStats] = getBestCompression(compressions)
+    if best == None:
+        return None, overTime
+    root:Root = Root(best.compression)
+    root.countOpt, root.countAlign, root.countMerge = best.countOpt, best.countAlign, best.countMerge
+    return root, overTime
+
+# Point d'entrée de compressChunk pour un exécuteur de processus
+def compressChunkTask(params:tuple[str, float, float, float, float]) -> tuple[Optional[EncodedRoot], bool]:
+    """
+    Entry point of compressChunk for a process pool executor.
+    
+    Args:
+        params (tuple[str, float, float, float, float]): Tuple containing:
+            - str: The events of the chunk encoded with encodeEvents
+            - float: Gap ratio
+            - float: Weight support factor
+            - float: Proximity balancing factor
+            - float: Time limit of the compression
+            
+    Returns:
+        tuple[Optional[EncodedRoot], bool]: The encoded best compression of the
+            chunk, None if there is none, and whether it was cut by TIME_LIMIT
+    """
+    global g_workerCache
+    encodedChunk, gr, ws, pb, timeLimit = params
+    setTimeLimit(timeLimit)
+    if g_workerCache == None:
+        g_workerCache = CompressionCache()
+    root, overTime = compressChunk(decodeEvents(encodedChunk), gr, ws, pb, g_workerCache)
+    return (encodeRoot(root) if root != None else None), overTime
+
+# Ajoute les évènements d'un segment à la trace recollée en fusionnant les boucles de part et d'autre de la coupure : une boucle identique à la boucle qui précède est absorbée par celle-ci, de même que les tours déroulés d'une boucle (évènements identiques à son motif) placés juste avant ou juste après elle
+def appendChunk(stitchedEvents:list[Event], chunkEvents:list[Event] | EventRope) -> None:
+    """
+    Append the events of a chunk to a stitched trace, merging the loops across the cut.
+    
+    A loop identical to the loop preceding it is absorbed by the latter, and so
+    are the unrolled iterations of a loop (events identical to its pattern)
+    placed just before or just after it.
+    
+    Args:
+        stitchedEvents (list[Event]): The stitched trace, modified in place
+        chunkEvents (list[Event] | EventRope): The events of the chunk (not modified)
+    """
+    i:int = 0
+    while i < len(chunkEvents):
+        event:Event = chunkEvents[i]
+        last:Optional[Event] = stitchedEvents[-1] if len(stitchedEvents) > 0 else None
+        if isinstance(last, Sequence) and not last.opt:
+            if event == last:
+                i += 1
+                continue
+            body:list[Event] = list(last.event_list)
+            if len(body) > 0 and chunkEvents[i:i+len(body)] == body:
+                i += len(body)
+                continue
+        if isinstance(event, Sequence) and not event.opt:
+            body = list(event.event_list)
+            if len(body) > 0 and stitchedEvents[-len(body):] == body:
+                del stitchedEvents[-len(body):]
+                continue
+        break
+    stitchedEvents += chunkEvents[i:]
+
+# Compresse indépendamment chacun des segments d'une trace et recolle leurs meilleures compressions
+def stitchChunks(event_list:list[Event], chunks:list[tuple[int, int]], gr:float, ws:float, pb:float, executor:Optional[Executor] = None) -> tuple[Root, bool]:
+    """
+    Compress each chunk of a trace independently and stitch their best compressions.
+    
+    Args:
+        event_list (list[Event]): The trace (not modified)
+        chunks (list[tuple[int, int]]): The chunks of the trace (see splitTrace)
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        executor (Optional[Executor], optional): Process pool compressing the
+            chunks concurrently. Defaults to None (serial)
+        
+    Returns:
+        tuple[Root, bool]: The stitched compression (see appendChunk), a chunk
+            that can't be compressed is kept as is, and whether the compression
+            of at least one chunk was cut by TIME_LIMIT
+    """
+    chunkResults:list[tuple[Optional[Root], bool]]
+    if executor != None:
+        chunkResults = [(decodeRoot(encodedRoot) if encodedRoot != None else None, overTime) for encodedRoot, overTime in executor.map(compressChunkTask, [(encodeEvents(event_list[start:end]), gr, ws, pb, TIME_LIMIT) for start, end in chunks])]
+    else:
+        cache:CompressionCache = CompressionCache()
+        chunkResults = [compressChunk(event_list[start:end], gr, ws, pb, cache) for start, end in chunks]
+    stitched:Root = Root(Sequence())
+    stitched.content.isRoot = True
+    stitchedEvents:list[Event] = []
+    stitched.content.event_list = stitchedEvents
+    for (start, end), (chunkRoot, _) in zip(chunks, chunkResults):
+        if chunkRoot != None:
+            appendChunk(stitchedEvents, chunkRoot.content.event_list)
+            stitched.countOpt += chunkRoot.countOpt
+            stitched.countAlign += chunkRoot.countAlign
+            stitched.countMerge += chunkRoot.countMerge
+        else:
+            appendChunk(stitchedEvents, copy.deepcopy(event_list[start:end]))
+    return stitched, any(overTime for _, overTime in chunkResults)
+
+# MAP => Mining Algorithm Patterns (version par segments pour les traces très longues)
+def chunkedMAP(event_list:list[Event], gr:float, ws:float, pb:float, chunkSize:int = CHUNK_SIZE, executor:Optional[Executor] = None) -> CompressionSet:
+    """
+    Chunk-and-stitch version of MAP for very long traces.
+    
+    The trace is split into chunks (see splitTrace) that are compressed
+    independently, in parallel if an executor is given, each chunk being
+    replaced by its best compression and the loops being merged across the
+    cuts (see stitchChunks). The stitched trace is then compressed again by
+    chunkedMAP, which merges the patterns found in the different chunks, until
+    it fits in a chunk or no longer shrinks. Each chunk has its own TIME_LIMIT
+    budget, the "OverTime" marker is added if any of them is exceeded.
+    
+    Args:
+        event_list (list[Event]): List of events to analyze
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        chunkSize (int, optional): Nominal number of events of a chunk. Defaults to CHUNK_SIZE
+        executor (Optional[Executor], optional): Process pool compressing the
+            chunks concurrently, it is also given to the final pass. Defaults to None (serial)
+        
+    Returns:
+        CompressionSet: The stitched compression and the compressions found by
+            the following passes (counters include those of the chunks)
+            
+    Note:
+        Traces not longer than a chunk are simply given to MAP. Apart from the
+        loops merged across the cuts, a pattern spanning two chunks can't be
+        found as such, the result is therefore an approximation of MAP (see
+        compareChunkedMAP).
+    """
+    chunks:list[tuple[int, int]] = splitTrace(event_list, chunkSize)
+    if len(chunks) == 1:
+        return MAP(event_list, gr, ws, pb, executor=executor)
+    stitched, overTime = stitchChunks(event_list, chunks, gr, ws, pb, executor)
+    compressions:CompressionSet = CompressionSet()
+    compressions.set.add(CompressionStats(stitched.content, stitched.countOpt, stitched.countAlign, stitched.countMerge))
+    if overTime:
+        # Le dépassement du temps imparti sur un segment est signalé comme pour MAP
+        compressions.set.add(CompressionStats(Sequence(), 0, 0, 0))
+    # Passe suivante de fusion des motifs des différents segments : la trace recollée est à son tour découpée et compressée jusqu'à tenir dans un segment (passe finale de MAP). Une trace recollée qui ne raccourcit plus donnerait les mêmes segments, elle est conservée telle quelle
+    stitchedEvents:list[Event] = list(stitched.content.event_list)
+    if len(stitchedEvents) < len(event_list):
+        for stats in chunkedMAP(copy.deepcopy(stitchedEvents), gr, ws, pb, chunkSize, executor).set:
+            if len(stats.compression.event_list) == 0:
+                # Marqueur de dépassement du temps imparti
+                compressions.set.add(stats)
+            else:
+                compressions.set.add(CompressionStats(stats.compression, stats.countOpt+stitched.countOpt, stats.countAlign+stitched.countAlign, stats.countMerge+stitched.countMerge))
+    return compressions
+
+# Compare le résultat de chunkedMAP à celui de MAP sur une trace pour laquelle les deux sont calculables
+def compareChunkedMAP(event_list:list[Event], gr:float, ws:float, pb:float, chunkSize:int = CHUNK_SIZE, executor:Optional[Executor] = None) -> dict[str, Any]:
+    """
+    Compare chunkedMAP with MAP on a trace where both are feasible.
+    
+    Args:
+        event_list (list[Event]): List of events to analyze (not modified)
+        gr (float): Gap ratio for PTKE
+        ws (float): Weight support factor for scoring
+        pb (float): Proximity balancing factor
+        chunkSize (int, optional): Nominal number of events of a chunk. Defaults to CHUNK_SIZE
+        executor (Optional[Executor], optional): Process pool given to both runs. Defaults to None
+        
+    Returns:
+        dict[str, Any]: Report with, for each run ("full" and "chunked"), its
+            best compression ("...Best", see getBestCompression), the length of
+            this compression once linearized ("...Length") and the computation
+            time ("...Time"). "lengthRatio" is chunkedLength/fullLength,
+            "sameBest" tells if both best compressions are identical and
+            "chunkedInFull" if the best chunked compression has also been found
+            by the full run
+    """
+    start_time:float = time.time()
+    full:CompressionSet = MAP(copy.deepcopy(event_list), gr, ws, pb, executor=executor)
+    fullTime:float = time.time()-start_time
+    start_time = time.time()
+    chunked:CompressionSet = chunkedMAP(copy.deepcopy(event_list), gr, ws, pb, chunkSize, executor)
+    chunkedTime:float = time.time()-start_time
+    fullBest:Optional[CompressionStats] = getBestCompression(full)
+    chunkedBest:Optional[CompressionStats] = getBestCompression(chunked)
+    # Sans compression, la longueur est celle de la trace linéarisée (avec le début et la fin de séquence)
+    fullLength:int = len(fullBest.compression.linearize()) if fullBest != None else len(event_list)+2
+    chunkedLength:int = len(chunkedBest.compression.linearize()) if chunkedBest != None else len(event_list)+2
+    return {
+        "fullBest": str(fullBest.compression) if fullBest != None else None,
+        "chunkedBest": str(chunkedBest.compression) if chunkedBest != None else None,
+        "fullLength": fullLength,
+        "chunkedLength": chunkedLength,
+        "lengthRatio": chunkedLength/fullLength,
+        "sameBest": fullBest != None and chunkedBest != None and str(fullBest.compression) == str(chunkedBest.compression),
+        "chunkedInFull": chunkedBest != None and any(str(stats.compression) == str(chunkedBest.compression) for stats in full.set),
+        "fullTime": fullTime,
+        "chunkedTime": chunkedTime
+    }
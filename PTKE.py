@@ -1,8 +1,15 @@
 import copy
+import math
+from collections import OrderedDict
 from multiprocessing import Pool
+from typing import Callable, Iterator, Optional, TypeVar
+import numpy as np
 #import time
-from Episode import BoundGraph, BoundList, Episode, NonOverlappedEpisode, Scorable
-from Event import Event, Sequence
+from Episode import BoundGraph, BoundList, Episode, NonOverlappedEpisode, Scorable, ScoreLog
+from Event import Event, EventRope, Sequence, SourceIndex, encodeEvents
+from Grammar import getRepeats
+from SuffixArray import getMaximalRepeats
+from array import array
 from bisect import insort
 
 # Enregistre un item dans l'ensemble des top-k.
@@ -22,14 +29,388 @@ def saveInTopK(item: Scorable, topk:list[Scorable]) -> None:
         If the list exceeds K items after insertion, the lowest scoring item is removed.
     """
     if item not in topk:
+        if len(topk) >= PTKE.K and Scorable.SCORE_LOG != None:
+            Scorable.SCORE_LOG.compare(item, topk[-1])
         # insertion de l'épisode dans les meilleurs k episodes et maintient de la liste triée par le score (du meilleur en premier au moins bon en dernier)
         if len(topk) < PTKE.K or item.getScore() > topk[-1].getScore():
             insort(topk, item)
         if len(topk) > PTKE.K:
             topk.pop() # ne conserver que les K meilleurs
 
+# Enregistre un lot d'épisodes dans l'ensemble des top-k. Le résultat est le même que celui d'appels successifs à saveInTopK, mais les scores sont calculés en une fois et seuls les épisodes pouvant entrer dans les top-k sont insérés
+#
+# :param items: les épisodes à enregistrer, dans l'ordre où saveInTopK les aurait reçus
+# :param topk: la liste contenant les top-k
+def saveBatchInTopK(items:list[NonOverlappedEpisode], topk:list[NonOverlappedEpisode]) -> None:
+    """
+    Save a batch of episodes in the top-k set.
+
+    The scores of the batch are computed at once (see NonOverlappedEpisode.scoreAll)
+    and the K-th best score among the batch and the current top-k is found with
+    argpartition. An episode scoring strictly less can't be kept by saveInTopK
+    nor change which of the better episodes are kept, so only the other ones
+    are inserted, in their original order. The result is the same as calling
+    saveInTopK on each item in order.
+
+    Args:
+        items (list[NonOverlappedEpisode]): The episodes to save, in order
+        topk (list[NonOverlappedEpisode]): The list containing the top-k items
+    """
+    if len(items) == 0:
+        return
+    original:list[NonOverlappedEpisode] = list(topk)
+    scores:np.ndarray = NonOverlappedEpisode.scoreAll(items)
+    # Les épisodes ne dépassant pas le plus faible score d'une liste pleine seraient refusés
+    candidates:np.ndarray = np.flatnonzero(scores > topk[-1].getScore()) if len(topk) >= PTKE.K else np.arange(len(items))
+    allScores:np.ndarray = np.concatenate((np.array([e.getScore() for e in topk]), scores[candidates]))
+    threshold:float = -np.inf
+    thresholdItem:Optional[NonOverlappedEpisode] = None
+    if len(allScores) > PTKE.K:
+        thresholdIndex:int = int(np.argpartition(-allScores, PTKE.K-1)[PTKE.K-1])
+        threshold = allScores[thresholdIndex]
+        thresholdItem = topk[thresholdIndex] if thresholdIndex < len(topk) else items[int(candidates[thresholdIndex-len(topk)])]
+    # Journalisation des comparaisons faites en une fois : au plus faible score de la liste et au K-ième meilleur score (son rang est conservé si toutes les comparaisons à ce score le sont)
+    if Scorable.SCORE_LOG != None:
+        if len(topk) >= PTKE.K:
+            for item in items:
+                Scorable.SCORE_LOG.compare(item, topk[-1])
+        if thresholdItem != None:
+            for item in topk+[items[int(i)] for i in candidates]:
+                Scorable.SCORE_LOG.compare(item, thresholdItem)
+            if len(topk) >= PTKE.K:
+                Scorable.SCORE_LOG.compare(topk[-1], thresholdItem)
+    selected:list[NonOverlappedEpisode] = [items[int(i)] for i in candidates if scores[i] >= threshold]
+    for item in selected:
+        saveInTopK(item, topk) # type: ignore
+    # Si des doublons ont empêché de remplir les top-k au-dessus du seuil, les épisodes écartés auraient pu y entrer : le lot est alors entièrement traité par saveInTopK
+    if threshold > -np.inf and (len(topk) < PTKE.K or topk[-1].getScore() < threshold):
+        topk[:] = original
+        for item in items:
+            saveInTopK(item, topk) # type: ignore
+
             
 
+# Construit le bitmap d'un ensemble de positions : un entier dont le bit i vaut 1 si i fait partie des positions
+#
+# :param positions: les positions (positives ou nulles)
+# :return: le bitmap des positions
+def buildBitmap(positions:list[int]) -> int:
+    """
+    Build the bitmap of a set of positions.
+    
+    Python integers are used as bitsets: shifts and ANDs on them work on whole
+    machine words, so a bitmap over the whole trace is processed at once.
+    
+    Args:
+        positions (list[int]): The positions (non negative)
+        
+    Returns:
+        int: An integer whose bit i is set if i is one of the positions
+    """
+    if len(positions) == 0:
+        return 0
+    bits:bytearray = bytearray((max(positions) >> 3) + 1)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, 'little')
+
+# Enumère les positions des bits à 1 d'un bitmap, dans l'ordre croissant
+def iterBits(bitmap:int) -> Iterator[int]:
+    """
+    Enumerate the positions of the set bits of a bitmap in increasing order.
+    
+    Args:
+        bitmap (int): The bitmap (non negative)
+        
+    Yields:
+        int: Position of each set bit
+    """
+    # Représentation binaire inversée pour que le caractère i corresponde au bit i
+    bits:str = bin(bitmap)[:1:-1]
+    position:int = bits.find('1')
+    while position != -1:
+        yield position
+        position = bits.find('1', position+1)
+
+# Regroupe les bounds par écart entre leur fin et leur début, et construit pour chaque groupe le bitmap des débuts de bounds
+def groupBoundStarts(boundlist:BoundList) -> dict[int, int]:
+    """
+    Group the bounds by span and build the bitmap of the starts of each group.
+    
+    Args:
+        boundlist (BoundList): The bounds to group
+        
+    Returns:
+        dict[int, int]: For each span (end-start), the bitmap of the starts of the bounds having this span
+    """
+    startsBySpan:dict[int, list[int]] = {}
+    for bound in boundlist:
+        startsBySpan.setdefault(bound[1]-bound[0], []).append(bound[0])
+    return {span: buildBitmap(starts) for span, starts in startsBySpan.items()}
+
+# Encode des évènements sous la forme d'entiers
+#
+# :param mainStructures: les évènements à encoder
+# :return: l'alphabet (l'évènement associé à chaque entier) et la séquence encodée
+def encodeMainStructures(mainStructures:list[Event]) -> tuple[list[Event], list[int]]:
+    """
+    Encode events as integers.
+    
+    Args:
+        mainStructures (list[Event]): The events to encode
+        
+    Returns:
+        tuple[list[Event], list[int]]: The alphabet (the event of each integer) and the encoded sequence
+    """
+    ids:dict[Event, int] = {}
+    alphabet:list[Event] = []
+    symbols:list[int] = []
+    for event in mainStructures:
+        if event not in ids:
+            ids[event] = len(alphabet)
+            alphabet.append(event)
+        symbols.append(ids[event])
+    return alphabet, symbols
+
+# Construit un épisode pour chaque répétition contiguë
+#
+# :param alphabet: l'évènement associé à chaque entier
+# :param repeats: les répétitions (séquence d'entiers) et leurs occurrences sans chevauchement
+# :return: un épisode par répétition
+def buildRepeatEpisodes(alphabet:list[Event], repeats:list[tuple[list[int], list[tuple[int, int]]]]) -> list[NonOverlappedEpisode]:
+    """
+    Build one episode per contiguous repeat.
+    
+    Args:
+        alphabet (list[Event]): The event of each integer
+        repeats (list[tuple[list[int], list[tuple[int, int]]]]): The repeats and their non overlapping occurrences
+        
+    Returns:
+        list[NonOverlappedEpisode]: One episode per repeat, bounded by its occurrences
+    """
+    episodes:list[NonOverlappedEpisode] = []
+    for repeat, occurrences in repeats:
+        pattern:Sequence = Sequence()
+        pattern.event_list = [alphabet[symbol] for symbol in repeat]
+        noe:NonOverlappedEpisode = NonOverlappedEpisode(pattern)
+        for occurrence in occurrences:
+            noe.boundlist.append(occurrence)
+        episodes.append(noe)
+    return episodes
+
+# Mémo des extensions d'épisodes calculées par PTKE, partagé par les compressions successives d'un processus. L'extension d'un épisode par chacun des évènements ne dépend que de la séquence analysée et de GAP_RATIO (gr), pas des paramètres du score (ws et pb) : lors d'une exploration ordonnée par gr, les mêmes roots sont analysés pour chaque couple (ws, pb) et seuls le score et le désenlacement des épisodes sont à refaire
+class EnumerationCache:
+    """
+    LRU cache of the episode extensions enumerated by PTKE.
+
+    The extensions of an episode (see PTKE.extendEpisode) only depend on the
+    main structures of the analysed sequence and on GAP_RATIO, the score
+    parameters (WEIGHT_SUPPORT and PROXIMITY_BALANCING) only select which
+    episodes are extended and how they are unravelled. When the parameters are
+    swept with gr as the outer loop, the same roots are analysed for each
+    (ws, pb) and their extensions are read from the cache.
+
+    An entry is kept per (GAP_RATIO, fingerprint of the sequence), it maps each
+    extended episode (its pattern and bounds) to its extensions. Cached
+    extensions are shared, they must not be modified.
+
+    Attributes:
+        maxSize (int): Maximum number of sequences kept in the cache
+        hits (int): Number of extensions answered by the cache
+        misses (int): Number of extensions not answered by the cache
+    """
+    def __init__(self, maxSize:int = 1024) -> None:
+        """
+        Initialize a new empty EnumerationCache.
+
+        Args:
+            maxSize (int, optional): Maximum number of sequences kept. Defaults to 1024
+        """
+        self.maxSize:int = maxSize
+        self.hits:int = 0
+        self.misses:int = 0
+        self._entries:OrderedDict[tuple[float, str], dict[tuple[str, bytes, bytes], list[Episode]]] = OrderedDict()
+
+    @property
+    def hitRate(self) -> float:
+        """
+        Get the proportion of extensions answered by the cache.
+
+        Returns:
+            float: Hit rate in [0, 1], 0 if no lookup has been done
+        """
+        lookups:int = self.hits + self.misses
+        return self.hits/lookups if lookups > 0 else 0
+
+    def __len__(self) -> int:
+        """
+        Get the number of sequences stored in the cache.
+
+        Returns:
+            int: Number of stored sequences
+        """
+        return len(self._entries)
+
+    def getExtensions(self, mainStructures:list[Event]) -> dict[tuple[str, bytes, bytes], list[Episode]]:
+        """
+        Get the extensions memo of a sequence for the current GAP_RATIO, creating
+        it (and evicting the least recently used one if full) if needed.
+
+        Args:
+            mainStructures (list[Event]): Main structure of each event of the sequence
+
+        Returns:
+            dict[tuple[str, bytes, bytes], list[Episode]]: The extensions of each
+                episode already extended, indexed by episodeKey
+        """
+        key:tuple[float, str] = (PTKE.GAP_RATIO, encodeEvents(mainStructures))
+        if key not in self._entries:
+            self._entries[key] = {}
+            if len(self._entries) > self.maxSize:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    @staticmethod
+    def episodeKey(episode:Episode) -> tuple[str, bytes, bytes]:
+        """
+        Get the key of an episode in an extensions memo.
+
+        Args:
+            episode (Episode): The episode, its event must be a Sequence
+
+        Returns:
+            tuple[str, bytes, bytes]: The encoding of its pattern and the starts and ends of its bounds
+        """
+        pattern:list[Event] | EventRope = episode.event.event_list if isinstance(episode.event, Sequence) else [episode.event]
+        return (encodeEvents(pattern), episode.boundlist.starts.tobytes(), episode.boundlist.ends.tobytes())
+
+# Type des clés d'un mémo de RankingCache
+Key = TypeVar("Key")
+
+# Mémo des épisodes calculés par PTKE, partagé par les compressions successives d'un processus. Pour une séquence et un GAP_RATIO (gr) donnés, les paramètres du score (ws et pb) n'interviennent qu'au travers des comparaisons de scores : un calcul précédent dont toutes les comparaisons ont le même résultat avec les nouveaux paramètres donne les mêmes épisodes. Le mémo porte sur l'analyse complète d'une séquence et, plus finement, sur le désenlacement de chaque épisode (ses comparaisons étant moins nombreuses, il est plus souvent réutilisable)
+class RankingCache:
+    """
+    LRU cache of the episodes ranked by PTKE.
+
+    Two kinds of computations are memoized: the best episodes of a sequence
+    (keyed by GAP_RATIO and the fingerprint of the sequence) and the unoverlapped
+    episodes of an episode (keyed by its event, its bounds and MAX_SUP). Each
+    entry lists the previous computations with the comparisons of scores they
+    made (see ScoreLog), MAX_SUP and their episodes. For fixed statistics a
+    score only depends on WEIGHT_SUPPORT and PROXIMITY_BALANCING, so if every
+    comparison of a previous computation has the same outcome with the current
+    values, it takes the same path and its episodes are reused. The cost of a
+    sweep over ws and pb then follows the number of distinct rankings rather
+    than the number of grid points.
+
+    Attributes:
+        maxSize (int): Maximum number of keys kept for each kind of computation
+        hits (int): Number of computations answered by the cache
+        misses (int): Number of computations not answered by the cache
+    """
+    def __init__(self, maxSize:int = 16384) -> None:
+        """
+        Initialize a new empty RankingCache.
+
+        Args:
+            maxSize (int, optional): Maximum number of keys kept for each kind
+                of computation. Defaults to 16384
+        """
+        self.maxSize:int = maxSize
+        self.hits:int = 0
+        self.misses:int = 0
+        self._sequences:OrderedDict[tuple[float, str], list[tuple[ScoreLog, int, list[NonOverlappedEpisode]]]] = OrderedDict()
+        self._episodes:OrderedDict[tuple[str, bytes, int], list[tuple[ScoreLog, int, list[NonOverlappedEpisode]]]] = OrderedDict()
+
+    @property
+    def hitRate(self) -> float:
+        """
+        Get the proportion of computations answered by the cache.
+
+        Returns:
+            float: Hit rate in [0, 1], 0 if no lookup has been done
+        """
+        lookups:int = self.hits + self.misses
+        return self.hits/lookups if lookups > 0 else 0
+
+    def __len__(self) -> int:
+        """
+        Get the number of keys stored in the cache.
+
+        Returns:
+            int: Number of stored sequences and episodes
+        """
+        return len(self._sequences) + len(self._episodes)
+
+    @staticmethod
+    def __getEntry(entries:OrderedDict[Key, list[tuple[ScoreLog, int, list[NonOverlappedEpisode]]]], key:Key, maxSize:int) -> list[tuple[ScoreLog, int, list[NonOverlappedEpisode]]]:
+        # Création de l'entrée si besoin (en évinçant la moins récemment utilisée si le mémo est plein)
+        if key not in entries:
+            entries[key] = []
+            if len(entries) > maxSize:
+                entries.popitem(last=False)
+        entries.move_to_end(key)
+        return entries[key]
+
+    def getBestEpisodes(self, mainStructures:list[Event], compute:Callable[[], list[NonOverlappedEpisode]]) -> list[NonOverlappedEpisode]:
+        """
+        Get the best episodes of a sequence for the current parameters.
+
+        Args:
+            mainStructures (list[Event]): Main structure of each event of the sequence
+            compute (Callable[[], list[NonOverlappedEpisode]]): Computes the best
+                episodes if no previous computation is equivalent
+
+        Returns:
+            list[NonOverlappedEpisode]: The best episodes (owned by the caller)
+        """
+        key:tuple[float, str] = (PTKE.GAP_RATIO, encodeEvents(mainStructures))
+        return self.__rank(RankingCache.__getEntry(self._sequences, key, self.maxSize), compute)
+
+    def unoverlap(self, episode:Episode) -> list[NonOverlappedEpisode]:
+        """
+        Unoverlap an episode for the current parameters (see unoverlapEpisode).
+
+        Args:
+            episode (Episode): The episode to unoverlap
+
+        Returns:
+            list[NonOverlappedEpisode]: The unoverlapped episodes (owned by the caller)
+        """
+        key:tuple[str, bytes, int] = (encodeEvents([episode.event]), episode.boundlist.starts.tobytes()+episode.boundlist.ends.tobytes(), NonOverlappedEpisode.MAX_SUP)
+        return self.__rank(RankingCache.__getEntry(self._episodes, key, self.maxSize), lambda: unoverlapEpisode((episode, NonOverlappedEpisode.MAX_SUP, NonOverlappedEpisode.PROXIMITY_BALANCING, NonOverlappedEpisode.WEIGHT_SUPPORT)))
+
+    def __rank(self, computations:list[tuple[ScoreLog, int, list[NonOverlappedEpisode]]], compute:Callable[[], list[NonOverlappedEpisode]]) -> list[NonOverlappedEpisode]:
+        # Les comparaisons du calcul (rejoué ou effectué) sont ajoutées au journal en cours, s'il y en a un
+        outerLog:Optional[ScoreLog] = Scorable.SCORE_LOG
+        for scoreLog, maxSup, episodes in reversed(computations):
+            if scoreLog.isEquivalent(NonOverlappedEpisode.WEIGHT_SUPPORT, NonOverlappedEpisode.PROXIMITY_BALANCING):
+                self.hits += 1
+                NonOverlappedEpisode.MAX_SUP = maxSup
+                if outerLog != None:
+                    outerLog.extend(scoreLog)
+                return RankingCache.__copy(episodes)
+        self.misses += 1
+        Scorable.SCORE_LOG = ScoreLog()
+        try:
+            episodes = compute()
+            if Scorable.SCORE_LOG.complete:
+                computations.append((Scorable.SCORE_LOG, NonOverlappedEpisode.MAX_SUP, RankingCache.__copy(episodes)))
+            if outerLog != None:
+                outerLog.extend(Scorable.SCORE_LOG)
+        finally:
+            Scorable.SCORE_LOG = outerLog
+        return episodes
+
+    @staticmethod
+    def __copy(episodes:list[NonOverlappedEpisode]) -> list[NonOverlappedEpisode]:
+        # Copie des épisodes dont les scores, calculés avec d'autres paramètres, sont invalidés
+        copies:list[NonOverlappedEpisode] = copy.deepcopy(episodes)
+        for episode in copies:
+            episode.invalidateScore()
+        return copies
+
 # Désenlace un épisode et retourne les K meilleurs candidats
 def unoverlapEpisode(params:tuple[Episode, int, float, float]) -> list[NonOverlappedEpisode]:
     """
@@ -116,6 +497,16 @@ class PTKE:
     Class Attributes:
         K (int): Number of top episodes to maintain
         GAP_RATIO (float): Controls allowed gap size between episodes relative to episode length
+        GRAMMAR_SEEDING (bool): If True, the top-K are seeded with the contiguous
+            repeats found by a Re-Pair grammar (see getGrammarEpisodes)
+        SUFFIX_SEEDING (bool): If True, the maximal contiguous repeats found with a
+            suffix array are added to the candidate episodes (see getSuffixEpisodes)
+        BITSET_MIN_LENGTH (int): Minimum length of a sequence from which episodes
+            are extended with bitmaps (see extendEpisodeWithBitmap)
+        ENUMERATION_CACHE (Optional[EnumerationCache]): If set, the extensions of
+            the episodes are memoized across the calls made in this process
+        RANKING_CACHE (Optional[RankingCache]): If set, the best and unoverlapped
+            episodes are memoized with the comparisons of scores leading to them
         
     Attributes:
         kEpisodes (list[NonOverlappedEpisode]): Current top-K episodes
@@ -124,6 +515,16 @@ class PTKE:
     K:int
     # GAP_RATIO controls the size of gaps between episodes in relation to the length of the episode. GAP_RATIO is a multiplier used by to jump events proportionaly to episode size (will produce optional events). 0 means episodes will be merge if no gap exists between them.
     GAP_RATIO:float
+    # GRAMMAR_SEEDING enables a Re-Pair pre-pass whose rules (typically loop bodies) seed the top-K episodes so that the exploration starts close to the dominant repeats. As other class attributes, it must be set before creating process pools.
+    GRAMMAR_SEEDING:bool = False
+    # SUFFIX_SEEDING enables the enumeration of the maximal contiguous repeats (exact loop bodies) with a suffix array. They are candidates alongside the gapped episodes grown by PTKE. As other class attributes, it must be set before creating process pools.
+    SUFFIX_SEEDING:bool = False
+    # BITSET_MIN_LENGTH is the length of sequence from which the positions of the events are indexed as bitmaps. Both extensions give the same episodes, bitmaps are faster on long sequences where an event occurs many times.
+    BITSET_MIN_LENGTH:int = 200
+    # ENUMERATION_CACHE memoizes the extensions of the episodes of each analysed sequence for a given GAP_RATIO (see EnumerationCache), the compressions are unchanged. None disables the memo. As other class attributes, it must be set before creating process pools.
+    ENUMERATION_CACHE:Optional[EnumerationCache] = None
+    # RANKING_CACHE memoizes the best episodes of each analysed sequence for a given GAP_RATIO, and the unoverlapped episodes of each episode, with the comparisons of scores made to find them (see RankingCache), they are reused for other score parameters giving the same outcome to every comparison. None disables the memo. As other class attributes, it must be set before creating process pools.
+    RANKING_CACHE:Optional["RankingCache"] = None
 
     def __init__(self) -> None:
         """
@@ -136,7 +537,7 @@ class PTKE:
     #
     # :param event_list: Liste des évènements desquels extraire les meilleurs épisodes
     # :return: La liste des épisodes sans chevauchement des bounds ayant le meilleur score
-    def getBestEpisodes(self, event_list: list[Event]) -> list[NonOverlappedEpisode]:
+    def getBestEpisodes(self, event_list: list[Event] | EventRope) -> list[NonOverlappedEpisode]:
         """
         Find the best non-overlapping episodes from a list of events.
         
@@ -148,43 +549,73 @@ class PTKE:
         5. Maintains the K best episodes based on score
         
         Args:
-            event_list (list[Event]): List of events to analyze
+            event_list (list[Event] | EventRope): List of events to analyze, the
+                main structures of a rope and their positions are derived from
+                the index of the ropes it derives from (see EventRope.getPositions)
             
+        Returns:
+            list[NonOverlappedEpisode]: List of best non-overlapping episodes
+        """
+        # Structure principale de chaque trace de la séquence et positions d'apparition de chacune (celles d'un root dérivé d'un autre sont reprises de l'index de son parent, décalées)
+        mainStructures:list[Event]
+        mapEventToLocations:dict[Event, list[int]]
+        if isinstance(event_list, EventRope):
+            mainStructures = event_list.getMainStructures()
+            mapEventToLocations = event_list.getPositions()
+        else:
+            index:SourceIndex = SourceIndex(event_list)
+            index.complete(len(event_list))
+            mainStructures, mapEventToLocations = index.mainStructures, index.positions
+        if PTKE.RANKING_CACHE == None:
+            return self.findBestEpisodes(mainStructures, mapEventToLocations)
+        # Réutilisation d'une analyse précédente de cette séquence (avec d'autres paramètres ws et pb) si toutes ses comparaisons de scores donnent le même résultat avec les paramètres courants
+        return PTKE.RANKING_CACHE.getBestEpisodes(mainStructures, lambda: self.findBestEpisodes(mainStructures, mapEventToLocations))
+
+    # Calcule les meilleurs épisodes sans chevauchement des bounds à partir de la structure principale des évènements d'une séquence et de leurs positions (voir getBestEpisodes)
+    def findBestEpisodes(self, mainStructures:list[Event], mapEventToLocations:dict[Event, list[int]]) -> list[NonOverlappedEpisode]:
+        """
+        Find the best non-overlapping episodes of a sequence (see getBestEpisodes).
+
+        Args:
+            mainStructures (list[Event]): Main structure of each event of the sequence
+            mapEventToLocations (dict[Event, list[int]]): Positions of each main
+                structure, in the order of their first appearance
+
         Returns:
             list[NonOverlappedEpisode]: List of best non-overlapping episodes
         """
         self.minScore = 1
         NonOverlappedEpisode.MAX_SUP = 1
-        # Map enregistrant pour chaque event ses positions d'apparition
-        mapEventToLocations:dict[Event, list[int]] = {}
-        # Map enregistrant pour chaque event ses positions d'apparition
+        # Map enregistrant pour chaque event l'épisode formé de ses positions d'apparition
         mapEventToNOE:dict[Event, NonOverlappedEpisode] = {}
-        # parcourir toutes les traces de la séquence et enregistrer les positions d'apparition de chaque item
-        for i in range(len(event_list)):
-            event:Event = event_list[i].getMainStructure()
-            if event in mapEventToLocations:
-                # trace déjà connue => ajout de la nouvelle position
-                mapEventToLocations[event].append(i)
-                mapEventToNOE[event].boundlist.append((i,i))
-            else:
-                # Nouvelle trace détectée
-                # encapsulation de cet event dans une séquence pour former le nouveau pattern
-                pattern:Sequence = Sequence()
-                pattern.event_list.append(event)
-                # Intégration de cette séquence en tant qu'épisode
-                noe:NonOverlappedEpisode = NonOverlappedEpisode(pattern)
-                noe.boundlist.append((i, i))
-                mapEventToNOE[event] = noe
-                # on enregistre aussi simplement sa possition
-                mapEventToLocations[event] = [i]
+        for event, positions in mapEventToLocations.items():
+            # encapsulation de cet event dans une séquence pour former le nouveau pattern
+            pattern:Sequence = Sequence()
+            pattern.event_list.append(event)
+            # Intégration de cette séquence en tant qu'épisode, chacune de ses positions formant un bound
+            noe:NonOverlappedEpisode = NonOverlappedEpisode(pattern)
+            noe.boundlist = BoundList.fromArrays(array('i', positions), array('i', positions), len(positions), positions[-1]-positions[0]-(len(positions)-1))
+            mapEventToNOE[event] = noe
             # On met à jour le support maximal
-            currentSup:int = len(mapEventToLocations[event])
-            NonOverlappedEpisode.MAX_SUP = currentSup if currentSup > NonOverlappedEpisode.MAX_SUP else NonOverlappedEpisode.MAX_SUP
+            NonOverlappedEpisode.MAX_SUP = max(NonOverlappedEpisode.MAX_SUP, len(positions))
         
+        # Sur les longues séquences, les positions de chaque event sont aussi indexées sous forme de bitmap
+        mapEventToBitmap:dict[Event, int] = {}
+        if len(mainStructures) >= PTKE.BITSET_MIN_LENGTH:
+            mapEventToBitmap = {event: buildBitmap(positions) for event, positions in mapEventToLocations.items()}
+
         # initialisation des k premiers épisodes 
-        for event, noe in mapEventToNOE.items():
-            saveInTopK(noe, self.kEpisodes) # type: ignore
+        saveBatchInTopK(list(mapEventToNOE.values()), self.kEpisodes)
+        # Ajout des répétitions contiguës trouvées par la grammaire, elles seront étendues comme les autres épisodes
+        if PTKE.GRAMMAR_SEEDING:
+            saveBatchInTopK(self.getGrammarEpisodes(mainStructures), self.kEpisodes)
+        # Ajout des répétitions contiguës maximales, elles seront étendues comme les autres épisodes
+        if PTKE.SUFFIX_SEEDING:
+            saveBatchInTopK(self.getSuffixEpisodes(mainStructures), self.kEpisodes)
                 
+        # Extensions déjà calculées pour cette séquence et ce GAP_RATIO (par une compression précédente avec d'autres paramètres ws et pb)
+        extensionsMemo:Optional[dict[tuple[str, bytes, bytes], list[Episode]]] = PTKE.ENUMERATION_CACHE.getExtensions(mainStructures) if PTKE.ENUMERATION_CACHE != None else None
+
         needExploration:bool = True
 #        statLoop:float = time.time()
         while needExploration:
@@ -193,11 +624,20 @@ class PTKE:
             # Etendre chacun des meilleurs épisodes avec un évènement supplémentaire
             for kEpisode in self.kEpisodes:
                 if not kEpisode.explored:
-                    for event, positions in mapEventToLocations.items():
-                        newEpisode:Episode = self.extendEpisodeWithEvent(kEpisode, event, positions)
-                        if len(newEpisode.boundlist) > 0:
-                            lengthSum += len(newEpisode.boundlist)
-                            newEpisodes.append(newEpisode)
+                    extensions:list[Episode]
+                    if extensionsMemo != None and PTKE.ENUMERATION_CACHE != None:
+                        key:tuple[str, bytes, bytes] = EnumerationCache.episodeKey(kEpisode)
+                        if key in extensionsMemo:
+                            PTKE.ENUMERATION_CACHE.hits += 1
+                        else:
+                            PTKE.ENUMERATION_CACHE.misses += 1
+                            extensionsMemo[key] = self.extendEpisode(kEpisode, mapEventToLocations, mapEventToBitmap)
+                        extensions = extensionsMemo[key]
+                    else:
+                        extensions = self.extendEpisode(kEpisode, mapEventToLocations, mapEventToBitmap)
+                    for newEpisode in extensions:
+                        lengthSum += len(newEpisode.boundlist)
+                        newEpisodes.append(newEpisode)
                     kEpisode.explored = True
 
             # Ici les bounds des kEpisodes peuvent se chevaucher ([... <3,5> <4,6> ...] => dans cet exemple le premier bound fini à 5 alors que le suivant commence à 4). Pour la suite de l'algo on ne peut avoir de chevauchements entre les bounds. On va donc créer autant d'éposides que nécessaire pour désenlacer les bounds de chacun des kEpisodes
@@ -205,27 +645,33 @@ class PTKE:
             # Si la longueur moyenne des bounds à désenlacer pour ces nouveaux épisodes est supérieur à un seuil, les traiter en parallèle
             if len(newEpisodes) > 0 and lengthSum/len(newEpisodes) > 100:
                 print ("MT")
+                # Les comparaisons faites par les autres processus ne sont pas journalisées
+                if Scorable.SCORE_LOG != None:
+                    Scorable.SCORE_LOG.complete = False
                 # Désenlacement des épisodes en parallèle
                 # Création d'un pool avec X processus
                 results:list[list[NonOverlappedEpisode]]
                 with Pool(processes=5) as pool:
                     results = pool.map(unoverlapEpisode, [(newEpi, NonOverlappedEpisode.MAX_SUP, NonOverlappedEpisode.PROXIMITY_BALANCING, NonOverlappedEpisode.WEIGHT_SUPPORT) for newEpi in newEpisodes])
                 # ajouter les nouveaux épisodes aux top-k
-                for result in results:
-                    for noe in result:
-                        saveInTopK(noe, self.kEpisodes) # type: ignore
+                saveBatchInTopK([noe for result in results for noe in result], self.kEpisodes)
             else:
                 # Désenlacement des épisodes en série
+                noes:list[NonOverlappedEpisode] = []
                 for newE in newEpisodes:
-                    noes:list[NonOverlappedEpisode] = unoverlapEpisode((newE, NonOverlappedEpisode.MAX_SUP, NonOverlappedEpisode.PROXIMITY_BALANCING, NonOverlappedEpisode.WEIGHT_SUPPORT))
-                    # ajouter les nouveaux épisodes aux top-k
-                    for noe in noes:
-                        saveInTopK(noe, self.kEpisodes) # type: ignore
+                    if PTKE.RANKING_CACHE != None:
+                        noes += PTKE.RANKING_CACHE.unoverlap(newE)
+                    else:
+                        noes += unoverlapEpisode((newE, NonOverlappedEpisode.MAX_SUP, NonOverlappedEpisode.PROXIMITY_BALANCING, NonOverlappedEpisode.WEIGHT_SUPPORT))
+                # ajouter les nouveaux épisodes aux top-k
+                saveBatchInTopK(noes, self.kEpisodes)
             
             needExploration = len(newEpisodes) > 0
         # Les épisodes sont maintenant désenlacés, on sélectionne tous les épisodes avec un score égal au meilleur
         bestNonOverlappedEpisodes:list[NonOverlappedEpisode] = []
         for nonOverlappedEpisode in self.kEpisodes:
+            if len(bestNonOverlappedEpisodes) > 0 and Scorable.SCORE_LOG != None:
+                Scorable.SCORE_LOG.compare(nonOverlappedEpisode, bestNonOverlappedEpisodes[0])
             if len(bestNonOverlappedEpisodes) == 0 or nonOverlappedEpisode.getScore() == bestNonOverlappedEpisodes[0].getScore():
                 bestNonOverlappedEpisodes.append(nonOverlappedEpisode)
             else:
@@ -237,8 +683,9 @@ class PTKE:
             if isinstance(epi.event, Sequence) and epi.event.getLength() == 1:
                 seq:Sequence = epi.event
                 # Si son unique enfant est lui même une séquence, on est dans le cas à simplifier
-                if isinstance(seq.event_list[0], Sequence):
-                    seqChild:Sequence = seq.event_list[0]
+                child:Event = seq.event_list[0]
+                if isinstance(child, Sequence):
+                    seqChild:Sequence = child
                     epi.event = seqChild
 
 #        print (time.time()-statLoop)
@@ -247,6 +694,49 @@ class PTKE:
 
         return bestNonOverlappedEpisodes
 
+    # Construit les épisodes correspondant aux répétitions contiguës trouvées par une grammaire Re-Pair sur la séquence
+    #
+    # :param mainStructures: structure principale de chacun des évènements de la séquence
+    # :return: un épisode par répétition, ses bounds étant les occurrences sans chevauchement de la répétition
+    def getGrammarEpisodes(self, mainStructures:list[Event]) -> list[NonOverlappedEpisode]:
+        """
+        Build episodes from the contiguous repeats found by a Re-Pair grammar.
+        
+        Events are encoded as integers (by main structure), a Re-Pair grammar is
+        built over this encoding and each rule occurring at least twice becomes
+        an episode whose bounds are the non overlapping occurrences of the rule.
+        
+        Args:
+            mainStructures (list[Event]): Main structure of each event of the sequence
+            
+        Returns:
+            list[NonOverlappedEpisode]: One episode per repeat
+        """
+        alphabet, symbols = encodeMainStructures(mainStructures)
+        return buildRepeatEpisodes(alphabet, getRepeats(symbols))
+
+    # Construit les épisodes correspondant aux répétitions contiguës maximales de la séquence (calculées à partir d'un tableau des suffixes)
+    #
+    # :param mainStructures: structure principale de chacun des évènements de la séquence
+    # :return: un épisode par répétition maximale, ses bounds étant les occurrences sans chevauchement de la répétition
+    def getSuffixEpisodes(self, mainStructures:list[Event]) -> list[NonOverlappedEpisode]:
+        """
+        Build episodes from the maximal contiguous repeats of the sequence.
+        
+        Events are encoded as integers (by main structure) and the maximal
+        repeats are enumerated from the suffix array and LCP array of this
+        encoding (see SuffixArray.getMaximalRepeats). Each repeat with at least
+        two non overlapping occurrences becomes an episode.
+        
+        Args:
+            mainStructures (list[Event]): Main structure of each event of the sequence
+            
+        Returns:
+            list[NonOverlappedEpisode]: One episode per maximal repeat
+        """
+        alphabet, symbols = encodeMainStructures(mainStructures)
+        return buildRepeatEpisodes(alphabet, getMaximalRepeats(symbols))
+
     # Obtention du support minimal
     def getMinSup(self) -> int:
         """
@@ -264,6 +754,38 @@ class PTKE:
 
 
 
+    # Etend un episode donné avec chacun des évènements de la séquence
+    #
+    # :param episode: episode à étendre
+    # :param mapEventToLocations: positions de chacun des évènements de la séquence
+    # :param mapEventToBitmap: bitmaps des positions de chacun des évènements (vide si les extensions ne se font pas par bitmap)
+    # :return: les épisodes étendus ayant au moins un bound, dans l'ordre des évènements
+    def extendEpisode(self, episode:Episode, mapEventToLocations:dict[Event, list[int]], mapEventToBitmap:dict[Event, int]) -> list[Episode]:
+        """
+        Extend an episode with each event of the sequence.
+
+        Args:
+            episode (Episode): Episode to extend
+            mapEventToLocations (dict[Event, list[int]]): Positions of each event of the sequence
+            mapEventToBitmap (dict[Event, int]): Bitmaps of these positions, empty
+                if the extensions are not computed with bitmaps
+
+        Returns:
+            list[Episode]: The extended episodes having at least one bound, in the order of the events
+        """
+        extensions:list[Episode] = []
+        # Les débuts des bounds de l'épisode sont indexés une fois pour toutes les extensions
+        startsBySpan:dict[int, int] = groupBoundStarts(episode.boundlist) if len(mapEventToBitmap) > 0 else {}
+        for event, positions in mapEventToLocations.items():
+            newEpisode:Episode
+            if len(mapEventToBitmap) > 0:
+                newEpisode = self.extendEpisodeWithBitmap(episode, event, mapEventToBitmap[event], startsBySpan)
+            else:
+                newEpisode = self.extendEpisodeWithEvent(episode, event, positions)
+            if len(newEpisode.boundlist) > 0:
+                extensions.append(newEpisode)
+        return extensions
+
     # Etend un episode donné avec un event
     #
     # :param episode: episode à étendre
@@ -295,20 +817,23 @@ class PTKE:
         max_window_size = (episode.event.getLength()+1)*(1+PTKE.GAP_RATIO)
         # Calcul des bounds contenant la fusion des bounds de l'épisode avec les positions d'un évènement
         newBoundlist:BoundList = BoundList([])
+        # Lecture directe des tableaux des débuts et des fins des bounds de l'épisode
+        starts:memoryview = episode.boundlist.starts
+        ends:memoryview = episode.boundlist.ends
         i:int = 0
         j:int = 0
 
-        while i < len(episode.boundlist) and j < len(eventPositions):
+        while i < len(starts) and j < len(eventPositions):
             # Avancer sur la position de l'event tant qu'elle commence avant la position de fin du bound courant de l'épisode => ça ne sert à rien d'explorer une position de l'event qui commence avant la fin du bound courant de l'épisode
             # episode : [... <?,6> ...]
             # event   : [... <3,3> ...] => on fait avancer l'event pour tenter de trouver une position commence après le 6
-            if episode.boundlist[i][1] >= eventPositions[j]:
+            if ends[i] >= eventPositions[j]:
                 j += 1
             # Avancer sur le bound suivant de l'épisode tant que la distance entre le début de ce bound et la position de l'event est supérieur ou égal à la taille de la fenêtre maximale autorisée
             # episode : [... <4,?> ...] => on fait avancer l'épisode pour tenter de trouver un bound plus proche de la position de l'évènement
             # event   : [... <9,9> ...]
             # max   : 3
-            elif eventPositions[j] - episode.boundlist[i][0] >= max_window_size:
+            elif eventPositions[j] - starts[i] >= max_window_size:
                 i += 1
             # Ici les contraintes suivantes sont respectées :
             #  - le bound de fin de l'épisode se situe avant la position de l'évènement
@@ -318,7 +843,7 @@ class PTKE:
             # event   : [... <9,9> ...]
             # new     : [... <6,9>]     => on ajoute à new un nouveau bound qui commence au début de celui de l'épisode jusqu'à la position de l'évènement
             else:
-                newBoundlist.append((episode.boundlist[i][0], eventPositions[j]))
+                newBoundlist.append((starts[i], eventPositions[j]))
                 i += 1
 
 	    # clonage du contenu de l'épisode
@@ -333,3 +858,63 @@ class PTKE:
 
         return newEpisode
             
+
+    # Etend un episode donné avec un event en utilisant les bitmaps des positions. Donne le même résultat que extendEpisodeWithEvent pour un épisode dont les bounds ne se chevauchent pas (cas des kEpisodes)
+    #
+    # :param episode: episode à étendre (bounds triés et sans chevauchement)
+    # :param event: évènement à tenter d'intégrer à l'épisode
+    # :param eventBitmap: bitmap des positions de event dans la séquence
+    # :param startsBySpan: bitmaps des débuts des bounds de l'épisode groupés par écart (voir groupBoundStarts)
+    # 
+    # :return: l'episode étendu
+    def extendEpisodeWithBitmap(self, episode:Episode, event:Event, eventBitmap:int, startsBySpan:dict[int, int]) -> Episode:
+        """
+        Extend an episode by adding a new event, using bitmaps of positions.
+        
+        Each bound <s, e> is extended to the first position p of the event
+        after e, provided that p-s is lower than the maximum window size (see
+        extendEpisodeWithEvent). For all the bounds of a given span, the bounds
+        whose first position is at offset d are given by shifting the event
+        bitmap by d and ANDing it with the bitmap of their starts, so all the
+        bounds are processed with one shift and one AND per offset.
+        
+        Args:
+            episode (Episode): Episode to extend, its bounds must be sorted and not overlap
+            event (Event): Event to add
+            eventBitmap (int): Bitmap of the positions of the event (see buildBitmap)
+            startsBySpan (dict[int, int]): Bitmaps of the starts of the bounds of
+                the episode grouped by span (see groupBoundStarts)
+            
+        Returns:
+            Episode: New episode containing the original episode extended with the event
+            
+        Raises:
+            TypeError: If the episode's event is not a Sequence
+        """
+        max_window_size = (episode.event.getLength()+1)*(1+PTKE.GAP_RATIO)
+        # La position de l'évènement doit vérifier p-s < max_window_size, d'où le plus grand décalage autorisé
+        maxOffset:int = math.ceil(max_window_size)-1
+        newBounds:list[tuple[int, int]] = []
+        for span, starts in startsBySpan.items():
+            # Débuts des bounds de ce groupe pour lesquels on n'a pas encore trouvé de position de l'évènement
+            remaining:int = starts
+            # La position de l'évènement doit se situer après la fin du bound (p > e = s+span)
+            for offset in range(span+1, maxOffset+1):
+                hits:int = remaining & (eventBitmap >> offset)
+                if hits != 0:
+                    for start in iterBits(hits):
+                        newBounds.append((start, start+offset))
+                    remaining &= ~hits
+                    if remaining == 0:
+                        break
+        newBounds.sort()
+
+        # clonage du contenu de l'épisode
+        newEpisode:Episode = Episode(copy.deepcopy(episode.event), BoundList(newBounds))
+        # ajout le l'évènement ajouté
+        if isinstance(newEpisode.event, Sequence):
+            newEpisode.event.event_list.append(event)
+        else:
+            raise TypeError
+
+        return newEpisode
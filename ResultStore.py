@@ -0,0 +1,131 @@
+import hashlib
+import json
+import sqlite3
+from typing import Optional
+from MAP import CompressionSet, EncodedCompression, decodeCompressionSet, encodeCompressionSet
+
+# Calcule l'empreinte d'une trace, utilisée pour identifier ses résultats indépendamment du nom de son fichier
+def hashTrace(trace:str) -> str:
+    """
+    Compute the fingerprint of a trace.
+
+    Args:
+        trace (str): The trace
+
+    Returns:
+        str: The SHA-256 of the trace (hexadecimal)
+    """
+    return hashlib.sha256(trace.encode("utf-8")).hexdigest()
+
+# Stockage persistant des résultats de MAP adressé par leur contenu : un résultat est identifié par l'empreinte de la trace, les paramètres gr, ws et pb, la version de l'algorithme (et des options modifiant les compressions) et le budget de temps accordé à MAP. Deux explorations (reprise, autre mode de recherche, autre nom de fichier pour la même trace) partagent ainsi leurs résultats
+class ResultStore:
+    """
+    Persistent content addressed store of MAP results, backed by SQLite.
+
+    A result is keyed by the fingerprint of the trace (see hashTrace), the
+    parameters gr, ws and pb, an identifier of the algorithm (its version and
+    the options changing the compressions) and the time budget given to MAP.
+    Results are committed as soon as they are stored so that an interrupted
+    sweep keeps them. Results cut by the time budget (see
+    CompressionSet.isOverTime) are not stored: whether the budget is exceeded
+    depends on the load of the machine, not only on the key. The store also keeps the running time of the compressions
+    of each trace, used to estimate the cost of the next sweeps.
+
+    Attributes:
+        path (str): Path of the database file
+        connection (sqlite3.Connection): Connection to the database
+    """
+    # Nom du fichier de la base dans le dossier d'un dataset
+    FILE_NAME:str = "results.sqlite"
+
+    def __init__(self, path:str) -> None:
+        """
+        Open (and create if needed) a store.
+
+        Args:
+            path (str): Path of the database file
+        """
+        self.path:str = path
+        self.connection:sqlite3.Connection = sqlite3.connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS results (traceHash TEXT NOT NULL, gr REAL NOT NULL, ws REAL NOT NULL, pb REAL NOT NULL, algorithm TEXT NOT NULL, budget REAL NOT NULL, compressions TEXT NOT NULL, PRIMARY KEY (traceHash, gr, ws, pb, algorithm, budget))")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS runtimes (traceHash TEXT NOT NULL PRIMARY KEY, seconds REAL NOT NULL, count INTEGER NOT NULL)")
+        self.connection.commit()
+
+    def get(self, traceHash:str, gr:float, ws:float, pb:float, algorithm:str, budget:float) -> Optional[CompressionSet]:
+        """
+        Get a stored result.
+
+        Args:
+            traceHash (str): Fingerprint of the trace (see hashTrace)
+            gr (float): Parameter gr of the compression
+            ws (float): Parameter ws of the compression
+            pb (float): Parameter pb of the compression
+            algorithm (str): Identifier of the algorithm and of its options
+            budget (float): Time budget of MAP (in seconds)
+
+        Returns:
+            Optional[CompressionSet]: The stored compressions, None if not stored
+                (or if the stored result was cut by the time budget)
+        """
+        row = self.connection.execute("SELECT compressions FROM results WHERE traceHash = ? AND gr = ? AND ws = ? AND pb = ? AND algorithm = ? AND budget = ?", (traceHash, gr, ws, pb, algorithm, budget)).fetchone()
+        if row == None:
+            return None
+        encodedCompressions:list[EncodedCompression] = [tuple(encoded) for encoded in json.loads(row[0])] # type: ignore
+        compressions:CompressionSet = decodeCompressionSet(encodedCompressions)
+        # Résultat interrompu enregistré par une version précédente du stockage : il est recalculé
+        if compressions.isOverTime():
+            return None
+        return compressions
+
+    def put(self, traceHash:str, gr:float, ws:float, pb:float, algorithm:str, budget:float, compressions:CompressionSet) -> None:
+        """
+        Store a result (replacing a previous one with the same key).
+
+        A result cut by the time budget is ignored, it will be computed again.
+
+        Args:
+            traceHash (str): Fingerprint of the trace (see hashTrace)
+            gr (float): Parameter gr of the compression
+            ws (float): Parameter ws of the compression
+            pb (float): Parameter pb of the compression
+            algorithm (str): Identifier of the algorithm and of its options
+            budget (float): Time budget of MAP (in seconds)
+            compressions (CompressionSet): The compressions to store
+        """
+        if compressions.isOverTime():
+            return
+        self.connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", (traceHash, gr, ws, pb, algorithm, budget, json.dumps(encodeCompressionSet(compressions), separators=(",", ":"))))
+        self.connection.commit()
+
+    def addRuntime(self, traceHash:str, seconds:float) -> None:
+        """
+        Record the running time of a compression of a trace.
+
+        Args:
+            traceHash (str): Fingerprint of the trace (see hashTrace)
+            seconds (float): Running time of the compression of one point
+        """
+        self.connection.execute("INSERT INTO runtimes VALUES (?, ?, 1) ON CONFLICT (traceHash) DO UPDATE SET seconds = seconds + excluded.seconds, count = count + 1", (traceHash, seconds))
+        self.connection.commit()
+
+    def getMeanRuntime(self, traceHash:str) -> Optional[float]:
+        """
+        Get the mean running time of the compressions of a trace.
+
+        Args:
+            traceHash (str): Fingerprint of the trace (see hashTrace)
+
+        Returns:
+            Optional[float]: The mean running time of the compression of one
+                point (in seconds), None if none was recorded
+        """
+        row = self.connection.execute("SELECT seconds, count FROM runtimes WHERE traceHash = ?", (traceHash,)).fetchone()
+        if row == None:
+            return None
+        return row[0]/row[1]
+
+    def close(self) -> None:
+        """
+        Close the connection to the database.
+        """
+        self.connection.close()
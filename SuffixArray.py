@@ -0,0 +1,130 @@
+# Construit le tableau des suffixes d'une séquence de symboles entiers par doublement de préfixes : à chaque tour, les suffixes sont triés selon le rang de leurs 2^k premiers symboles
+#
+# :param symbols: la séquence (non modifiée)
+# :return: les positions de début des suffixes dans l'ordre lexicographique des suffixes
+def buildSuffixArray(symbols:list[int]) -> list[int]:
+    """
+    Build the suffix array of a sequence of integer symbols by prefix doubling.
+
+    At each round suffixes are sorted by the ranks of their first 2^k symbols,
+    the number of rounds is logarithmic in the length of the longest repeat.
+
+    Args:
+        symbols (list[int]): The sequence (not modified)
+
+    Returns:
+        list[int]: Start positions of the suffixes in lexicographic order
+    """
+    n:int = len(symbols)
+    suffixes:list[int] = list(range(n))
+    rank:list[int] = list(symbols)
+    k:int = 1
+    while n > 1:
+        # Clé de tri : rang des k premiers symboles puis rang des k suivants (-1 si le suffixe est trop court)
+        key = lambda i: (rank[i], rank[i+k] if i+k < n else -1)
+        suffixes.sort(key=key)
+        newRank:list[int] = [0]*n
+        for j in range(1, n):
+            newRank[suffixes[j]] = newRank[suffixes[j-1]] + (1 if key(suffixes[j-1]) != key(suffixes[j]) else 0)
+        rank = newRank
+        # Tous les rangs sont distincts, le tri est terminé
+        if rank[suffixes[-1]] == n-1:
+            break
+        k *= 2
+    return suffixes
+
+# Construit le tableau des plus longs préfixes communs (algorithme de Kasai) : lcp[i] est la longueur du préfixe commun aux suffixes suffixArray[i-1] et suffixArray[i] (lcp[0] vaut 0)
+def buildLCP(symbols:list[int], suffixArray:list[int]) -> list[int]:
+    """
+    Build the longest common prefix array of a suffix array (Kasai's algorithm).
+
+    Args:
+        symbols (list[int]): The sequence
+        suffixArray (list[int]): Its suffix array (see buildSuffixArray)
+
+    Returns:
+        list[int]: lcp[i] is the length of the common prefix of the suffixes
+            suffixArray[i-1] and suffixArray[i], lcp[0] is 0
+    """
+    n:int = len(symbols)
+    rank:list[int] = [0]*n
+    for i, suffix in enumerate(suffixArray):
+        rank[suffix] = i
+    lcp:list[int] = [0]*n
+    h:int = 0
+    for i in range(n):
+        if rank[i] > 0:
+            j:int = suffixArray[rank[i]-1]
+            while i+h < n and j+h < n and symbols[i+h] == symbols[j+h]:
+                h += 1
+            lcp[rank[i]] = h
+            if h > 0:
+                h -= 1
+        else:
+            h = 0
+    return lcp
+
+# Sélectionne de gauche à droite les occurrences sans chevauchement d'un motif de longueur "length" à partir de ses positions de début
+def selectNonOverlapping(positions:list[int], length:int) -> list[tuple[int, int]]:
+    """
+    Select, from left to right, the non overlapping occurrences of a pattern.
+
+    Args:
+        positions (list[int]): Start positions of the occurrences (any order)
+        length (int): Length of the pattern
+
+    Returns:
+        list[tuple[int, int]]: Start and end (both inclusive) of the selected occurrences
+    """
+    occurrences:list[tuple[int, int]] = []
+    for position in sorted(positions):
+        if len(occurrences) == 0 or position > occurrences[-1][1]:
+            occurrences.append((position, position+length-1))
+    return occurrences
+
+# Enumère les répétitions maximales d'une séquence à partir des intervalles du tableau LCP. Une répétition est maximale si elle ne peut être étendue ni à droite ni à gauche sans perdre d'occurrence
+#
+# :param symbols: la séquence à analyser
+# :param minLength: longueur minimale des répétitions
+# :return: pour chaque répétition (triées par première occurrence puis longueur), les symboles la composant et ses occurrences sans chevauchement (seules les répétitions ayant au moins deux telles occurrences sont conservées)
+def getMaximalRepeats(symbols:list[int], minLength:int = 2) -> list[tuple[list[int], list[tuple[int, int]]]]:
+    """
+    Enumerate the maximal repeats of a sequence using the LCP intervals.
+
+    A repeat is maximal if it can't be extended to the right nor to the left
+    without losing an occurrence. Each LCP interval is a right maximal repeat,
+    it is left maximal if its occurrences are not all preceded by the same symbol.
+
+    Args:
+        symbols (list[int]): The sequence to analyse
+        minLength (int, optional): Minimum length of a repeat. Defaults to 2
+
+    Returns:
+        list[tuple[list[int], list[tuple[int, int]]]]: For each repeat, sorted by
+            first occurrence then length, its symbols and its non overlapping
+            occurrences (only repeats with at least two of them are kept)
+    """
+    n:int = len(symbols)
+    if n < 2:
+        return []
+    suffixArray:list[int] = buildSuffixArray(symbols)
+    lcp:list[int] = buildLCP(symbols, suffixArray)
+    repeats:list[tuple[list[int], list[tuple[int, int]]]] = []
+    # Pile des intervalles LCP ouverts : (longueur du préfixe commun, indice de début dans le tableau des suffixes)
+    stack:list[tuple[int, int]] = [(0, 0)]
+    for i in range(1, n+1):
+        current:int = lcp[i] if i < n else 0
+        left:int = i-1
+        while stack[-1][0] > current:
+            length, left = stack.pop()
+            if length >= minLength:
+                positions:list[int] = suffixArray[left:i]
+                # Maximalité à gauche : les occurrences ne sont pas toutes précédées du même symbole
+                if any(p == 0 for p in positions) or len({symbols[p-1] for p in positions}) > 1:
+                    occurrences:list[tuple[int, int]] = selectNonOverlapping(positions, length)
+                    if len(occurrences) > 1:
+                        repeats.append((symbols[occurrences[0][0]:occurrences[0][0]+length], occurrences))
+        if stack[-1][0] < current:
+            stack.append((current, left))
+    repeats.sort(key=lambda repeat: (repeat[1][0][0], len(repeat[0])))
+    return repeats
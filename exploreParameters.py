@@ -1,11 +1,15 @@
 import json
 import os
-from typing import Any, Union
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, as_completed, wait
+from typing import Any, Optional, Union
 from Event import Call, Event
-from MAP import MAP, CompressionSet, CompressionStats
+from MAP import ALGORITHM_VERSION, MAP, TIME_LIMIT, Behaviour, CompressionSet, CompressionStats, EncodedCompression, chunkedMAP, decodeCompressionSet, encodeCompressionSet, MAPWithBehaviour
+from PTKE import PTKE, EnumerationCache, RankingCache
+from ResultStore import ResultStore, hashTrace
 import numpy as np
 import sys
-from decimal import Decimal
+import time
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
 import argparse
 
 # la classe Point
@@ -42,6 +46,146 @@ class Cube:
 	def __eq__(self, other:object) -> bool:
 		return isinstance(other, Cube) and abs(self.gr_from-other.gr_from) < 0.001 and abs(self.gr_to-other.gr_to) < 0.001 and abs(self.ws_from-other.ws_from) < 0.001 and abs(self.ws_to-other.ws_to) < 0.001 and abs(self.pb_from-other.pb_from) < 0.001 and abs(self.pb_to-other.pb_to) < 0.001
 
+# la classe SweepLog
+# un objet SweepLog enregistre au fil de l'eau les résultats d'une exploration dans un fichier JSON Lines (un enregistrement par point, dans l'ordre où les points sont ajoutés à g_exploredMap). Les enregistrements déjà présents dans le fichier sont relus à l'ouverture pour reprendre une exploration interrompue, sauf s'ils ont été produits par une autre version de l'algorithme (ou avec d'autres options) auquel cas le fichier est recommencé
+class SweepLog:
+	def __init__(self, path:str, algorithm:str) -> None:
+		self.path:str = path
+		# Identifiant de l'algorithme ayant produit les résultats (voir algorithm_id)
+		self.algorithm:str = algorithm
+		# Compressions des points déjà enregistrés, indexées par point_key
+		self.records:dict[str, CompressionSet] = {}
+		validLength:int = 0
+		if os.path.exists(path):
+			with open(path, 'rb') as file:
+				for line in file:
+					# Une ligne incomplète (exploration interrompue pendant l'écriture) termine la lecture
+					try:
+						record:dict[str, Any] = json.loads(line)
+					except ValueError:
+						break
+					if not line.endswith(b"\n"):
+						break
+					if record.get("algorithm") != algorithm:
+						self.records = {}
+						validLength = 0
+						break
+					encoded:list[EncodedCompression] = [tuple(e) for e in record["encoded"]] # type: ignore
+					self.records[record["key"]] = decodeCompressionSet(encoded)
+					validLength += len(line)
+		self.file = open(path, 'ab')
+		self.file.truncate(validLength)
+
+	# \brief Ajoute l'enregistrement d'un point au fichier
+	def write(self, key:str, gr:Decimal, ws:Decimal, pb:Decimal, code:int, compressions:CompressionSet) -> None:
+		record:dict[str, Any] = {"key": key, "algorithm": self.algorithm, "gr": str(gr), "ws": str(ws), "pb": str(pb), "code": code, "compressions": [stats.to_dict() for stats in compressions.to_dict()], "encoded": encodeCompressionSet(compressions)}
+		self.file.write((json.dumps(record, ensure_ascii=False)+"\n").encode("utf-8"))
+		self.file.flush()
+		self.records[key] = compressions
+
+	def close(self) -> None:
+		self.file.close()
+
+# Cellule d'un ParameterOctree : coordonnées de son origine et tailles selon gr, ws et pb, en nombre de pas de la résolution
+Cell = tuple[tuple[int, int, int], tuple[int, int, int]]
+
+# la classe ParameterOctree
+# un objet ParameterOctree représente de manière creuse les points explorés de l'espace des paramètres. Les points sont repérés par leurs coordonnées entières sur le réseau de la résolution demandée (indexation par table de hachage) et les cellules explorées forment un octree : une cellule dont les 8 coins n'ont pas le même code est découpée en 8 sous-cellules (moins le long des axes où elle ne fait plus qu'un pas), jusqu'à la résolution. Seules les cellules contenant une frontière sont raffinées, le nombre de points explorés dépend donc de l'étendue des frontières et non de la taille de la grille dense équivalente
+class ParameterOctree:
+	def __init__(self, lower:tuple[Decimal, Decimal, Decimal], upper:tuple[Decimal, Decimal, Decimal], resolution:tuple[Decimal, Decimal, Decimal]) -> None:
+		self.lower:tuple[Decimal, Decimal, Decimal] = lower
+		self.resolution:tuple[Decimal, Decimal, Decimal] = resolution
+		size:tuple[int, int, int] = (ParameterOctree.nb_steps(lower[0], upper[0], resolution[0]), ParameterOctree.nb_steps(lower[1], upper[1], resolution[1]), ParameterOctree.nb_steps(lower[2], upper[2], resolution[2]))
+		# Code de chaque point exploré (-1, 1 ou 2, voir g_tab_parametersToBestResultPos), indexé par ses coordonnées
+		self.codes:dict[tuple[int, int, int], int] = {}
+		# Sous-cellules des cellules découpées
+		self.children:dict[Cell, list[Cell]] = {}
+		# Cellules non découpées : leur code si elles sont homogènes, None si elles contiennent une frontière à la résolution
+		self.leaves:dict[Cell, Optional[int]] = {}
+		# Comme pour la recherche dichotomique, l'espace est d'emblée découpé en 8
+		self.root:Cell = ((0, 0, 0), size)
+		self.children[self.root] = ParameterOctree.split(self.root)
+
+	# \brief Nombre de pas de la résolution entre deux bornes
+	#
+	# @return: le nombre de pas, une ValueError est levée si l'écart entre les bornes n'en est pas un multiple
+	@staticmethod
+	def nb_steps(lower:Decimal, upper:Decimal, step:Decimal) -> int:
+		if step <= 0 or (upper-lower) % step != 0:
+			raise ValueError("le pas "+str(step)+" ne divise pas l'intervalle ["+str(lower)+", "+str(upper)+"]")
+		return int((upper-lower)/step)
+
+	# \brief Découpe une cellule en deux selon chacun des axes où elle fait plus d'un pas
+	@staticmethod
+	def split(cell:Cell) -> list[Cell]:
+		origin, size = cell
+		# Intervalles (origine, taille) de chaque axe
+		ranges:list[list[tuple[int, int]]] = []
+		for axis in range(3):
+			if size[axis] > 1:
+				half:int = size[axis]//2
+				ranges.append([(origin[axis], half), (origin[axis]+half, size[axis]-half)])
+			else:
+				ranges.append([(origin[axis], size[axis])])
+		# Même ordre que get_corners : gr varie en premier, puis ws, puis pb
+		return [((gr[0], ws[0], pb[0]), (gr[1], ws[1], pb[1])) for pb in ranges[2] for ws in ranges[1] for gr in ranges[0]]
+
+	# \brief Retourne les coordonnées des 8 coins d'une cellule, dans l'ordre de get_corners
+	@staticmethod
+	def corners(cell:Cell) -> list[tuple[int, int, int]]:
+		origin, size = cell
+		return [(origin[0]+dgr, origin[1]+dws, origin[2]+dpb) for dpb in (0, size[2]) for dws in (0, size[1]) for dgr in (0, size[0])]
+
+	# \brief Point de l'espace des paramètres correspondant à des coordonnées
+	def to_point(self, coords:tuple[int, int, int]) -> Point:
+		return Point(self.lower[0]+coords[0]*self.resolution[0], self.lower[1]+coords[1]*self.resolution[1], self.lower[2]+coords[2]*self.resolution[2])
+
+	# \brief Classe une cellule dont les codes des 8 coins sont connus : homogène, frontière à la résolution ou à découper
+	#
+	# @return: les sous-cellules à explorer (aucune si la cellule n'est pas découpée)
+	def refine(self, cell:Cell) -> list[Cell]:
+		codes:list[int] = [self.codes[corner] for corner in ParameterOctree.corners(cell)]
+		if all(code == codes[0] for code in codes):
+			self.leaves[cell] = codes[0]
+			return []
+		if all(size <= 1 for size in cell[1]):
+			self.leaves[cell] = None
+			return []
+		self.children[cell] = ParameterOctree.split(cell)
+		return self.children[cell]
+
+	# \brief Exporte les codes sous la forme de la matrice dense de g_tab_parametersToBestResultPos, échantillonnée avec les pas demandés. Les points de la matrice reçoivent le code de la cellule homogène les contenant, ceux des cellules frontières le code du coin le plus proche et les points explorés leur propre code
+	#
+	# @steps : les pas de la matrice selon gr, ws et pb (ils doivent diviser les intervalles des paramètres, mais pas nécessairement être des multiples de la résolution)
+	# @return: la matrice des codes
+	def export(self, steps:tuple[Decimal, Decimal, Decimal]) -> np.ndarray[Any, np.dtype[np.float64]]:
+		shape:list[int] = [ParameterOctree.nb_steps(self.lower[axis], self.lower[axis]+self.root[1][axis]*self.resolution[axis], steps[axis])+1 for axis in range(3)]
+		tab:np.ndarray[Any, np.dtype[np.float64]] = np.zeros(shape)
+		# Indices [début, fin[ des points de la matrice compris entre deux coordonnées d'un axe
+		def indices(axis:int, start:Decimal, end:Decimal) -> slice:
+			return slice(int((start*self.resolution[axis]/steps[axis]).to_integral_value(rounding=ROUND_CEILING)), int((end*self.resolution[axis]/steps[axis]).to_integral_value(rounding=ROUND_FLOOR))+1)
+		# Cellules homogènes puis cellules frontières (découpées selon chaque axe en leur milieu, chaque moitié prenant le code des coins de son côté)
+		for homogeneous in (True, False):
+			for (origin, size), code in self.leaves.items():
+				if (code != None) != homogeneous:
+					continue
+				if code != None:
+					tab[indices(0, Decimal(origin[0]), Decimal(origin[0]+size[0])), indices(1, Decimal(origin[1]), Decimal(origin[1]+size[1])), indices(2, Decimal(origin[2]), Decimal(origin[2]+size[2]))] = code
+				else:
+					# Le milieu exact d'un axe revient au coin inférieur
+					lowerHalves:list[slice] = [indices(axis, Decimal(origin[axis]), Decimal(origin[axis])+Decimal(size[axis])/2) for axis in range(3)]
+					upperHalves:list[slice] = [slice(lowerHalves[axis].stop, indices(axis, Decimal(origin[axis]), Decimal(origin[axis]+size[axis])).stop) for axis in range(3)]
+					for corner in ParameterOctree.corners((origin, size)):
+						halves:list[slice] = [lowerHalves[axis] if corner[axis] == origin[axis] else upperHalves[axis] for axis in range(3)]
+						tab[halves[0], halves[1], halves[2]] = self.codes[corner]
+		# Points explorés situés sur la matrice
+		for coords, code in self.codes.items():
+			position:list[Decimal] = [coords[axis]*self.resolution[axis]/steps[axis] for axis in range(3)]
+			if all(p == int(p) for p in position):
+				tab[int(position[0])][int(position[1])][int(position[2])] = code
+		return tab
+
+
 global g_exploredMap, g_nbSteps, gr_bounds, ws_bounds, pb_bounds, g_tab_parametersToBestResultPos
 
 g_nbPoints:int = 11
@@ -52,6 +196,47 @@ g_gr_step:Decimal = (g_gr_bounds[1]-g_gr_bounds[0])/(g_nbPoints-1)
 g_ws_step:Decimal = (g_ws_bounds[1]-g_ws_bounds[0])/(g_nbPoints-1)
 g_pb_step:Decimal = (g_pb_bounds[1]-g_pb_bounds[0])/(g_nbPoints-1)
 
+# Si vrai, MAP s'arrête dès que la solution de référence est trouvée (les compressions enregistrées pour chaque point sont alors partielles)
+g_earlyStop:bool = False
+
+# Si strictement positif, les traces plus longues que cette taille sont compressées par segments (voir chunkedMAP) au lieu d'être données directement à MAP
+g_chunkSize:int = 0
+
+# Si défini, la recherche dichotomique raffine les frontières jusqu'à ces pas de gr, ws et pb à l'aide d'un ParameterOctree au lieu de la grille de g_nbPoints points par axe
+g_resolution:Optional[tuple[Decimal, Decimal, Decimal]] = None
+
+# Pas selon gr, ws et pb de la matrice des codes enregistrée à l'issue d'une recherche par ParameterOctree (par défaut ceux de la grille de g_nbPoints points par axe)
+g_exportSteps:tuple[Decimal, Decimal, Decimal] = (g_gr_step, g_ws_step, g_pb_step)
+
+# Recherche guidée par un modèle de substitution (mode surrogate) : nombre de voisins pris en compte par le classifieur, nombre de points compressés à chaque tour, poids de l'éloignement aux points déjà compressés dans le choix des points (pour ne pas négliger les zones peu explorées) et nombre de tours successifs sans changement de la région de succès estimée au bout duquel la recherche s'arrête
+g_surrogateNeighbours:int = 4
+g_surrogateBatch:int = 8
+g_surrogateExploration:float = 0.1
+g_surrogateStableRounds:int = 3
+# Part des points de la grille à compresser avant qu'une région de succès estimée vide puisse être considérée comme stable (une région de succès peut se trouver entre les points déjà compressés)
+g_surrogateMinCoverage:float = 0.2
+
+# Si vrai, le comportement de chaque exécution de MAP vis-à-vis de ws et pb est enregistré (voir MAP.Behaviour) : un point dont les paramètres donnent les mêmes résultats à toutes les comparaisons de scores et à tous les tests de fusion d'une exécution précédente (même trace, même gr) reprend ses compressions sans exécuter MAP
+g_skipEquivalent:bool = False
+
+# Comportements enregistrés par ce processus pour chaque trace et chaque gr, avec les compressions obtenues (voir g_skipEquivalent)
+g_behaviours:dict[tuple[str, float], list[tuple[Behaviour, CompressionSet]]] = {}
+
+# Nombre de processus utilisés pour exécuter MAP sur plusieurs points en parallèle (1 pour une exécution en série)
+g_nbWorkers:int = 1
+
+# Si vrai, les résultats sont conservés dans un stockage persistant (ResultStore) placé dans le dossier du dataset et consultés avant d'exécuter MAP
+g_useStore:bool = True
+
+# Stockage persistant des résultats ouvert pour le dataset en cours d'analyse (None si désactivé)
+g_store:Optional[ResultStore] = None
+
+# Enregistrement au fil de l'eau des résultats du fichier en cours d'analyse (None si aucun)
+g_sweepLog:Optional[SweepLog] = None
+
+# Si vrai, les résultats enregistrés au fil de l'eau sont aussi convertis à la fin de chaque fichier au format JSON utilisé par les notebooks
+g_legacyOutput:bool = True
+
 # Association de la combinaison des paramètre à explorer représentés sous la forme d'une chaine de caractère avec le résultat de la compression pour ces paramètres
 g_exploredMap:dict[str, CompressionSet] = {}
 
@@ -62,13 +247,163 @@ g_tab_parametersToBestResultPos:np.ndarray[Any, np.dtype[np.float64]]
 def round_to_multiple(number:Decimal, episilon:Decimal) -> Decimal:
     return Decimal(episilon * round(Decimal(number) / Decimal(episilon)))
 
+# \brief Compresser une trace avec MAP, ou par segments si la trace dépasse g_chunkSize (l'arrêt anticipé n'est alors pas disponible)
+#
+# @eventList : la trace à compresser sous la forme d'une liste d'évènements
+# @gr, ws, pb : les paramètres de la compression
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @return: retourne les compressions de la trace
+def compress(eventList:list[Event], gr:float, ws:float, pb:float, solution:str) -> CompressionSet:
+	if g_chunkSize > 0 and len(eventList) > g_chunkSize:
+		return chunkedMAP(eventList, gr, ws, pb, g_chunkSize)
+	if g_skipEquivalent:
+		return compress_equivalent(eventList, gr, ws, pb, solution)
+	return MAP(eventList, gr, ws, pb, solution if g_earlyStop else None)
+
+# \brief Compresser une trace avec MAP sauf si une exécution précédente pour la même trace et le même gr prend les mêmes décisions avec ws et pb (voir g_skipEquivalent)
+#
+# @eventList : la trace à compresser sous la forme d'une liste d'évènements
+# @gr, ws, pb : les paramètres de la compression
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @return: retourne les compressions de la trace
+def compress_equivalent(eventList:list[Event], gr:float, ws:float, pb:float, solution:str) -> CompressionSet:
+	key:tuple[str, float] = ("".join(str(e) for e in eventList), gr)
+	behaviours:list[tuple[Behaviour, CompressionSet]] = g_behaviours.setdefault(key, [])
+	for behaviour, compressions in behaviours:
+		if behaviour.isEquivalent(ws, pb):
+			return compressions
+	compressions, behaviour = MAPWithBehaviour(eventList, gr, ws, pb, solution if g_earlyStop else None)
+	if behaviour != None:
+		behaviours.append((behaviour, compressions))
+	return compressions
+
+# \brief Identifiant de la version de MAP et des options modifiant les compressions, utilisé dans la clé des résultats stockés
+#
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère (les compressions dépendent de la solution en cas d'arrêt anticipé)
+def algorithm_id(solution:str) -> str:
+	algorithm:str = "MAP"+str(ALGORITHM_VERSION)+";K="+str(PTKE.K)+";chunk="+str(g_chunkSize)+";grammar="+str(PTKE.GRAMMAR_SEEDING)+";repeats="+str(PTKE.SUFFIX_SEEDING)
+	if g_earlyStop:
+		algorithm += ";earlyStop="+hashTrace(solution)
+	return algorithm
+
+# \brief Cherche dans le stockage persistant les compressions d'une trace pour des paramètres donnés
+#
+# @return: retourne les compressions stockées ou None si elles ne l'ont pas été (ou si le stockage est désactivé)
+def load_result(trace:str, gr:float, ws:float, pb:float, solution:str) -> Optional[CompressionSet]:
+	if g_store == None:
+		return None
+	return g_store.get(hashTrace(trace), gr, ws, pb, algorithm_id(solution), TIME_LIMIT)
+
+# \brief Enregistre dans le stockage persistant les compressions d'une trace pour des paramètres donnés
+def save_result(trace:str, gr:float, ws:float, pb:float, solution:str, compressions:CompressionSet) -> None:
+	if g_store != None:
+		g_store.put(hashTrace(trace), gr, ws, pb, algorithm_id(solution), TIME_LIMIT, compressions)
+
+# \brief Durée moyenne de compression d'un point de la trace mesurée lors des explorations précédentes
+#
+# @return: retourne la durée moyenne en secondes ou None si elle n'a jamais été mesurée (ou si le stockage est désactivé)
+def load_runtime(trace:str) -> Optional[float]:
+	if g_store == None:
+		return None
+	return g_store.getMeanRuntime(hashTrace(trace))
+
+# \brief Enregistre dans le stockage persistant la durée de compression d'un point de la trace
+def save_runtime(trace:str, seconds:float) -> None:
+	if g_store != None:
+		g_store.addRuntime(hashTrace(trace), seconds)
+
+# \brief Cherche un résultat déjà disponible sans exécuter MAP : enregistré par l'exploration interrompue du fichier, ou stocké
+#
+# @return: retourne les compressions disponibles ou None
+def lookup_result(key:str, trace:str, gr:float, ws:float, pb:float, solution:str) -> Optional[CompressionSet]:
+	if g_sweepLog != None and key in g_sweepLog.records:
+		return g_sweepLog.records[key]
+	return load_result(trace, gr, ws, pb, solution)
+
+# \brief Enregistre au fil de l'eau le résultat d'un point ajouté à g_exploredMap (sauf s'il l'a déjà été avant une reprise)
+def log_result(key:str, gr:Decimal, ws:Decimal, pb:Decimal, code:int, compressions:CompressionSet) -> None:
+	if g_sweepLog != None and key not in g_sweepLog.records:
+		g_sweepLog.write(key, gr, ws, pb, code, compressions)
+
+# \brief Compresse une trace pour des paramètres donnés en réutilisant si possible le résultat stocké
+#
+# @trace : la trace à compresser sous la forme d'une chaine de caractère
+# @gr, ws, pb : les paramètres de la compression
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @return: retourne les compressions de la trace
+def compress_point(trace:str, gr:float, ws:float, pb:float, solution:str) -> CompressionSet:
+	compressions:Optional[CompressionSet] = load_result(trace, gr, ws, pb, solution)
+	if compressions == None:
+		seconds:float
+		compressions, seconds = timed_compress_task((trace, gr, ws, pb, solution))
+		save_result(trace, gr, ws, pb, solution, compressions)
+		save_runtime(trace, seconds)
+	return compressions
+
+# \brief Initialise un processus de travail avec les options de l'exploration (nécessaire si les processus ne sont pas créés par fork)
+def init_worker(earlyStop:bool, chunkSize:int, grammarSeeding:bool, suffixSeeding:bool, reuseEnumeration:bool, skipEquivalent:bool) -> None:
+	global g_earlyStop, g_chunkSize, g_skipEquivalent
+	g_earlyStop = earlyStop
+	g_chunkSize = chunkSize
+	g_skipEquivalent = skipEquivalent
+	PTKE.GRAMMAR_SEEDING = grammarSeeding
+	PTKE.SUFFIX_SEEDING = suffixSeeding
+	# Chaque processus a son propre mémo des extensions, partagé par les points qu'il compresse
+	PTKE.ENUMERATION_CACHE = EnumerationCache() if reuseEnumeration else None
+	PTKE.RANKING_CACHE = RankingCache() if skipEquivalent else None
+
+# \brief Crée l'exécuteur des compressions en parallèle, ou retourne None si l'exploration se fait en série
+def create_executor() -> Optional[Executor]:
+	if g_nbWorkers <= 1:
+		return None
+	return ProcessPoolExecutor(g_nbWorkers, initializer=init_worker, initargs=(g_earlyStop, g_chunkSize, PTKE.GRAMMAR_SEEDING, PTKE.SUFFIX_SEEDING, PTKE.ENUMERATION_CACHE != None, g_skipEquivalent))
+
+# \brief Compresse une trace pour un point de l'espace des paramètres, tâche exécutée par un processus de travail
+#
+# @params : la trace sous la forme d'une chaine de caractère, les paramètres gr, ws et pb et la solution de référence
+# @return: retourne les compressions de la trace
+def compress_task(params:tuple[str, float, float, float, str]) -> CompressionSet:
+	trace, gr, ws, pb, solution = params
+	eventList:list[Event] = []
+	for char in trace:
+		eventList.append(Call(char))
+	return compress(eventList, gr, ws, pb, solution)
+
+# \brief Compresse une trace pour un point de l'espace des paramètres en mesurant la durée de la compression
+#
+# @params : voir compress_task
+# @return: retourne les compressions de la trace et la durée de la compression en secondes
+def timed_compress_task(params:tuple[str, float, float, float, str]) -> tuple[CompressionSet, float]:
+	start:float = time.perf_counter()
+	compressions:CompressionSet = compress_task(params)
+	return compressions, time.perf_counter()-start
+
+# \brief Clé d'un point dans g_exploredMap
+def point_key(point:Point) -> str:
+	return str(point.gr)+"gr_"+str(point.ws)+"ws_"+str(point.pb)+"pb"
+
+# \brief Liste les points de la grille explorée de manière exhaustive, dans l'ordre de la grille
+#
+# @return: pour chaque point, ses indices dans g_tab_parametersToBestResultPos, ses paramètres gr, ws et pb et sa clé dans g_exploredMap
+def grid_points() -> list[tuple[int, int, int, Decimal, Decimal, Decimal, str]]:
+	points:list[tuple[int, int, int, Decimal, Decimal, Decimal, str]] = []
+	for i in range(g_nbPoints):
+		gr = i*g_gr_step
+		for j in range(g_nbPoints):
+			ws = j*g_ws_step
+			for k in range(g_nbPoints):
+				pb = k*g_pb_step
+				points.append((i, j, k, gr, ws, pb, str(gr)+"gr_"+str(ws)+"ws_"+str(pb)+"pb"))
+	return points
+
 # \brief Essayer d'obtenir la solution avec un objet Point, si nous avons déjà eu la solution de ce point nous retournons directement la solution, sinon nous allons exécuter notre algorithme MAP avec les paramètres du point et enregistrer la solution dans un dictionnaire
 #
 # @point : le point sous la forme d'une combinaison gr/ws/pb à tester
 # @trace : la trace à compresser sous la forme d'une chaine de caractère
 # @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @precomputed : compressions déjà calculées (par exemple en parallèle) à utiliser au lieu d'exécuter MAP, indexées par point_key
 # @return: retourne la compression associée à ce point
-def get_from_map(point:Point, trace:str, solution:str) -> CompressionSet:
+def get_from_map(point:Point, trace:str, solution:str, precomputed:Optional[dict[str, CompressionSet]] = None) -> CompressionSet:
 	global g_exploredMap, g_tab_parametersToBestResultPos
 	gr:Decimal = point.gr
 	ws:Decimal = point.ws
@@ -79,7 +414,7 @@ def get_from_map(point:Point, trace:str, solution:str) -> CompressionSet:
 	# dans le cas les paramètres ne sont plus légitimes
 	if(gr<g_gr_bounds[0] or ws<g_ws_bounds[0] or pb<g_pb_bounds[0] or gr>g_gr_bounds[1] or ws>g_ws_bounds[1] or pb>g_pb_bounds[1]):
 		raise IndexError
-	key:str = str(gr)+"gr_"+str(ws)+"ws_"+str(pb)+"pb"
+	key:str = point_key(point)
 	i:int = round(gr/g_gr_step)
 	j:int = round(ws/g_ws_step)
 	k:int = round(pb/g_pb_step)
@@ -88,13 +423,14 @@ def get_from_map(point:Point, trace:str, solution:str) -> CompressionSet:
 		return g_exploredMap[key]
 	# sinon nous faisons l'essaie avec les paramètres du point
 	else:
-		print("("+str(len(g_exploredMap))+") Call MAP with parameters\tgr: "+str(gr)+"   \tws: "+str(ws)+"   \tpb: "+str(pb), end='\r')
-		# Fait tourner l'algo de compression sur la trace
-		# Transformation du string en une liste d'évènement
-		eventList:list[Event] = []
-		for char in trace:
-			eventList.append(Call(char))
-		g_exploredMap[key] = MAP(eventList, float(gr), float(ws), float(pb))
+		if precomputed != None and key in precomputed:
+			g_exploredMap[key] = precomputed[key]
+		elif g_sweepLog != None and key in g_sweepLog.records:
+			g_exploredMap[key] = g_sweepLog.records[key]
+		else:
+			print("("+str(len(g_exploredMap))+") Call MAP with parameters\tgr: "+str(gr)+"   \tws: "+str(ws)+"   \tpb: "+str(pb), end='\r')
+			# Fait tourner l'algo de compression sur la trace (sauf si le résultat est déjà stocké)
+			g_exploredMap[key] = compress_point(trace, float(gr), float(ws), float(pb), solution)
 
 		#print()
 		#for c in g_exploredMap[key].set:
@@ -102,14 +438,518 @@ def get_from_map(point:Point, trace:str, solution:str) -> CompressionSet:
 
 		g_tab_parametersToBestResultPos[i][j][k]=g_exploredMap[key].getCode(solution)
 		#print(solution+" "+str(g_tab_parametersToBestResultPos[i][j][k]))
+		log_result(key, gr, ws, pb, int(g_tab_parametersToBestResultPos[i][j][k]), g_exploredMap[key])
 
 		return g_exploredMap[key]
 
+# \brief Retourne les 8 coins d'un cube
+#
+# @r : le cube
+# @return: les coins p1 à p8 (voir le schéma de split_cube)
+def get_corners(r:Cube) -> list[Point]:
+	return [Point(r.gr_from, r.ws_from, r.pb_from), Point(r.gr_to, r.ws_from, r.pb_from), Point(r.gr_from, r.ws_to, r.pb_from), Point(r.gr_to, r.ws_to, r.pb_from),
+		Point(r.gr_from, r.ws_from, r.pb_to), Point(r.gr_to, r.ws_from, r.pb_to), Point(r.gr_from, r.ws_to, r.pb_to), Point(r.gr_to, r.ws_to, r.pb_to)]
+
+# \brief Découpe un cube en fonction des compressions obtenues sur ses coins : les zones homogènes sont abandonnées et les sous-cubes contenant une frontière sont retournés pour être explorés
+#
+# @r : le cube à découper
+# @sols : les compressions des coins p1 à p8 du cube
+# @return: les sous-cubes à explorer, dans l'ordre où ils doivent être ajoutés à la file
+def split_cube(r:Cube, sols:list[CompressionSet]) -> list[Cube]:
+	cubes:list[Cube] = []
+	# Les 8 points analysés en coordonnées gr, ws et pb
+	#     p7--------p8
+	#    /|         /|
+	#   / |        / |
+	#  /  |       /  |  pb 
+	# p5--------p6   |   x
+	# |   |      |   |   |  x ws
+	# |   p3-----|--p4   | /
+	# |  /       |  /    |/
+	# | /        | /     +------x gr
+	# |/         |/
+	# p1--------p2
+	p1, p2, p3, p4, p5, p6, p7, p8 = get_corners(r)
+	sol1, sol2, sol3, sol4, sol5, sol6, sol7, sol8 = sols
+	# calcul des positions intermédiaires
+	gr_halfGap = round_to_multiple(abs(p2.gr-p1.gr)/2, g_gr_step)
+	ws_halfGap = round_to_multiple(abs(p3.ws-p1.ws)/2, g_ws_step)
+	pb_halfGap = round_to_multiple(abs(p5.pb-p1.pb)/2, g_pb_step)
+	# si toutes les solution sont égales, il suffit de passer au cube suivant dans la queue
+	if (sol1 == sol2 and sol1 == sol3 and sol1 == sol4 and sol1 == sol5 and sol1 == sol6 and sol1 == sol7 and sol1 == sol8):
+		return cubes
+	#print (str(p1), str(p2), str(p3), str(p4), str(p5), str(p6), str(p7), str(p8))
+	# si la face devant est homogène mais différente d'un point en arrière
+	if (sol1 == sol2 and sol1 == sol5 and sol1 == sol6 and (sol1 != sol3 or sol2 != sol4 or sol5 != sol7 or sol6 != sol8)):
+		# Construction d'un cube pour l'avant
+		#     p7--------p8
+		#    /|         /|
+		#   +----------+ |
+		#  /          /| | pb
+		# p5--------p6 | |  x
+		# |          | | |  |  x ws
+		# |          | |p4  | /
+		# |          | |/   |/
+		# |          | +    +------x gr
+		# |          |/
+		# p1--------p2
+		cubes.append(Cube(p1.gr, p2.gr, p1.ws, round_to_multiple(p1.ws + ws_halfGap, g_ws_step), p1.pb, p5.pb))
+		#print("F")
+	# si la face arrière est homogène mais différente d'un point en avant
+	if (sol3 == sol4 and sol3 == sol7 and sol3 == sol8 and (sol1 != sol3 or sol2 != sol4 or sol5 != sol7 or sol6 != sol8)):
+		# Construction d'un cube pour l'arrière
+		#     p7--------p8
+		#    /          /|
+		#   +----------+ |
+		#  /|         /| | pb
+		# p5--------p6 | |  x
+		# | |        | | |  |  x ws
+		# | |        | |p4  | /
+		# | |        | |/   |/
+		# | +--------|-+    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p3.gr, p4.gr, round_to_multiple(p3.ws - ws_halfGap, g_ws_step), p3.ws, p3.pb, p7.pb))
+		#print("B")
+	# si la face de dessous est homogène mais différente d'un point en dessus
+	if (sol1 == sol2 and sol1 == sol3 and sol1 == sol4 and (sol1 != sol5 or sol2 != sol6 or sol3 != sol7 or sol4 != sol8)):
+		# Construction d'un cube pour le dessous
+		#     p7--------p8
+		#    /|         /|
+		#   / |        / |
+		#  /  +-------/--+ pb
+		# p5--------p6  /|  x
+		# | /        | / |  |  x ws
+		# |/         |/ p4  | /
+		# +----------+  /   |/
+		# |          | /    +------x gr
+		# |          |/
+		# p1--------p2
+		cubes.append(Cube(p1.gr, p2.gr, p1.ws, p3.ws, p1.pb, round_to_multiple(p1.pb + pb_halfGap, g_pb_step)))
+		#print("D")
+	# si la face de dessus est homogène mais différente d'un point en dessous
+	if (sol5 == sol6 and sol5 == sol7 and sol5 == sol8 and (sol1 != sol5 or sol2 != sol6 or sol3 != sol7 or sol4 != sol8)):
+		# Construction d'un cube pour le dessus
+		#     p7--------p8
+		#    /          /|
+		#   /          / |
+		#  /          /  + pb
+		# p5--------p6  /|  x
+		# |          | / |  |  x ws
+		# |          |/-p4  | /
+		# +----------+  /   |/
+		# | /        | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p5.gr, p6.gr, p5.ws, p7.ws, round_to_multiple(p5.pb - pb_halfGap, g_pb_step), p5.pb))
+		#print("U")
+	# si la face de gauche est homogène mais différente d'un point à droite
+	if (sol1 == sol3 and sol1 == sol5 and sol1 == sol7 and (sol1 != sol2 or sol3 != sol4 or sol5 != sol6 or sol7 != sol8)):
+		# Construction d'un cube pour la gauche
+		#     p7---+----p8
+		#    /    /|    /|
+		#   /    / |   / |
+		#  /    /  |  /  | pb
+		# p5---+----p6   |  x
+		# |    |   | |   |  |  x ws
+		# |    |   +-|--p4  | /
+		# |    |  /  |  /   |/
+		# |    | /   | /    +------x gr
+		# |    |/    |/
+		# p1---+----p2
+		cubes.append(Cube(p1.gr, round_to_multiple(p1.gr + gr_halfGap, g_gr_step), p1.ws, p3.ws, p1.pb, p5.pb))
+		#print("L")
+	# si la face de droite est homogène mais différente d'un point à gauche
+	if (sol2 == sol4 and sol2 == sol6 and sol2 == sol8 and (sol1 != sol2 or sol3 != sol4 or sol5 != sol6 or sol7 != sol8)):
+		# Construction d'un cube pour la droite
+		#     p7----+---p8
+		#    /|    /    /|
+		#   / |   /    / |
+		#  /  |  /    /  | pb
+		# p5----+---p6   |  x
+		# |   | |    |   |  |  x ws
+		# |   p3|    |  p4  | /
+		# |  /  |    |  /   |/
+		# | /   |    | /    +------x gr
+		# |/    |    |/
+		# p1----+---p2
+		cubes.append(Cube(round_to_multiple(p2.gr - gr_halfGap, g_gr_step), p2.gr, p2.ws, p4.ws, p2.pb, p6.pb))
+		#print("R")
+	# si l'arête avant/bas est homogène mais différente d'un point en dessus et en arrière
+	if (sol1 == sol2 and (sol1 != sol3 or sol2 != sol4) and (sol1 != sol5 or sol2 != sol6)):
+		# Construction d'un cube en bas devant
+		#     p7--------p8
+		#    /|         /|
+		#   / |        / |
+		#  /  |       /  | pb
+		# p5--------p6   |  x
+		# | +--------|-+ |  |  x ws
+		# |/         |/|p4  | /
+		# +----------+ |/   |/
+		# |          | +    +------x gr
+		# |          |/
+		# p1--------p2
+		cubes.append(Cube(p1.gr, p2.gr, p1.ws, round_to_multiple(p1.ws + ws_halfGap, g_ws_step), p1.pb, round_to_multiple(p1.pb + pb_halfGap, g_pb_step)))
+		#print("FD")
+	# si l'arête arrière/bas est homogène mais différente d'un point en dessus et en avant
+	if (sol3 == sol4 and (sol3 != sol7 or sol4 != sol8) and (sol3 != sol1 or sol4 != sol2)):
+		# Construction d'un cube en bas devant
+		#     p7--------p8
+		#    /|         /|
+		#   / |        / |
+		#  /  +-------/--+ pb
+		# p5--------p6  /|  x
+		# | +--------|-+ |  |  x ws
+		# | |        | |p4  | /
+		# | |        | |/   |/
+		# | +--------|-+    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p3.gr, p4.gr, round_to_multiple(p3.ws - ws_halfGap, g_ws_step), p3.ws, p3.pb, round_to_multiple(p3.pb + pb_halfGap, g_pb_step)))
+		#print("BD")
+	# si l'arête arrière/haut est homogène mais différente d'un point en dessous et en avant
+	if (sol7 == sol8 and (sol7 != sol5 or sol8 != sol6) and (sol7 != sol3 or sol8 != sol4)):
+		# Construction d'un cube en haut arrière
+		#     p7--------p8
+		#    /          /|
+		#   +----------+ |
+		#  /|         /| + pb
+		# p5--------p6 |/|  x
+		# | +--------|-+ |  |  x ws
+		# |   p3-----|--p4  | /
+		# |  /       |  /   |/
+		# | /        | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p7.gr, p8.gr, round_to_multiple(p7.ws - ws_halfGap, g_ws_step), p7.ws, round_to_multiple(p7.pb - pb_halfGap, g_pb_step), p7.pb))
+		#print("BU")
+	# si l'arête avant/haut est homogène mais différente d'un point en dessous et en arrière
+	if (sol5 == sol6 and (sol5 != sol1 or sol6 != sol2) and (sol5 != sol7 or sol6 != sol8)):
+		# Construction d'un cube en haut devant
+		#     p7--------p8
+		#    /|         /|
+		#   +----------+ |
+		#  /          /| | pb
+		# p5--------p6 | |  x
+		# |          | + |  |  x ws
+		# |          |/-p4  | /
+		# +----------+  /   |/
+		# | /        | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p5.gr, p6.gr, p5.ws, round_to_multiple(p5.ws + ws_halfGap, g_ws_step), round_to_multiple(p5.pb - pb_halfGap, g_pb_step), p5.pb))
+		#print("FU")
+	# si l'arête gauche/bas est homogène mais différente d'un point en dessus et à droite
+	if (sol1 == sol3 and (sol1 != sol2 or sol3 != sol4) and (sol1 != sol5 or sol3 != sol7)):
+		# Construction d'un cube en bas à gauche
+		#     p7--------p8
+		#    /|         /|
+		#   / |        / |
+		#  /  +----+  /  | pb
+		# p5--------p6   |  x
+		# | /    / | |   |  |  x ws
+		# |/    /  +-|--p4  | /
+		# +----+  /  |  /   |/
+		# |    | /   | /    +------x gr
+		# |    |/    |/
+		# p1---+----p2
+		cubes.append(Cube(p1.gr, round_to_multiple(p1.gr + gr_halfGap, g_gr_step), p1.ws, p3.ws, p1.pb, round_to_multiple(p1.pb + pb_halfGap, g_pb_step)))
+		#print("LD")
+	# si l'arête droite/bas est homogène mais différente d'un point en dessus et à gauche
+	if (sol2 == sol4 and (sol1 != sol2 or sol3 != sol4) and (sol2 != sol6 or sol4 != sol8)):
+		# Construction d'un cube en bas à droite
+		#     p7--------p8
+		#    /|         /|
+		#   / |        / |
+		#  /  |     +-/--+ pb
+		# p5--------p6  /|  x
+		# |   |   /  | / |  |  x ws
+		# |   p3-/   |/ p4  | /
+		# |  /  +----+  /   |/
+		# | /   |    | /    +------x gr
+		# |/    |    |/
+		# p1----+---p2
+		cubes.append(Cube(round_to_multiple(p2.gr - gr_halfGap, g_gr_step), p2.gr, p2.ws, p4.ws, p2.pb, round_to_multiple(p2.pb + pb_halfGap, g_pb_step)))
+		#print("LR")
+	# si l'arête droite/haut est homogène mais différente d'un point en dessous et à gauche
+	if (sol6 == sol8 and (sol6 != sol5 or sol8 != sol7) and (sol2 != sol6 or sol4 != sol8)):
+		# Construction d'un cube en haut à droite
+		#     p7----+---p8
+		#    /|    /    /|
+		#   / |   /    / |
+		#  /  |  /    /  + pb
+		# p5----+---p6  /|  x
+		# |   | |    | / |  |  x ws
+		# |   p3|    |/-p4  | /
+		# |  /  +----+  /   |/
+		# | /        | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(round_to_multiple(p6.gr - gr_halfGap, g_gr_step), p6.gr, p6.ws, p8.ws, round_to_multiple(p6.pb - pb_halfGap, g_pb_step), p6.pb))
+		#print("UR")
+	# si l'arête gauche/haut est homogène mais différente d'un point en dessous et à droite
+	if (sol5 == sol7 and (sol5 != sol6 or sol7 != sol8) and (sol1 != sol5 or sol3 != sol7)):
+		# Construction d'un cube en haut à gauche
+		#     p7---+----p8
+		#    /    /|    /|
+		#   /    / |   / |
+		#  /    /  +  /  | pb
+		# p5---+----p6   |  x
+		# |    | /   |   |  |  x ws
+		# |    |/----|--p4  | /
+		# +----+     |  /   |/
+		# | /        | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p5.gr, round_to_multiple(p5.gr + gr_halfGap, g_gr_step), p5.ws, p7.ws, round_to_multiple(p5.pb - pb_halfGap, g_pb_step), p5.pb))
+		#print("UL")
+	# si l'arête avant/gauche est homogène mais différente d'un point en arrière et à droite
+	if (sol1 == sol5 and (sol1 != sol2 or sol5 != sol6) and (sol1 != sol3 or sol5 != sol7)):
+		# Construction d'un cube devant à gauche
+		#     p7--------p8
+		#    /|         /|
+		#   +----+     / |
+		#  /    /|    /  | pb
+		# p5---+----p6   |  x
+		# |    | |   |   |  |  x ws
+		# |    | |---|--p4  | /
+		# |    | |   |  /   |/
+		# |    | +   | /    +------x gr
+		# |    |/    |/
+		# p1---+----p2
+		cubes.append(Cube(p1.gr, round_to_multiple(p1.gr + gr_halfGap, g_gr_step), p1.ws, round_to_multiple(p1.ws + ws_halfGap, g_ws_step), p1.pb, p5.pb))
+		#print("FL")
+	# si l'arête avant/droite est homogène mais différente d'un point en arrière et à gauche
+	if (sol2 == sol6 and (sol1 != sol2 or sol5 != sol6) and (sol2 != sol4 or sol6 != sol8)):
+		# Construction d'un cube devant à droite
+		#     p7--------p8
+		#    /|         /|
+		#   / |  +-----+ |
+		#  /  | /     /| | pb
+		# p5---+----p6 | |  x
+		# |   ||     | | |  |  x ws
+		# |   p|     | |p4  | /
+		# |  / |     | |/   |/
+		# | /  |     | +    +------x gr
+		# |/   |     |/
+		# p1---+----p2
+		cubes.append(Cube(round_to_multiple(p2.gr - gr_halfGap, g_gr_step), p2.gr, p2.ws, round_to_multiple(p2.ws + ws_halfGap, g_ws_step), p2.pb, p6.pb))
+		#print("FR")
+	# si l'arête arrière/droite est homogène mais différente d'un point en avant et à gauche
+	if (sol4 == sol8 and (sol3 != sol4 or sol7 != sol8) and (sol2 != sol4 or sol6 != sol8)):
+		# Construction d'un cube en arrière à droite
+		#     p7---+----p8
+		#    /|   /     /|
+		#   / |  +-----+ |
+		#  /  |  |    /| | pb
+		# p5--------p6 | |  x
+		# |   |  |   | | |  |  x ws
+		# |   p3-|   | |p4  | /
+		# |  /   |   | |/   |/
+		# | /    +---|-+    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(round_to_multiple(p4.gr - gr_halfGap, g_gr_step), p4.gr, round_to_multiple(p4.ws - ws_halfGap, g_ws_step), p4.ws, p4.pb, p8.pb))
+		#print("BR")
+	# si l'arête arrière/gauche est homogène mais différente d'un point en avant et à droite
+	if (sol3 == sol7 and (sol3 != sol4 or sol7 != sol8) and (sol3 != sol1 or sol7 != sol5)):
+		# Construction d'un cube en arrière à gauche
+		#     p7---+----p8
+		#    /    /|    /|
+		#   +----+ |   / |
+		#  /|    | |  /  | pb
+		# p5--------p6   |  x
+		# | |    | | |   |  |  x ws
+		# | |    | +-|--p4  | /
+		# | |    |/  |  /   |/
+		# | +----+   | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p3.gr, round_to_multiple(p3.gr + gr_halfGap, g_gr_step), round_to_multiple(p3.ws - ws_halfGap, g_ws_step), p3.ws, p3.pb, p7.pb))
+		#print("BL")
+	# si le coin avant/bas/gauche est isolé
+	if(sol1 != sol2 and sol1 != sol3 and sol1 != sol5):
+		# Construction d'un cube en bas à gauche devant
+		#     p7--------p8
+		#    /|         /|
+		#   / |        / |
+		#  /  |       /  | pb
+		# p5--------p6   |  x
+		# | +----+   |   |  |  x ws
+		# |/    /|---|--p4  | /
+		# +----+ |   |  /   |/
+		# |    | +   | /    +------x gr
+		# |    |/    |/
+		# p1---+----p2
+		cubes.append(Cube(p1.gr, round_to_multiple(p1.gr + gr_halfGap, g_gr_step), p1.ws, round_to_multiple(p1.ws + ws_halfGap, g_ws_step), p1.pb, round_to_multiple(p1.pb + pb_halfGap, g_pb_step)))
+		#print("FDL")
+	# si le coin avant/haut/gauche est isolé
+	if(sol5 != sol6 and sol5 != sol7 and sol5 != sol1):
+		# Construction d'un cube en haut à gauche devant
+		#     p7--------p8
+		#    /|         /|
+		#   +----+     / |
+		#  /    /|    /  | pb
+		# p5---+----p6   |  x
+		# |    | +   |   |  |  x ws
+		# |    |/----|--p4  | /
+		# +----+     |  /   |/
+		# | /        | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p5.gr, round_to_multiple(p5.gr + gr_halfGap, g_gr_step), p5.ws, round_to_multiple(p5.ws + ws_halfGap, g_ws_step), round_to_multiple(p5.pb - pb_halfGap, g_pb_step), p5.pb))
+		#print("FUL")
+	# si le coin avant/bas/droite est isolé
+	if(sol2 != sol1 and sol2 != sol6 and sol2 != sol4):
+		# Construction d'un cube en bas à droite devant
+		#     p7--------p8
+		#    /|         /|
+		#   / |        / |
+		#  /  |       /  | pb
+		# p5--------p6   |  x
+		# |   |   +--|-+ |  |  x ws
+		# |   p3-/   |/|p4  | /
+		# |  /  +----+ |/   |/
+		# | /   |    | +    +------x gr
+		# |/    |    |/
+		# p1----+---p2
+		cubes.append(Cube(round_to_multiple(p2.gr - gr_halfGap, g_gr_step), p2.gr, p2.ws, round_to_multiple(p2.ws + ws_halfGap, g_ws_step), p2.pb, round_to_multiple(p2.pb + pb_halfGap, g_pb_step)))
+		#print("FDR")
+	# si le coin avant/haut/droite est isolé
+	if(sol6 != sol5 and sol6 != sol2 and sol6 != sol8):
+		# Construction d'un cube en haut à droite devant
+		#     p7--------p8
+		#    /|         /|
+		#   / |   +----+ |
+		#  /  |  /    /| | pb
+		# p5----+---p6 | |  x
+		# |   | |    | + |  |  x ws
+		# |   p3|    |/-p4  | /
+		# |  /  +----+  /   |/
+		# | /        | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(round_to_multiple(p6.gr - gr_halfGap, g_gr_step), p6.gr, p6.ws, round_to_multiple(p6.ws + ws_halfGap, g_ws_step), round_to_multiple(p6.pb - pb_halfGap, g_pb_step), p6.pb))
+		#print("FUR")
+	# si le coin arrière/bas/gauche est isolé
+	if(sol3 != sol1 and sol3 != sol4 and sol3 != sol7):
+		# Construction d'un cube en bas à gauche derrière
+		#     p7--------p8
+		#    /|         /|
+		#   / |        / |
+		#  /  +----+  /  | pb
+		# p5--------p6   |  x
+		# | +----+ | |   |  |  x ws
+		# | |    |-+-|--p4  | /
+		# | |    |/  |  /   |/
+		# | +----+   | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p3.gr, round_to_multiple(p3.gr + gr_halfGap, g_gr_step), round_to_multiple(p3.ws - ws_halfGap, g_ws_step), p3.ws, p3.pb, round_to_multiple(p3.pb + pb_halfGap, g_pb_step)))
+		#print("BDL")
+	# si le coin arrière/haut/gauche est isolé
+	if(sol7 != sol3 and sol7 != sol8 and sol7 != sol5):
+		# Construction d'un cube en haut à gauche derrière
+		#     p7---+----p8
+		#    /    /|    /|
+		#   +----+ |   / |
+		#  /|    | +  /  | pb
+		# p5--------p6   |  x
+		# | +----+   |   |  |  x ws
+		# |   p3-----|--p4  | /
+		# |  /       |  /   |/
+		# | /        | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(p7.gr, round_to_multiple(p7.gr + gr_halfGap, g_gr_step), round_to_multiple(p7.ws - ws_halfGap, g_ws_step), p7.ws, round_to_multiple(p7.pb - pb_halfGap, g_pb_step), p7.pb))
+		#print("BUL")
+	# si le coin arrière/bas/droite est isolé
+	if(sol4 != sol3 and sol4 != sol2 and sol4 != sol8):
+		# Construction d'un cube en bas à droite derrière
+		#     p7--------p8
+		#    /|         /|
+		#   / |        / |
+		#  /  |     +-/--+ pb
+		# p5--------p6  /|  x
+		# |   |   +--|-+ |  |  x ws
+		# |   p3--|  | |p4  | /
+		# |  /    |  | |/   |/
+		# | /     +--|-+    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(round_to_multiple(p4.gr - gr_halfGap, g_gr_step), p4.gr, round_to_multiple(p4.ws - ws_halfGap, g_ws_step), p4.ws, p4.pb, round_to_multiple(p4.pb + pb_halfGap, g_pb_step)))
+		#print("BDR")
+	# si le coin arrière/haut/droite est isolé
+	if(sol8 != sol7 and sol8 != sol4 and sol8 != sol6):
+		# Construction d'un cube en haut à droite derrière
+		#     p7----+---p8
+		#    /|    /    /|
+		#   / |   +----+ |
+		#  /  |   |   /| + pb
+		# p5--------p6 |/|  x
+		# |   |   +--|-+ |  |  x ws
+		# |   p3-----|--p4  | /
+		# |  /       |  /   |/
+		# | /        | /    +------x gr
+		# |/         |/
+		# p1--------p2
+		cubes.append(Cube(round_to_multiple(p8.gr - gr_halfGap, g_gr_step), p8.gr, round_to_multiple(p8.ws - ws_halfGap, g_ws_step), p8.ws, round_to_multiple(p8.pb - pb_halfGap, g_pb_step), p8.pb))
+		#print("BUR")
+	return cubes
+
+# \brief Calcule en parallèle les compressions de tous les coins explorés par la recherche dichotomique. Les coins non encore calculés de tous les cubes en attente sont soumis ensemble à l'exécuteur (un point déjà soumis ne l'est pas une seconde fois) et chaque cube est découpé dès que ses 8 coins sont disponibles, ses sous-cubes étant aussitôt soumis à leur tour. Les cubes à explorer ne dépendant que des compressions de leurs coins, les points calculés sont exactement ceux du parcours en série
+#
+# @queue : les cubes initiaux
+# @trace : la trace à compresser sous la forme d'une chaine de caractère
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @executor : l'exécuteur des compressions
+# @return: les compressions de chacun des points explorés, indexées par point_key
+def evaluate_cubes_parallel(queue:list[Cube], trace:str, solution:str, executor:Executor) -> dict[str, CompressionSet]:
+	results:dict[str, CompressionSet] = {}
+	inFlight:dict[Future[CompressionSet], Point] = {}
+	submitted:set[str] = set()
+	# Cubes dont au moins un coin est en cours de calcul, avec les clés de leurs coins
+	waiting:list[tuple[Cube, list[str]]] = []
+	while len(queue) > 0 or len(waiting) > 0:
+		# Soumission des coins de tous les cubes en attente
+		while len(queue) > 0:
+			r:Cube = queue.pop(len(queue)-1)
+			keys:list[str] = []
+			for point in get_corners(r):
+				key:str = point_key(point)
+				keys.append(key)
+				if key not in submitted:
+					submitted.add(key)
+					# Les points déjà enregistrés ou stockés ne sont pas recalculés
+					available:Optional[CompressionSet] = lookup_result(key, trace, float(point.gr), float(point.ws), float(point.pb), solution)
+					if available != None:
+						results[key] = available
+					else:
+						inFlight[executor.submit(compress_task, (trace, float(point.gr), float(point.ws), float(point.pb), solution))] = point
+			waiting.append((r, keys))
+		# Attente d'au moins un résultat
+		if len(inFlight) > 0:
+			done, _ = wait(inFlight, return_when=FIRST_COMPLETED)
+			for future in done:
+				point = inFlight.pop(future)
+				results[point_key(point)] = future.result()
+				save_result(trace, float(point.gr), float(point.ws), float(point.pb), solution, future.result())
+			print("("+str(len(results))+"/"+str(len(submitted))+") MAP done", end='\r')
+		# Découpage des cubes dont tous les coins sont disponibles
+		stillWaiting:list[tuple[Cube, list[str]]] = []
+		for r, keys in waiting:
+			if all(key in results for key in keys):
+				queue += split_cube(r, [results[key] for key in keys])
+			else:
+				stillWaiting.append((r, keys))
+		waiting = stillWaiting
+	return results
+
 # \brief Compresse les logs contenus dans le fichier "targetFileName" en explorant les paramètres gr, ws et pb de manière dichotomique.
 #
 # @trace : la trace à compresser sous la forme d'une chaine de caractère
 # @solution : représente la solution de référence sous la forme d'une chaine de caractère.
-def search_gr_ws_by_rect(trace:str, solution:str) -> None:
+def search_gr_ws_by_rect(trace:str, solution:str, executor:Optional[Executor] = None) -> None:
 	global g_exploredMap, g_tab_parametersToBestResultPos
 	g_exploredMap = {}
 	g_tab_parametersToBestResultPos = np.zeros((g_nbPoints, g_nbPoints, g_nbPoints))
@@ -127,473 +967,168 @@ def search_gr_ws_by_rect(trace:str, solution:str) -> None:
 	queue.append(Cube(gr_middle, g_gr_bounds[1], g_ws_bounds[0], ws_middle, pb_middle, g_pb_bounds[1]))
 	queue.append(Cube(gr_middle, g_gr_bounds[1], ws_middle, g_ws_bounds[1], g_pb_bounds[0], pb_middle))
 	queue.append(Cube(gr_middle, g_gr_bounds[1], ws_middle, g_ws_bounds[1], pb_middle, g_pb_bounds[1]))
+	# En parallèle, les compressions de tous les coins sont d'abord calculées de manière spéculative, le parcours ci-dessous ne fait alors que les relire (les points explorés et leur ordre sont ceux du parcours en série)
+	precomputed:dict[str, CompressionSet] = {}
+	if executor != None:
+		precomputed = evaluate_cubes_parallel(list(queue), trace, solution, executor)
 	while(len(queue)>0):
 		r = queue.pop(len(queue)-1)
-		# Récupération des 8 points à analyser en coordonnées gr, ws et pb
-		#     p7--------p8
-		#    /|         /|
-		#   / |        / |
-		#  /  |       /  |  pb 
-		# p5--------p6   |   x
-		# |   |      |   |   |  x ws
-		# |   p3-----|--p4   | /
-		# |  /       |  /    |/
-		# | /        | /     +------x gr
-		# |/         |/
-		# p1--------p2
-		p1 = Point(r.gr_from, r.ws_from, r.pb_from)
-		p2 = Point(r.gr_to, r.ws_from, r.pb_from)
-		p3 = Point(r.gr_from, r.ws_to, r.pb_from)
-		p4 = Point(r.gr_to, r.ws_to, r.pb_from)
-		p5 = Point(r.gr_from, r.ws_from, r.pb_to)
-		p6 = Point(r.gr_to, r.ws_from, r.pb_to)
-		p7 = Point(r.gr_from, r.ws_to, r.pb_to)
-		p8 = Point(r.gr_to, r.ws_to, r.pb_to)
 		# calcul des 8 compressions (ou récupération dans la map si déjà calculé)
-		sol1 = get_from_map(p1, trace, solution)
-		sol2 = get_from_map(p2, trace, solution)
-		sol3 = get_from_map(p3, trace, solution)
-		sol4 = get_from_map(p4, trace, solution)
-		sol5 = get_from_map(p5, trace, solution)
-		sol6 = get_from_map(p6, trace, solution)
-		sol7 = get_from_map(p7, trace, solution)
-		sol8 = get_from_map(p8, trace, solution)
-		# calcul des positions intermédiaires
-		gr_halfGap = round_to_multiple(abs(p2.gr-p1.gr)/2, g_gr_step)
-		ws_halfGap = round_to_multiple(abs(p3.ws-p1.ws)/2, g_ws_step)
-		pb_halfGap = round_to_multiple(abs(p5.pb-p1.pb)/2, g_pb_step)
-		# si toutes les solution sont égales, il suffit de passer au cube suivant dans la queue
-		if (sol1 == sol2 and sol1 == sol3 and sol1 == sol4 and sol1 == sol5 and sol1 == sol6 and sol1 == sol7 and sol1 == sol8):
-			continue
-		#print (str(p1), str(p2), str(p3), str(p4), str(p5), str(p6), str(p7), str(p8))
-		# si la face devant est homogène mais différente d'un point en arrière
-		if (sol1 == sol2 and sol1 == sol5 and sol1 == sol6 and (sol1 != sol3 or sol2 != sol4 or sol5 != sol7 or sol6 != sol8)):
-			# Construction d'un cube pour l'avant
-			#     p7--------p8
-			#    /|         /|
-			#   +----------+ |
-			#  /          /| | pb
-			# p5--------p6 | |  x
-			# |          | | |  |  x ws
-			# |          | |p4  | /
-			# |          | |/   |/
-			# |          | +    +------x gr
-			# |          |/
-			# p1--------p2
-			queue.append(Cube(p1.gr, p2.gr, p1.ws, round_to_multiple(p1.ws + ws_halfGap, g_ws_step), p1.pb, p5.pb))
-			#print("F")
-		# si la face arrière est homogène mais différente d'un point en avant
-		if (sol3 == sol4 and sol3 == sol7 and sol3 == sol8 and (sol1 != sol3 or sol2 != sol4 or sol5 != sol7 or sol6 != sol8)):
-			# Construction d'un cube pour l'arrière
-			#     p7--------p8
-			#    /          /|
-			#   +----------+ |
-			#  /|         /| | pb
-			# p5--------p6 | |  x
-			# | |        | | |  |  x ws
-			# | |        | |p4  | /
-			# | |        | |/   |/
-			# | +--------|-+    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p3.gr, p4.gr, round_to_multiple(p3.ws - ws_halfGap, g_ws_step), p3.ws, p3.pb, p7.pb))
-			#print("B")
-		# si la face de dessous est homogène mais différente d'un point en dessus
-		if (sol1 == sol2 and sol1 == sol3 and sol1 == sol4 and (sol1 != sol5 or sol2 != sol6 or sol3 != sol7 or sol4 != sol8)):
-			# Construction d'un cube pour le dessous
-			#     p7--------p8
-			#    /|         /|
-			#   / |        / |
-			#  /  +-------/--+ pb
-			# p5--------p6  /|  x
-			# | /        | / |  |  x ws
-			# |/         |/ p4  | /
-			# +----------+  /   |/
-			# |          | /    +------x gr
-			# |          |/
-			# p1--------p2
-			queue.append(Cube(p1.gr, p2.gr, p1.ws, p3.ws, p1.pb, round_to_multiple(p1.pb + pb_halfGap, g_pb_step)))
-			#print("D")
-		# si la face de dessus est homogène mais différente d'un point en dessous
-		if (sol5 == sol6 and sol5 == sol7 and sol5 == sol8 and (sol1 != sol5 or sol2 != sol6 or sol3 != sol7 or sol4 != sol8)):
-			# Construction d'un cube pour le dessus
-			#     p7--------p8
-			#    /          /|
-			#   /          / |
-			#  /          /  + pb
-			# p5--------p6  /|  x
-			# |          | / |  |  x ws
-			# |          |/-p4  | /
-			# +----------+  /   |/
-			# | /        | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p5.gr, p6.gr, p5.ws, p7.ws, round_to_multiple(p5.pb - pb_halfGap, g_pb_step), p5.pb))
-			#print("U")
-		# si la face de gauche est homogène mais différente d'un point à droite
-		if (sol1 == sol3 and sol1 == sol5 and sol1 == sol7 and (sol1 != sol2 or sol3 != sol4 or sol5 != sol6 or sol7 != sol8)):
-			# Construction d'un cube pour la gauche
-			#     p7---+----p8
-			#    /    /|    /|
-			#   /    / |   / |
-			#  /    /  |  /  | pb
-			# p5---+----p6   |  x
-			# |    |   | |   |  |  x ws
-			# |    |   +-|--p4  | /
-			# |    |  /  |  /   |/
-			# |    | /   | /    +------x gr
-			# |    |/    |/
-			# p1---+----p2
-			queue.append(Cube(p1.gr, round_to_multiple(p1.gr + gr_halfGap, g_gr_step), p1.ws, p3.ws, p1.pb, p5.pb))
-			#print("L")
-		# si la face de droite est homogène mais différente d'un point à gauche
-		if (sol2 == sol4 and sol2 == sol6 and sol2 == sol8 and (sol1 != sol2 or sol3 != sol4 or sol5 != sol6 or sol7 != sol8)):
-			# Construction d'un cube pour la droite
-			#     p7----+---p8
-			#    /|    /    /|
-			#   / |   /    / |
-			#  /  |  /    /  | pb
-			# p5----+---p6   |  x
-			# |   | |    |   |  |  x ws
-			# |   p3|    |  p4  | /
-			# |  /  |    |  /   |/
-			# | /   |    | /    +------x gr
-			# |/    |    |/
-			# p1----+---p2
-			queue.append(Cube(round_to_multiple(p2.gr - gr_halfGap, g_gr_step), p2.gr, p2.ws, p4.ws, p2.pb, p6.pb))
-			#print("R")
-		# si l'arête avant/bas est homogène mais différente d'un point en dessus et en arrière
-		if (sol1 == sol2 and (sol1 != sol3 or sol2 != sol4) and (sol1 != sol5 or sol2 != sol6)):
-			# Construction d'un cube en bas devant
-			#     p7--------p8
-			#    /|         /|
-			#   / |        / |
-			#  /  |       /  | pb
-			# p5--------p6   |  x
-			# | +--------|-+ |  |  x ws
-			# |/         |/|p4  | /
-			# +----------+ |/   |/
-			# |          | +    +------x gr
-			# |          |/
-			# p1--------p2
-			queue.append(Cube(p1.gr, p2.gr, p1.ws, round_to_multiple(p1.ws + ws_halfGap, g_ws_step), p1.pb, round_to_multiple(p1.pb + pb_halfGap, g_pb_step)))
-			#print("FD")
-		# si l'arête arrière/bas est homogène mais différente d'un point en dessus et en avant
-		if (sol3 == sol4 and (sol3 != sol7 or sol4 != sol8) and (sol3 != sol1 or sol4 != sol2)):
-			# Construction d'un cube en bas devant
-			#     p7--------p8
-			#    /|         /|
-			#   / |        / |
-			#  /  +-------/--+ pb
-			# p5--------p6  /|  x
-			# | +--------|-+ |  |  x ws
-			# | |        | |p4  | /
-			# | |        | |/   |/
-			# | +--------|-+    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p3.gr, p4.gr, round_to_multiple(p3.ws - ws_halfGap, g_ws_step), p3.ws, p3.pb, round_to_multiple(p3.pb + pb_halfGap, g_pb_step)))
-			#print("BD")
-		# si l'arête arrière/haut est homogène mais différente d'un point en dessous et en avant
-		if (sol7 == sol8 and (sol7 != sol5 or sol8 != sol6) and (sol7 != sol3 or sol8 != sol4)):
-			# Construction d'un cube en haut arrière
-			#     p7--------p8
-			#    /          /|
-			#   +----------+ |
-			#  /|         /| + pb
-			# p5--------p6 |/|  x
-			# | +--------|-+ |  |  x ws
-			# |   p3-----|--p4  | /
-			# |  /       |  /   |/
-			# | /        | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p7.gr, p8.gr, round_to_multiple(p7.ws - ws_halfGap, g_ws_step), p7.ws, round_to_multiple(p7.pb - pb_halfGap, g_pb_step), p7.pb))
-			#print("BU")
-		# si l'arête avant/haut est homogène mais différente d'un point en dessous et en arrière
-		if (sol5 == sol6 and (sol5 != sol1 or sol6 != sol2) and (sol5 != sol7 or sol6 != sol8)):
-			# Construction d'un cube en haut devant
-			#     p7--------p8
-			#    /|         /|
-			#   +----------+ |
-			#  /          /| | pb
-			# p5--------p6 | |  x
-			# |          | + |  |  x ws
-			# |          |/-p4  | /
-			# +----------+  /   |/
-			# | /        | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p5.gr, p6.gr, p5.ws, round_to_multiple(p5.ws + ws_halfGap, g_ws_step), round_to_multiple(p5.pb - pb_halfGap, g_pb_step), p5.pb))
-			#print("FU")
-		# si l'arête gauche/bas est homogène mais différente d'un point en dessus et à droite
-		if (sol1 == sol3 and (sol1 != sol2 or sol3 != sol4) and (sol1 != sol5 or sol3 != sol7)):
-			# Construction d'un cube en bas à gauche
-			#     p7--------p8
-			#    /|         /|
-			#   / |        / |
-			#  /  +----+  /  | pb
-			# p5--------p6   |  x
-			# | /    / | |   |  |  x ws
-			# |/    /  +-|--p4  | /
-			# +----+  /  |  /   |/
-			# |    | /   | /    +------x gr
-			# |    |/    |/
-			# p1---+----p2
-			queue.append(Cube(p1.gr, round_to_multiple(p1.gr + gr_halfGap, g_gr_step), p1.ws, p3.ws, p1.pb, round_to_multiple(p1.pb + pb_halfGap, g_pb_step)))
-			#print("LD")
-		# si l'arête droite/bas est homogène mais différente d'un point en dessus et à gauche
-		if (sol2 == sol4 and (sol1 != sol2 or sol3 != sol4) and (sol2 != sol6 or sol4 != sol8)):
-			# Construction d'un cube en bas à droite
-			#     p7--------p8
-			#    /|         /|
-			#   / |        / |
-			#  /  |     +-/--+ pb
-			# p5--------p6  /|  x
-			# |   |   /  | / |  |  x ws
-			# |   p3-/   |/ p4  | /
-			# |  /  +----+  /   |/
-			# | /   |    | /    +------x gr
-			# |/    |    |/
-			# p1----+---p2
-			queue.append(Cube(round_to_multiple(p2.gr - gr_halfGap, g_gr_step), p2.gr, p2.ws, p4.ws, p2.pb, round_to_multiple(p2.pb + pb_halfGap, g_pb_step)))
-			#print("LR")
-		# si l'arête droite/haut est homogène mais différente d'un point en dessous et à gauche
-		if (sol6 == sol8 and (sol6 != sol5 or sol8 != sol7) and (sol2 != sol6 or sol4 != sol8)):
-			# Construction d'un cube en haut à droite
-			#     p7----+---p8
-			#    /|    /    /|
-			#   / |   /    / |
-			#  /  |  /    /  + pb
-			# p5----+---p6  /|  x
-			# |   | |    | / |  |  x ws
-			# |   p3|    |/-p4  | /
-			# |  /  +----+  /   |/
-			# | /        | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(round_to_multiple(p6.gr - gr_halfGap, g_gr_step), p6.gr, p6.ws, p8.ws, round_to_multiple(p6.pb - pb_halfGap, g_pb_step), p6.pb))
-			#print("UR")
-		# si l'arête gauche/haut est homogène mais différente d'un point en dessous et à droite
-		if (sol5 == sol7 and (sol5 != sol6 or sol7 != sol8) and (sol1 != sol5 or sol3 != sol7)):
-			# Construction d'un cube en haut à gauche
-			#     p7---+----p8
-			#    /    /|    /|
-			#   /    / |   / |
-			#  /    /  +  /  | pb
-			# p5---+----p6   |  x
-			# |    | /   |   |  |  x ws
-			# |    |/----|--p4  | /
-			# +----+     |  /   |/
-			# | /        | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p5.gr, round_to_multiple(p5.gr + gr_halfGap, g_gr_step), p5.ws, p7.ws, round_to_multiple(p5.pb - pb_halfGap, g_pb_step), p5.pb))
-			#print("UL")
-		# si l'arête avant/gauche est homogène mais différente d'un point en arrière et à droite
-		if (sol1 == sol5 and (sol1 != sol2 or sol5 != sol6) and (sol1 != sol3 or sol5 != sol7)):
-			# Construction d'un cube devant à gauche
-			#     p7--------p8
-			#    /|         /|
-			#   +----+     / |
-			#  /    /|    /  | pb
-			# p5---+----p6   |  x
-			# |    | |   |   |  |  x ws
-			# |    | |---|--p4  | /
-			# |    | |   |  /   |/
-			# |    | +   | /    +------x gr
-			# |    |/    |/
-			# p1---+----p2
-			queue.append(Cube(p1.gr, round_to_multiple(p1.gr + gr_halfGap, g_gr_step), p1.ws, round_to_multiple(p1.ws + ws_halfGap, g_ws_step), p1.pb, p5.pb))
-			#print("FL")
-		# si l'arête avant/droite est homogène mais différente d'un point en arrière et à gauche
-		if (sol2 == sol6 and (sol1 != sol2 or sol5 != sol6) and (sol2 != sol4 or sol6 != sol8)):
-			# Construction d'un cube devant à droite
-			#     p7--------p8
-			#    /|         /|
-			#   / |  +-----+ |
-			#  /  | /     /| | pb
-			# p5---+----p6 | |  x
-			# |   ||     | | |  |  x ws
-			# |   p|     | |p4  | /
-			# |  / |     | |/   |/
-			# | /  |     | +    +------x gr
-			# |/   |     |/
-			# p1---+----p2
-			queue.append(Cube(round_to_multiple(p2.gr - gr_halfGap, g_gr_step), p2.gr, p2.ws, round_to_multiple(p2.ws + ws_halfGap, g_ws_step), p2.pb, p6.pb))
-			#print("FR")
-		# si l'arête arrière/droite est homogène mais différente d'un point en avant et à gauche
-		if (sol4 == sol8 and (sol3 != sol4 or sol7 != sol8) and (sol2 != sol4 or sol6 != sol8)):
-			# Construction d'un cube en arrière à droite
-			#     p7---+----p8
-			#    /|   /     /|
-			#   / |  +-----+ |
-			#  /  |  |    /| | pb
-			# p5--------p6 | |  x
-			# |   |  |   | | |  |  x ws
-			# |   p3-|   | |p4  | /
-			# |  /   |   | |/   |/
-			# | /    +---|-+    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(round_to_multiple(p4.gr - gr_halfGap, g_gr_step), p4.gr, round_to_multiple(p4.ws - ws_halfGap, g_ws_step), p4.ws, p4.pb, p8.pb))
-			#print("BR")
-		# si l'arête arrière/gauche est homogène mais différente d'un point en avant et à droite
-		if (sol3 == sol7 and (sol3 != sol4 or sol7 != sol8) and (sol3 != sol1 or sol7 != sol5)):
-			# Construction d'un cube en arrière à gauche
-			#     p7---+----p8
-			#    /    /|    /|
-			#   +----+ |   / |
-			#  /|    | |  /  | pb
-			# p5--------p6   |  x
-			# | |    | | |   |  |  x ws
-			# | |    | +-|--p4  | /
-			# | |    |/  |  /   |/
-			# | +----+   | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p3.gr, round_to_multiple(p3.gr + gr_halfGap, g_gr_step), round_to_multiple(p3.ws - ws_halfGap, g_ws_step), p3.ws, p3.pb, p7.pb))
-			#print("BL")
-		# si le coin avant/bas/gauche est isolé
-		if(sol1 != sol2 and sol1 != sol3 and sol1 != sol5):
-			# Construction d'un cube en bas à gauche devant
-			#     p7--------p8
-			#    /|         /|
-			#   / |        / |
-			#  /  |       /  | pb
-			# p5--------p6   |  x
-			# | +----+   |   |  |  x ws
-			# |/    /|---|--p4  | /
-			# +----+ |   |  /   |/
-			# |    | +   | /    +------x gr
-			# |    |/    |/
-			# p1---+----p2
-			queue.append(Cube(p1.gr, round_to_multiple(p1.gr + gr_halfGap, g_gr_step), p1.ws, round_to_multiple(p1.ws + ws_halfGap, g_ws_step), p1.pb, round_to_multiple(p1.pb + pb_halfGap, g_pb_step)))
-			#print("FDL")
-		# si le coin avant/haut/gauche est isolé
-		if(sol5 != sol6 and sol5 != sol7 and sol5 != sol1):
-			# Construction d'un cube en haut à gauche devant
-			#     p7--------p8
-			#    /|         /|
-			#   +----+     / |
-			#  /    /|    /  | pb
-			# p5---+----p6   |  x
-			# |    | +   |   |  |  x ws
-			# |    |/----|--p4  | /
-			# +----+     |  /   |/
-			# | /        | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p5.gr, round_to_multiple(p5.gr + gr_halfGap, g_gr_step), p5.ws, round_to_multiple(p5.ws + ws_halfGap, g_ws_step), round_to_multiple(p5.pb - pb_halfGap, g_pb_step), p5.pb))
-			#print("FUL")
-		# si le coin avant/bas/droite est isolé
-		if(sol2 != sol1 and sol2 != sol6 and sol2 != sol4):
-			# Construction d'un cube en bas à droite devant
-			#     p7--------p8
-			#    /|         /|
-			#   / |        / |
-			#  /  |       /  | pb
-			# p5--------p6   |  x
-			# |   |   +--|-+ |  |  x ws
-			# |   p3-/   |/|p4  | /
-			# |  /  +----+ |/   |/
-			# | /   |    | +    +------x gr
-			# |/    |    |/
-			# p1----+---p2
-			queue.append(Cube(round_to_multiple(p2.gr - gr_halfGap, g_gr_step), p2.gr, p2.ws, round_to_multiple(p2.ws + ws_halfGap, g_ws_step), p2.pb, round_to_multiple(p2.pb + pb_halfGap, g_pb_step)))
-			#print("FDR")
-		# si le coin avant/haut/droite est isolé
-		if(sol6 != sol5 and sol6 != sol2 and sol6 != sol8):
-			# Construction d'un cube en haut à droite devant
-			#     p7--------p8
-			#    /|         /|
-			#   / |   +----+ |
-			#  /  |  /    /| | pb
-			# p5----+---p6 | |  x
-			# |   | |    | + |  |  x ws
-			# |   p3|    |/-p4  | /
-			# |  /  +----+  /   |/
-			# | /        | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(round_to_multiple(p6.gr - gr_halfGap, g_gr_step), p6.gr, p6.ws, round_to_multiple(p6.ws + ws_halfGap, g_ws_step), round_to_multiple(p6.pb - pb_halfGap, g_pb_step), p6.pb))
-			#print("FUR")
-		# si le coin arrière/bas/gauche est isolé
-		if(sol3 != sol1 and sol3 != sol4 and sol3 != sol7):
-			# Construction d'un cube en bas à gauche derrière
-			#     p7--------p8
-			#    /|         /|
-			#   / |        / |
-			#  /  +----+  /  | pb
-			# p5--------p6   |  x
-			# | +----+ | |   |  |  x ws
-			# | |    |-+-|--p4  | /
-			# | |    |/  |  /   |/
-			# | +----+   | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p3.gr, round_to_multiple(p3.gr + gr_halfGap, g_gr_step), round_to_multiple(p3.ws - ws_halfGap, g_ws_step), p3.ws, p3.pb, round_to_multiple(p3.pb + pb_halfGap, g_pb_step)))
-			#print("BDL")
-		# si le coin arrière/haut/gauche est isolé
-		if(sol7 != sol3 and sol7 != sol8 and sol7 != sol5):
-			# Construction d'un cube en haut à gauche derrière
-			#     p7---+----p8
-			#    /    /|    /|
-			#   +----+ |   / |
-			#  /|    | +  /  | pb
-			# p5--------p6   |  x
-			# | +----+   |   |  |  x ws
-			# |   p3-----|--p4  | /
-			# |  /       |  /   |/
-			# | /        | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(p7.gr, round_to_multiple(p7.gr + gr_halfGap, g_gr_step), round_to_multiple(p7.ws - ws_halfGap, g_ws_step), p7.ws, round_to_multiple(p7.pb - pb_halfGap, g_pb_step), p7.pb))
-			#print("BUL")
-		# si le coin arrière/bas/droite est isolé
-		if(sol4 != sol3 and sol4 != sol2 and sol4 != sol8):
-			# Construction d'un cube en bas à droite derrière
-			#     p7--------p8
-			#    /|         /|
-			#   / |        / |
-			#  /  |     +-/--+ pb
-			# p5--------p6  /|  x
-			# |   |   +--|-+ |  |  x ws
-			# |   p3--|  | |p4  | /
-			# |  /    |  | |/   |/
-			# | /     +--|-+    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(round_to_multiple(p4.gr - gr_halfGap, g_gr_step), p4.gr, round_to_multiple(p4.ws - ws_halfGap, g_ws_step), p4.ws, p4.pb, round_to_multiple(p4.pb + pb_halfGap, g_pb_step)))
-			#print("BDR")
-		# si le coin arrière/haut/droite est isolé
-		if(sol8 != sol7 and sol8 != sol4 and sol8 != sol6):
-			# Construction d'un cube en haut à droite derrière
-			#     p7----+---p8
-			#    /|    /    /|
-			#   / |   +----+ |
-			#  /  |   |   /| + pb
-			# p5--------p6 |/|  x
-			# |   |   +--|-+ |  |  x ws
-			# |   p3-----|--p4  | /
-			# |  /       |  /   |/
-			# | /        | /    +------x gr
-			# |/         |/
-			# p1--------p2
-			queue.append(Cube(round_to_multiple(p8.gr - gr_halfGap, g_gr_step), p8.gr, round_to_multiple(p8.ws - ws_halfGap, g_ws_step), p8.ws, round_to_multiple(p8.pb - pb_halfGap, g_pb_step), p8.pb))
-			#print("BUR")
+		sols:list[CompressionSet] = [get_from_map(p, trace, solution, precomputed) for p in get_corners(r)]
+		queue += split_cube(r, sols)
 
+# \brief Compresse une trace en raffinant les frontières de l'espace des paramètres jusqu'à g_resolution (voir ParameterOctree). L'exploration se fait par niveaux de l'octree : les coins inconnus de toutes les cellules d'un niveau sont calculés ensemble (en parallèle si un exécuteur est fourni, les points et leur ordre restant ceux de l'exploration en série), puis les cellules contenant une frontière sont découpées pour former le niveau suivant
+#
+# @trace : la trace à compresser sous la forme d'une chaine de caractère
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @executor : si fourni, exécuteur utilisé pour compresser les points d'un niveau en parallèle
+def search_octree(trace:str, solution:str, executor:Optional[Executor] = None) -> None:
+	global g_exploredMap, g_tab_parametersToBestResultPos
+	g_exploredMap = {}
+	octree:ParameterOctree = ParameterOctree((g_gr_bounds[0], g_ws_bounds[0], g_pb_bounds[0]), (g_gr_bounds[1], g_ws_bounds[1], g_pb_bounds[1]), g_resolution) # type: ignore
+	cells:list[Cell] = octree.children[octree.root]
+	depth:int = 0
+	while len(cells) > 0:
+		# Coins inconnus des cellules du niveau, dans l'ordre des cellules
+		pending:dict[tuple[int, int, int], None] = {}
+		for cell in cells:
+			for corner in ParameterOctree.corners(cell):
+				if corner not in octree.codes:
+					pending[corner] = None
+		points:list[Point] = [octree.to_point(corner) for corner in pending]
+		compressions:list[CompressionSet] = evaluate_points(points, trace, solution, executor)
+		for corner, point, compression in zip(pending, points, compressions):
+			octree.codes[corner] = compression.getCode(solution)
+			key:str = point_key(point)
+			if key not in g_exploredMap:
+				g_exploredMap[key] = compression
+				log_result(key, point.gr, point.ws, point.pb, octree.codes[corner], compression)
+		depth += 1
+		print("Niveau "+str(depth)+" : "+str(len(cells))+" cellules, "+str(len(g_exploredMap))+" points explorés      ", end='\r')
+		cells = [child for cell in cells for child in octree.refine(cell)]
+	g_tab_parametersToBestResultPos = octree.export(g_exportSteps)
+
+# \brief Compresse une liste de points, en réutilisant les résultats déjà disponibles
+#
+# @points : les points à compresser
+# @trace : la trace à compresser sous la forme d'une chaine de caractère
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @executor : si fourni, les points non disponibles sont compressés en parallèle par cet exécuteur
+# @return: les compressions de chacun des points, dans l'ordre des points
+def evaluate_points(points:list[Point], trace:str, solution:str, executor:Optional[Executor] = None) -> list[CompressionSet]:
+	results:dict[str, CompressionSet] = {}
+	futures:dict[Future[CompressionSet], Point] = {}
+	for point in points:
+		key:str = point_key(point)
+		available:Optional[CompressionSet] = g_exploredMap.get(key)
+		if available == None:
+			available = lookup_result(key, trace, float(point.gr), float(point.ws), float(point.pb), solution)
+		if available != None:
+			results[key] = available
+		elif executor != None:
+			futures[executor.submit(compress_task, (trace, float(point.gr), float(point.ws), float(point.pb), solution))] = point
+		else:
+			print("("+str(len(g_exploredMap)+len(results))+") Call MAP with parameters\tgr: "+str(point.gr)+"   \tws: "+str(point.ws)+"   \tpb: "+str(point.pb), end='\r')
+			results[key] = compress_point(trace, float(point.gr), float(point.ws), float(point.pb), solution)
+	for future in as_completed(futures):
+		point = futures[future]
+		results[point_key(point)] = future.result()
+		save_result(trace, float(point.gr), float(point.ws), float(point.pb), solution, future.result())
+	return [results[point_key(point)] for point in points]
+
+# \brief Ajuste un classifieur des plus proches voisins aux codes des points compressés : chaque point de la grille reçoit le code majoritaire parmi ses g_surrogateNeighbours plus proches voisins compressés, chaque voisin votant avec un poids inverse à sa distance
+#
+# @positions : les indices (i, j, k) de tous les points de la grille, la distance entre deux points est mesurée en nombre de pas de la grille
+# @evaluated : les indices dans positions des points compressés
+# @codes : les codes des points compressés
+# @return: pour chaque point de la grille, le code prédit, l'incertitude de la prédiction (part des votes en désaccord avec le code prédit) et la distance au point compressé le plus proche
+def fit_surrogate(positions:np.ndarray, evaluated:np.ndarray, codes:np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+	distances:np.ndarray = np.sqrt(((positions[:, None, :]-positions[evaluated][None, :, :])**2).sum(axis=2))
+	k:int = min(g_surrogateNeighbours, len(evaluated))
+	neighbours:np.ndarray = np.argsort(distances, axis=1, kind='stable')[:, :k]
+	neighbourDistances:np.ndarray = np.take_along_axis(distances, neighbours, axis=1)
+	weights:np.ndarray = 1/np.maximum(neighbourDistances, 1e-9)
+	classes:np.ndarray = np.array([-1, 1, 2])
+	votes:np.ndarray = np.stack([(weights*(codes[neighbours] == c)).sum(axis=1) for c in classes], axis=1)
+	predicted:np.ndarray = classes[np.argmax(votes, axis=1)]
+	uncertainty:np.ndarray = 1-votes.max(axis=1)/votes.sum(axis=1)
+	# Les points compressés sont connus avec certitude
+	predicted[evaluated] = codes
+	uncertainty[evaluated] = 0
+	return predicted, uncertainty, neighbourDistances[:, 0]
+
+# \brief Compresse une trace en ne compressant que les points de la grille où un modèle de substitution est le plus incertain. Après une première série de points (les coins, milieux des arêtes et des faces et le centre de l'espace), un classifieur des plus proches voisins (voir fit_surrogate) est ajusté à chaque tour aux codes des points compressés, puis les g_surrogateBatch points les plus incertains (en favorisant légèrement les points éloignés de ceux déjà compressés et en écartant les points voisins les uns des autres) sont compressés. La recherche s'arrête quand la région de succès estimée (points dont le code prédit vaut 1) n'a pas changé pendant g_surrogateStableRounds tours, une région vide ne pouvant être stable qu'une fois g_surrogateMinCoverage de la grille compressée. Les points non compressés reçoivent dans g_tab_parametersToBestResultPos le code prédit
+#
+# @trace : la trace à compresser sous la forme d'une chaine de caractère
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @executor : si fourni, exécuteur utilisé pour compresser les points d'un tour en parallèle
+def search_surrogate(trace:str, solution:str, executor:Optional[Executor] = None) -> None:
+	global g_exploredMap, g_tab_parametersToBestResultPos
+	g_exploredMap = {}
+	g_tab_parametersToBestResultPos = np.zeros((g_nbPoints, g_nbPoints, g_nbPoints))
+	points:list[tuple[int, int, int, Decimal, Decimal, Decimal, str]] = grid_points()
+	positions:np.ndarray = np.array([point[:3] for point in points], dtype=np.float64)
+	# Indices dans points des points compressés et leurs codes
+	evaluated:list[int] = []
+	codes:list[int] = []
+	middle:int = (g_nbPoints-1)//2
+	batch:list[int] = [n for n, point in enumerate(points) if all(index in (0, middle, g_nbPoints-1) for index in point[:3])]
+	region:Optional[np.ndarray] = None
+	stableRounds:int = 0
+	predicted:np.ndarray = np.zeros(len(points))
+	while len(batch) > 0:
+		compressions:list[CompressionSet] = evaluate_points([Point(points[n][3], points[n][4], points[n][5]) for n in batch], trace, solution, executor)
+		for n, compression in zip(batch, compressions):
+			i, j, k, gr, ws, pb, key = points[n]
+			code:int = compression.getCode(solution)
+			g_tab_parametersToBestResultPos[i][j][k] = code
+			g_exploredMap[key] = compression
+			log_result(key, gr, ws, pb, code, compression)
+			evaluated.append(n)
+			codes.append(code)
+		uncertainty:np.ndarray
+		nearest:np.ndarray
+		predicted, uncertainty, nearest = fit_surrogate(positions, np.array(evaluated), np.array(codes))
+		# Stabilité de la région de succès estimée, une région vide n'est prise en compte qu'une fois g_surrogateMinCoverage de la grille compressée
+		settled:bool = bool((predicted == 1).any()) or len(evaluated) >= g_surrogateMinCoverage*len(points)
+		if settled and region is not None and np.array_equal(region, predicted == 1):
+			stableRounds += 1
+		else:
+			stableRounds = 0
+		region = predicted == 1
+		print("("+str(len(evaluated))+") points compressés, région de succès estimée : "+str(int(region.sum()))+" points, stable depuis "+str(stableRounds)+" tours      ", end='\r')
+		if stableRounds >= g_surrogateStableRounds:
+			break
+		# Choix des points suivants, du plus incertain au moins incertain
+		priority:np.ndarray = uncertainty + g_surrogateExploration*nearest/max(float(nearest.max()), 1e-9)
+		priority[evaluated] = -1
+		batch = []
+		for n in np.argsort(-priority, kind='stable'):
+			if priority[n] < 0 or len(batch) >= g_surrogateBatch:
+				break
+			if all(np.sum((positions[n]-positions[m])**2) >= 4 for m in batch):
+				batch.append(int(n))
+	# Les points non compressés reçoivent le code prédit
+	for n, point in enumerate(points):
+		if g_tab_parametersToBestResultPos[point[0]][point[1]][point[2]] == 0:
+			g_tab_parametersToBestResultPos[point[0]][point[1]][point[2]] = predicted[n]
 
 # \brief Compresse une trace en explorant les paramètres gr, ws et pb.
 #
 # @trace : la trace à compresser sous la forme d'une chaine de caractère
 # @solution : représente la solution de référence sous la forme d'une chaine de caractère.
-def search_exhaustive(trace:str, solution:str) -> None:
+# @executor : si fourni, les points de la grille sont compressés en parallèle par cet exécuteur (les résultats sont identiques à ceux de l'exploration en série)
+# @precomputed : compressions déjà calculées (par exemple par l'ordonnanceur du dataset) à utiliser au lieu d'exécuter MAP, indexées par clé de point
+def search_exhaustive(trace:str, solution:str, executor:Optional[Executor] = None, precomputed:Optional[dict[str, CompressionSet]] = None) -> None:
 	global  g_exploredMap, g_tab_parametersToBestResultPos
 	
 	g_exploredMap = {}
 	g_tab_parametersToBestResultPos = np.zeros((g_nbPoints, g_nbPoints, g_nbPoints))
 
+	if executor != None:
+		search_exhaustive_parallel(trace, solution, executor)
+		return
+
 	# boucle pour calculer les gr
 	for i in range(g_nbPoints):
 		gr = i*g_gr_step
@@ -603,83 +1138,281 @@ def search_exhaustive(trace:str, solution:str) -> None:
 			for k in range(g_nbPoints):
 				pb = k*g_pb_step
 				print("("+str(len(g_exploredMap))+") Call MAP with parameters\tgr: "+str(gr)+"   \tws: "+str(ws)+"   \tpb: "+str(pb), end='\r')
-				# Fait tourner l'algo de compression sur la trace
-				# Transformation du string en une liste d'évènement
-				eventList:list[Event] = []
-				for char in trace:
-					eventList.append(Call(char))
-				compressions:CompressionSet = MAP(eventList, float(gr), float(ws), float(pb))
+				key:str = str(gr)+"gr_"+str(ws)+"ws_"+str(pb)+"pb"
+				# Fait tourner l'algo de compression sur la trace (sauf si le résultat est déjà calculé, a déjà été enregistré avant une reprise ou est déjà stocké)
+				compressions:CompressionSet
+				if precomputed != None and key in precomputed:
+					compressions = precomputed[key]
+				elif g_sweepLog != None and key in g_sweepLog.records:
+					compressions = g_sweepLog.records[key]
+				else:
+					compressions = compress_point(trace, float(gr), float(ws), float(pb), solution)
 
 				g_tab_parametersToBestResultPos[i][j][k] = compressions.getCode(solution)
 				
-				g_exploredMap[str(gr)+"gr_"+str(ws)+"ws_"+str(pb)+"pb"] = compressions
-	
-def custom_serializer(obj:Any):
-	if hasattr(obj, "to_dict"):
-		return obj.to_dict()
-	raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+				g_exploredMap[key] = compressions
+				log_result(key, gr, ws, pb, int(g_tab_parametersToBestResultPos[i][j][k]), compressions)
+
+# \brief Compresse en parallèle tous les points de la grille. Les points sont soumis à l'exécuteur dans l'ordre de la grille et la matrice est remplie au fur et à mesure des résultats. g_exploredMap (et l'enregistrement au fil de l'eau) est rempli dans l'ordre de la grille, dès que tous les points précédents sont disponibles, pour que les fichiers produits soient identiques à ceux de l'exploration en série
+#
+# @trace : la trace à compresser sous la forme d'une chaine de caractère
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @executor : l'exécuteur des compressions
+def search_exhaustive_parallel(trace:str, solution:str, executor:Executor) -> None:
+	global  g_exploredMap, g_tab_parametersToBestResultPos
+
+	# Soumission de tous les points, dans l'ordre de la grille
+	points:list[tuple[int, int, int, Decimal, Decimal, Decimal, str]] = grid_points()
+	results:dict[str, CompressionSet] = {}
+	futures:dict[Future[CompressionSet], tuple[int, int, int, str]] = {}
+	for i, j, k, gr, ws, pb, key in points:
+		# Les points déjà enregistrés ou stockés ne sont pas recalculés
+		available:Optional[CompressionSet] = lookup_result(key, trace, float(gr), float(ws), float(pb), solution)
+		if available != None:
+			results[key] = available
+			g_tab_parametersToBestResultPos[i][j][k] = available.getCode(solution)
+		else:
+			futures[executor.submit(compress_task, (trace, float(gr), float(ws), float(pb), solution))] = (i, j, k, key)
+
+	# Ajout à g_exploredMap des points disponibles qui suivent le dernier point ajouté
+	def add_available_points() -> None:
+		while len(g_exploredMap) < len(points) and points[len(g_exploredMap)][6] in results:
+			i, j, k, gr, ws, pb, key = points[len(g_exploredMap)]
+			g_exploredMap[key] = results[key]
+			log_result(key, gr, ws, pb, int(g_tab_parametersToBestResultPos[i][j][k]), results[key])
+
+	add_available_points()
+	# Récupération des résultats au fur et à mesure de leur disponibilité
+	for future in as_completed(futures):
+		i, j, k, key = futures[future]
+		results[key] = future.result()
+		save_result(trace, float(i*g_gr_step), float(j*g_ws_step), float(k*g_pb_step), solution, results[key])
+		g_tab_parametersToBestResultPos[i][j][k] = results[key].getCode(solution)
+		add_available_points()
+		print("("+str(len(results))+"/"+str(len(points))+") MAP done with parameters\t"+key+"   ", end='\r')
+		
+# \brief Ouvre l'enregistrement au fil de l'eau des résultats d'une trace, en reprenant les points déjà enregistrés par le même algorithme avec le même budget de temps
+def open_sweep_log(path:str, solution:str) -> SweepLog:
+	return SweepLog(path, algorithm_id(solution)+";budget="+str(TIME_LIMIT))
+
+# \brief Explore les paramètres pour une trace en enregistrant les résultats au fil de l'eau dans un fichier JSON Lines (voir SweepLog)
+#
+# @trace : la trace à compresser sous la forme d'une chaine de caractère
+# @solution : représente la solution de référence sous la forme d'une chaine de caractère.
+# @path : le fichier JSON Lines des résultats, les points qu'il contient déjà ne sont pas recalculés
+# @mode : "exhaustive", "dichotomous" (algorithme dichotomique avec des rectangles pour réduire le nombre de test) ou "surrogate" (recherche guidée par un modèle de substitution)
+# @executor : si fourni, exécuteur utilisé pour compresser plusieurs points en parallèle
+# @precomputed : compressions déjà calculées à utiliser au lieu d'exécuter MAP (exploration exhaustive seulement), indexées par clé de point
+def sweep(trace:str, solution:str, path:str, mode:str, executor:Optional[Executor], precomputed:Optional[dict[str, CompressionSet]] = None) -> None:
+	global g_sweepLog
+	g_sweepLog = open_sweep_log(path, solution)
+	# Les comportements enregistrés ne concernent que la trace en cours d'analyse
+	g_behaviours.clear()
+	if len(g_sweepLog.records) > 0:
+		print("Reprise de l'exploration : "+str(len(g_sweepLog.records))+" points déjà enregistrés")
+	try:
+		if mode == "dichotomous" and g_resolution != None:
+			search_octree(trace, solution, executor)
+		elif mode == "dichotomous":
+			search_gr_ws_by_rect(trace, solution, executor)
+		elif mode == "surrogate":
+			search_surrogate(trace, solution, executor)
+		else:
+			search_exhaustive(trace, solution, executor, precomputed)
+	finally:
+		g_sweepLog.close()
+		g_sweepLog = None
+
+# \brief Convertit un fichier de résultats JSON Lines (voir SweepLog) au format JSON indenté utilisé par les notebooks (une entrée par point avec la liste de ses compressions)
+#
+# @jsonlPath : le fichier JSON Lines à convertir
+# @txtPath : le fichier JSON à produire
+def convert_to_legacy(jsonlPath:str, txtPath:str) -> None:
+	exploredMap:dict[str, list[dict[str, str]]] = {}
+	with open(jsonlPath, 'r', encoding="utf-8") as file:
+		for line in file:
+			# Une ligne incomplète termine le fichier (exploration interrompue pendant l'écriture)
+			if not line.endswith("\n"):
+				break
+			record:dict[str, Any] = json.loads(line)
+			exploredMap[record["key"]] = record["compressions"]
+	with open(txtPath, "w", encoding="utf-8") as fichier:
+		json.dump(exploredMap, fichier, ensure_ascii=False, indent=4)
 
 # \brief Exécuter la recherche de paramètres avec la façon qu'on souhaite
 #
-# @dichotomous : utilisation l'algorithme de dichotomique avec des rectangles pour réduire le nombre de test
+# @mode : façon d'explorer les paramètres (voir sweep)
 # @files : liste des fichiers à analyser
-def run(dichotomous:bool, files:list[str], mainDir:str) -> None:
+def run(mode:str, files:list[str], mainDir:str) -> None:
+	global g_store
+	# Stockage des résultats partagé par tous les fichiers du dataset
+	if g_useStore:
+		g_store = ResultStore(mainDir+"/"+ResultStore.FILE_NAME)
+	# Exécuteur partagé par toutes les explorations (None en série)
+	executor:Optional[Executor] = create_executor()
+	try:
+		run_files(mode, files, mainDir, executor)
+	finally:
+		if executor != None:
+			executor.shutdown()
+		if g_store != None:
+			g_store.close()
+			g_store = None
+
+# \brief Charge la trace d'un fichier et sa solution de référence
+#
+# @return: la trace et la solution sous la forme de chaines de caractère
+def load_example(mainDir:str, fileName:str) -> tuple[str, str]:
+	# Chargement du contenu du fichier
+	trace:str = ""
+	with open(mainDir+"/example/"+fileName+".log", 'r') as file:
+		trace = file.readline()
+	# Chargement du contenu de la solution
+	solution:str = ""
+	with open(mainDir+"/example/solutions/"+fileName+".log", 'r') as file:
+		solution = file.readline()
+	return trace, solution
+
+# \brief Enregistre les résultats de l'exploration d'un fichier (matrice des codes et solutions explorées)
+#
+# @mode : "exhaustive", "dichotomous" ou "surrogate", préfixe des fichiers produits
+def save_outputs(mode:str, fileName:str, mainDir:str) -> None:
+	# Mise en évidence en vert des paramètres permettant d'obtenir la meilleure solution
+	np.save(mainDir+"/files_npy/"+mode+"_"+fileName+".npy", g_tab_parametersToBestResultPos)
+	print("Nombe de points explorés : "+str(len(g_exploredMap))+"                                                        ")
+	# Conversion des solutions explorées au format JSON utilisé par les notebooks
+	if g_legacyOutput:
+		convert_to_legacy(mainDir+"/solutionsExplored/"+mode+"_"+fileName+".jsonl", mainDir+"/solutionsExplored/"+mode+"_"+fileName+".txt")
+
+# \brief Estime la durée de compression d'un point pour chacune des traces : durée moyenne mesurée lors des explorations précédentes si elle est connue, sinon extrapolée à partir de la longueur de la trace (PTKE est quadratique en la longueur de la trace, le coefficient étant étalonné sur les traces dont la durée est connue) et bornée par le budget de temps de MAP
+#
+# @traces : les traces indexées par nom de fichier
+# @return: la durée estimée en secondes indexée par nom de fichier
+def estimate_costs(traces:dict[str, str]) -> dict[str, float]:
+	measured:dict[str, float] = {}
+	for fileName, trace in traces.items():
+		runtime:Optional[float] = load_runtime(trace)
+		if runtime != None:
+			measured[fileName] = runtime
+	# Sans mesure, une trace de 100 évènements est estimée à une seconde
+	factor:float = float(np.median([measured[fileName]/max(1, len(traces[fileName]))**2 for fileName in measured])) if len(measured) > 0 else 1e-4
+	costs:dict[str, float] = {}
+	for fileName, trace in traces.items():
+		costs[fileName] = measured[fileName] if fileName in measured else min(float(TIME_LIMIT), factor*len(trace)**2)
+	return costs
+
+# \brief Explore de manière exhaustive tous les fichiers d'un dataset avec un ordonnanceur commun : les points de tous les fichiers forment une seule file de tâches, soumises à l'exécuteur des plus coûteuses aux moins coûteuses (estimation de estimate_costs) pour que les compressions les plus longues ne retardent pas la fin de l'exploration. Les points de chaque fichier sont enregistrés au fil de l'eau dans son fichier JSON Lines (voir SweepLog), dans l'ordre de la grille dès que tous les points précédents sont disponibles, et ses résultats sont produits dès que tous ses points sont calculés : ils sont identiques à ceux de l'exploration en série
+#
+# @files : liste des fichiers à analyser
+# @executor : l'exécuteur des compressions
+def schedule_exhaustive(files:list[str], mainDir:str, executor:Executor) -> None:
+	examples:dict[str, tuple[str, str]] = {fileName: load_example(mainDir, fileName) for fileName in files}
+	costs:dict[str, float] = estimate_costs({fileName: examples[fileName][0] for fileName in files})
+	points:list[tuple[int, int, int, Decimal, Decimal, Decimal, str]] = grid_points()
+	# Compressions déjà disponibles (enregistrées avant une reprise ou stockées) et tâches à exécuter
+	results:dict[str, dict[str, CompressionSet]] = {}
+	tasks:list[tuple[str, Decimal, Decimal, Decimal, str]] = []
+	# Enregistrement au fil de l'eau de chaque fichier en cours d'exploration et nombre de ses points (dans l'ordre de la grille) déjà enregistrés
+	sweepLogs:dict[str, SweepLog] = {}
+	nbLogged:dict[str, int] = {}
+	for fileName in files:
+		trace, solution = examples[fileName]
+		results[fileName] = {}
+		sweepLog:SweepLog = open_sweep_log(mainDir+"/solutionsExplored/exhaustive_"+fileName+".jsonl", solution)
+		sweepLogs[fileName] = sweepLog
+		nbLogged[fileName] = 0
+		for _, _, _, gr, ws, pb, key in points:
+			available:Optional[CompressionSet] = sweepLog.records[key] if key in sweepLog.records else load_result(trace, float(gr), float(ws), float(pb), solution)
+			if available != None:
+				results[fileName][key] = available
+			else:
+				tasks.append((fileName, gr, ws, pb, key))
+	# Les tâches les plus longues d'abord (à coût égal, dans l'ordre des fichiers puis de la grille)
+	tasks.sort(key=lambda task: -costs[task[0]])
+	remaining:dict[str, int] = {fileName: 0 for fileName in files}
+	futures:dict[Future[tuple[CompressionSet, float]], tuple[str, Decimal, Decimal, Decimal, str]] = {}
+	for task in tasks:
+		fileName, gr, ws, pb, key = task
+		trace, solution = examples[fileName]
+		remaining[fileName] += 1
+		futures[executor.submit(timed_compress_task, (trace, float(gr), float(ws), float(pb), solution))] = task
+	print("Ordonnancement de "+str(len(tasks))+" compressions sur "+str(len(files))+" fichiers (durée estimée : "+str(round(sum(costs[task[0]] for task in tasks)/max(1, g_nbWorkers)))+"s)")
+
+	# Enregistrement au fil de l'eau des points disponibles d'un fichier qui suivent le dernier point enregistré (comme add_available_points de search_exhaustive_parallel)
+	def log_available_points(fileName:str) -> None:
+		solution:str = examples[fileName][1]
+		sweepLog:SweepLog = sweepLogs[fileName]
+		while nbLogged[fileName] < len(points) and points[nbLogged[fileName]][6] in results[fileName]:
+			_, _, _, gr, ws, pb, key = points[nbLogged[fileName]]
+			if key not in sweepLog.records:
+				compressions:CompressionSet = results[fileName][key]
+				sweepLog.write(key, gr, ws, pb, compressions.getCode(solution), compressions)
+			nbLogged[fileName] += 1
+
+	# Enregistrement des résultats d'un fichier dont tous les points sont calculés (le parcours de la grille ne fait que relire les compressions, déjà toutes enregistrées)
+	def finish_file(fileName:str) -> None:
+		trace, solution = examples[fileName]
+		log_available_points(fileName)
+		sweepLogs.pop(fileName).close()
+		print("Recherche des paramètres pour le fichier : "+mainDir+"/"+fileName+".log                                        ")
+		sweep(trace, solution, mainDir+"/solutionsExplored/exhaustive_"+fileName+".jsonl", "exhaustive", None, results.pop(fileName))
+		save_outputs("exhaustive", fileName, mainDir)
+
+	try:
+		for fileName in files:
+			if remaining[fileName] == 0:
+				finish_file(fileName)
+			else:
+				log_available_points(fileName)
+		# Récupération des résultats au fur et à mesure de leur disponibilité, avec le débit et le temps restant estimé
+		startTime:float = time.perf_counter()
+		doneCost:float = 0
+		remainingCost:float = sum(costs[task[0]] for task in tasks)
+		for nbDone, future in enumerate(as_completed(futures), 1):
+			fileName, gr, ws, pb, key = futures.pop(future)
+			trace, solution = examples[fileName]
+			compressions, seconds = future.result()
+			results[fileName][key] = compressions
+			save_result(trace, float(gr), float(ws), float(pb), solution, compressions)
+			save_runtime(trace, seconds)
+			doneCost += costs[fileName]
+			remainingCost -= costs[fileName]
+			elapsed:float = time.perf_counter()-startTime
+			print("("+str(nbDone)+"/"+str(len(tasks))+") "+str(round(nbDone/elapsed, 2))+" points/s, temps restant estimé : "+str(round(remainingCost*elapsed/doneCost))+"s   ", end='\r')
+			remaining[fileName] -= 1
+			if remaining[fileName] == 0:
+				finish_file(fileName)
+			else:
+				log_available_points(fileName)
+	finally:
+		# Fichiers dont l'exploration a été interrompue : leurs points déjà enregistrés seront repris
+		for sweepLog in sweepLogs.values():
+			sweepLog.close()
+
+# \brief Exécuter la recherche de paramètres sur chacun des fichiers
+#
+# @mode : façon d'explorer les paramètres (voir sweep)
+# @files : liste des fichiers à analyser
+# @executor : si fourni, exécuteur utilisé pour compresser plusieurs points en parallèle
+def run_files(mode:str, files:list[str], mainDir:str, executor:Optional[Executor]) -> None:
 	# S'assurer que les dossiers de sortie existent
 	if not os.path.exists(mainDir+"/files_npy"):
 		os.makedirs(mainDir+"/files_npy")
 	if not os.path.exists(mainDir+"/solutionsExplored"):
 		os.makedirs(mainDir+"/solutionsExplored")
-	# Façon dichotomique
-	if (dichotomous):
-		for fileName in files:
-			# Chargement du contenu du fichier
-			trace:str = ""
-			with open(mainDir+"/example/"+fileName+".log", 'r') as file:
-				trace = file.readline()
-			print("Recherche des paramètres pour le fichier : "+mainDir+"/"+fileName+".log")
-			# Chargement du contenu de la solution
-			solution:str = ""
-			with open(mainDir+"/example/solutions/"+fileName+".log", 'r') as file:
-				solution = file.readline()
-			# Analyse
-			search_gr_ws_by_rect(trace, solution)
-			# Mise en évidence en vert des paramètres permettant d'obtenir la meilleure solution
-			np.save(mainDir+"/files_npy/dichotomous_"+fileName+".npy",g_tab_parametersToBestResultPos)
-			print("Nombe de points explorés : "+str(len(g_exploredMap))+"                                                        ")
-			# Sauvegarde des solutions explorées
-			g_exploredMap_dict:dict[str, list[CompressionStats]] = {}
-			for key, value in g_exploredMap.items():
-				g_exploredMap_dict[key] = value.to_dict()
-			with open(mainDir+"/solutionsExplored/dichotomous_"+fileName+".txt", "w", encoding="utf-8") as fichier:
-				json.dump(g_exploredMap_dict, fichier, default=custom_serializer, ensure_ascii=False, indent=4)
-				#fichier.write(str(g_exploredMap).replace("),", "),\n"))
-			#print(str(g_exploredMap))
-			#print("************************************************************\n\n")
-	# Façon exhaustive
-	else:
-		for fileName in files:
-			# Chargement du contenu du fichier
-			trace:str = ""
-			with open(mainDir+"/example/"+fileName+".log", 'r') as file:
-				trace = file.readline()
-			print("Recherche des paramètres pour le fichier : "+mainDir+"/"+fileName+".log")
-			# Chargement du contenu de la solution
-			solution:str = ""
-			with open(mainDir+"/example/solutions/"+fileName+".log", 'r') as file:
-				solution = file.readline()
-			search_exhaustive(trace, solution)
-			# Mise en évidence en vert des paramètres permettant d'obtenir la meilleure solution
-			np.save(mainDir+"/files_npy/exhaustive_"+fileName+".npy", g_tab_parametersToBestResultPos)
-			print("Nombe de points explorés : "+str(len(g_exploredMap))+"                                                        ")
-			# Sauvegarde des solutions explorées
-			g_exploredMap_dict:dict[str, list[CompressionStats]] = {}
-			for key, value in g_exploredMap.items():
-				g_exploredMap_dict[key] = value.to_dict()
-			with open(mainDir+"/solutionsExplored/exhaustive_"+fileName+".txt", "w", encoding="utf-8") as fichier:
-				json.dump(g_exploredMap_dict, fichier, default=custom_serializer, ensure_ascii=False, indent=4)
-				#fichier.write(str(g_exploredMap).replace("),", "),\n"))
-			#print(str(g_exploredMap))
-			#print("************************************************************\n\n")
+	# Façon exhaustive en parallèle : tous les points de tous les fichiers sont ordonnancés ensemble
+	if mode == "exhaustive" and executor != None:
+		schedule_exhaustive(files, mainDir, executor)
+		return
+	for fileName in files:
+		trace, solution = load_example(mainDir, fileName)
+		print("Recherche des paramètres pour le fichier : "+mainDir+"/"+fileName+".log")
+		# Analyse
+		# Les résultats sont enregistrés au fil de l'eau, une exploration interrompue reprend à partir des points déjà enregistrés
+		sweep(trace, solution, mainDir+"/solutionsExplored/"+mode+"_"+fileName+".jsonl", mode, executor)
+		save_outputs(mode, fileName, mainDir)
+		#print(str(g_exploredMap))
+		#print("************************************************************\n\n")
 
 def parse_arguments() -> argparse.Namespace:
 	parser = argparse.ArgumentParser(description="Recherche de paramètres pour la compression de traces")
@@ -693,12 +1426,48 @@ def parse_arguments() -> argparse.Namespace:
 	
 	# Second format : dataset prédéfini
 	group.add_argument('-s', '--dataset', choices=['dataset1', 'dataset2', 'dataset3'], help='Nom du dataset prédéfini à utiliser')
+
+	# Conversion d'un fichier de résultats JSON Lines au format des notebooks
+	group.add_argument('--convert', metavar='JSONL', help='Convertir un fichier de résultats JSON Lines au format JSON des notebooks (fichier .txt à côté du fichier converti)')
 	
 	# Options communes aux deux formats
-	parser.add_argument('-m', '--mode', choices=['exhaustive', 'dichotomous'],
-					default='dichotomous', help='Mode d\'analyse (défaut: dichotomous)')
+	parser.add_argument('-m', '--mode', choices=['exhaustive', 'dichotomous', 'surrogate'],
+					default='dichotomous', help='Mode d\'analyse (défaut: dichotomous), surrogate choisit les points à compresser là où un classifieur des plus proches voisins ajusté aux points déjà compressés est le plus incertain')
+	parser.add_argument('-e', '--early-stop', action='store_true',
+					help='Arrêter MAP dès que la solution est trouvée (les compressions sauvegardées sont alors partielles)')
+	parser.add_argument('-c', '--chunk-size', type=int, default=0,
+					help='Compresser par segments de cette taille les traces plus longues (ex : m9), 0 pour désactiver (défaut: 0)')
+	parser.add_argument('-g', '--grammar', action='store_true',
+					help='Initialiser les épisodes de PTKE avec les répétitions trouvées par une grammaire Re-Pair')
+	parser.add_argument('-r', '--repeats', action='store_true',
+					help='Ajouter aux épisodes candidats de PTKE les répétitions contiguës maximales (tableau des suffixes)')
+	parser.add_argument('-u', '--reuse-enumeration', action='store_true',
+					help='Mémoriser les épisodes énumérés par PTKE pour chaque root et chaque gr afin de ne recalculer que leurs scores pour les autres ws et pb (les compressions sont identiques, l\'exploration exhaustive parcourt gr en premier)')
+	parser.add_argument('-x', '--skip-equivalent', action='store_true',
+					help='Ne pas exécuter MAP pour les ws et pb donnant les mêmes résultats à toutes les comparaisons de scores et à tous les tests de fusion qu\'une exécution précédente avec le même gr, ses compressions sont reprises (elles sont identiques)')
+	parser.add_argument('--resolution', nargs='+', type=Decimal, metavar='STEP',
+					help='Mode dichotomous : raffiner les frontières jusqu\'à ce pas (un pour gr, ws et pb ou un par paramètre, ex : 0.01) à l\'aide d\'un octree creux au lieu de la grille de '+str(g_nbPoints)+' points par axe')
+	parser.add_argument('--export-step', nargs='+', type=Decimal, metavar='STEP',
+					help='Pas (un pour tous les paramètres ou un par paramètre) de la matrice des codes enregistrée avec --resolution (défaut : ceux de la grille de '+str(g_nbPoints)+' points par axe)')
+	parser.add_argument('-j', '--jobs', type=int, default=1,
+					help='Nombre de processus compressant des points en parallèle (défaut: 1, exploration en série)')
+	parser.add_argument('--no-legacy', action='store_true',
+					help='Ne produire que les résultats JSON Lines (.jsonl), sans les convertir au format JSON des notebooks (.txt)')
+	parser.add_argument('--no-store', action='store_true',
+					help='Ne pas consulter ni alimenter le stockage des résultats ('+ResultStore.FILE_NAME+' dans le dossier du dataset)')
 	
-	return parser.parse_args()
+	args:argparse.Namespace = parser.parse_args()
+	# Vérification des pas de l'octree et de la matrice exportée
+	for option, steps in (("--resolution", args.resolution), ("--export-step", args.export_step)):
+		if steps != None:
+			if len(steps) not in (1, 3):
+				parser.error(option+" attend un pas ou trois (gr, ws et pb)")
+			try:
+				for step, bounds in zip(steps*3 if len(steps) == 1 else steps, (g_gr_bounds, g_ws_bounds, g_pb_bounds)):
+					ParameterOctree.nb_steps(bounds[0], bounds[1], step)
+			except ValueError as error:
+				parser.error(option+" : "+str(error))
+	return args
 
 if __name__ == "__main__":
 	# Définition des datasets disponibles
@@ -725,8 +1494,27 @@ if __name__ == "__main__":
 	}
 
 	args = parse_arguments()
+	g_earlyStop = args.early_stop
+	g_chunkSize = args.chunk_size
+	PTKE.GRAMMAR_SEEDING = args.grammar
+	PTKE.SUFFIX_SEEDING = args.repeats
+	if args.reuse_enumeration:
+		PTKE.ENUMERATION_CACHE = EnumerationCache()
+	g_skipEquivalent = args.skip_equivalent
+	if g_skipEquivalent:
+		PTKE.RANKING_CACHE = RankingCache()
+	if args.resolution != None:
+		g_resolution = tuple(args.resolution*3 if len(args.resolution) == 1 else args.resolution) # type: ignore
+	if args.export_step != None:
+		g_exportSteps = tuple(args.export_step*3 if len(args.export_step) == 1 else args.export_step) # type: ignore
+	g_nbWorkers = args.jobs
+	g_useStore = not args.no_store
+	g_legacyOutput = not args.no_legacy
 	
-	if args.file:
+	if args.convert:
+		# Mode conversion
+		convert_to_legacy(args.convert, os.path.splitext(args.convert)[0]+".txt")
+	elif args.file:
 		# Mode fichier
 		test_files:list[str]=[]
 		if args.file == "all":
@@ -739,7 +1527,7 @@ if __name__ == "__main__":
 			test_files=[f.replace('.log', '') for f in os.listdir(args.directory+"/example") if f.endswith(".log")] # type: ignore
 		else:
 			test_files = [args.file]
-		run(args.mode == "dichotomous", test_files, args.directory)
+		run(args.mode, test_files, args.directory)
 	else:
 		# Mode dataset
 		dataset = datasets[args.dataset]
@@ -752,4 +1540,4 @@ if __name__ == "__main__":
 		if not isinstance(dataset_dir, str):
 			print("Error: dir incorrect type")
 			sys.exit(1)
-		run(args.mode == "dichotomous", files_list, dataset_dir)
+		run(args.mode, files_list, dataset_dir)
@@ -0,0 +1,65 @@
+import os
+import sys
+from concurrent.futures import Executor
+from decimal import Decimal
+from typing import Callable, Optional
+
+import numpy as np
+import pytest
+
+ROOT:str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Les modules du dépôt sont à sa racine (il n'est pas installé comme paquet)
+sys.path.insert(0, ROOT)
+
+from Event import Call, Event, Sequence  # noqa: E402
+from MAP import CompressionSet, CompressionStats  # noqa: E402
+import exploreParameters  # noqa: E402
+
+
+# Trace et solution d'un exemple de dataset2 (boucles imbriquées) : avec gr=0, ws=1 et pb=1, MAP y trouve la solution parmi 45 compressions en moins d'une seconde
+NESTED_LOOPS:str = "9.03_bouclesImbriquees"
+NESTED_LOOPS_PARAMETERS:tuple[float, float, float] = (0.0, 1.0, 1.0)
+
+
+@pytest.fixture
+def nested_loops() -> tuple[list[Event], str]:
+    directory:str = os.path.join(ROOT, "dataset2", "example")
+    with open(os.path.join(directory, NESTED_LOOPS+".log")) as f:
+        trace:str = f.readline().strip()
+    with open(os.path.join(directory, "solutions", NESTED_LOOPS+".log")) as f:
+        solution:str = f.readline().strip()
+    return [Call(c) for c in trace], solution
+
+
+# Trace courte dont les codes varient sur la grille des paramètres, pour les explorations de exploreParameters
+SWEEP_TRACE:str = "AIJLIJLTIJLIJLZ"
+SWEEP_SOLUTION:str = "A[T*IJLT*]Z"
+
+
+@pytest.fixture
+def small_grid(monkeypatch:pytest.MonkeyPatch) -> None:
+    # Grille de 5 points par paramètre au lieu de 11 pour que les explorations restent rapides
+    nbPoints:int = 5
+    steps:list[Decimal] = [(bounds[1]-bounds[0])/(nbPoints-1) for bounds in (exploreParameters.g_gr_bounds, exploreParameters.g_ws_bounds, exploreParameters.g_pb_bounds)]
+    monkeypatch.setattr(exploreParameters, "g_nbPoints", nbPoints)
+    monkeypatch.setattr(exploreParameters, "g_gr_step", steps[0])
+    monkeypatch.setattr(exploreParameters, "g_ws_step", steps[1])
+    monkeypatch.setattr(exploreParameters, "g_pb_step", steps[2])
+    monkeypatch.setattr(exploreParameters, "g_exportSteps", tuple(steps))
+
+
+# Remplace evaluate_points de exploreParameters : le code de chaque point est lu dans un paysage synthétique (matrice indexée comme g_tab_parametersToBestResultPos) au lieu d'exécuter MAP, les points demandés sont ajoutés à calls
+def fake_evaluate(codes:np.ndarray, calls:list[exploreParameters.Point]) -> Callable[[list[exploreParameters.Point], str, str, Optional[Executor]], list[CompressionSet]]:
+    def evaluate_points(points:list[exploreParameters.Point], trace:str, solution:str, executor:Optional[Executor] = None) -> list[CompressionSet]:
+        results:list[CompressionSet] = []
+        for point in points:
+            calls.append(point)
+            compression:Sequence = Sequence()
+            compression.isRoot = True
+            index:tuple[int, int, int] = (int(point.gr/exploreParameters.g_gr_step), int(point.ws/exploreParameters.g_ws_step), int(point.pb/exploreParameters.g_pb_step))
+            compression.event_list = [Call(solution if codes[index] == 1 else "x")]
+            compressions:CompressionSet = CompressionSet()
+            compressions.set.add(CompressionStats(compression, 1, 0, 0))
+            results.append(compressions)
+        return results
+    return evaluate_points
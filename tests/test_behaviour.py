@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+import exploreParameters
+import MAP
+from conftest import SWEEP_SOLUTION, SWEEP_TRACE
+from Episode import NonOverlappedEpisode
+from Event import Call, Event, Sequence
+from MAP import Behaviour, CompressionCache, CompressionSet, CompressionStats, MAPWithBehaviour
+from PTKE import PTKE, RankingCache
+
+TRACE:str = "ABCDxyABCDxyABCD"
+
+
+def calls(trace:str) -> list[Event]:
+    return [Call(c) for c in trace]
+
+
+def test_behaviour_is_recorded_for_a_complete_exploration():
+    compressions, behaviour = MAPWithBehaviour(calls(TRACE), 1.0, 0.5, 1.0)
+    assert behaviour != None and behaviour.isEquivalent(0.5, 1.0)
+    assert compressions == MAP.MAP(calls(TRACE), 1.0, 0.5, 1.0)
+
+
+def test_behaviour_is_dropped_when_a_gap_compression_is_cut(monkeypatch:pytest.MonkeyPatch):
+    runMAP = MAP.MAP
+    gaps:list[int] = []
+
+    # Les compressions récursives des évènements intercalés (appelées avec un cache) sont interrompues
+    def cutGaps(event_list:list[Event], gr:float, ws:float, pb:float, target:str | None = None, cache:CompressionCache | None = None) -> CompressionSet:
+        if cache == None:
+            return runMAP(event_list, gr, ws, pb, target)
+        gaps.append(len(event_list))
+        overTime:CompressionSet = CompressionSet()
+        overTime.set.add(CompressionStats(Sequence(), 0, 0, 0))
+        return overTime
+
+    monkeypatch.setattr(MAP, "MAP", cutGaps)
+    compressions, behaviour = MAPWithBehaviour(calls(TRACE), 1.0, 0.5, 1.0)
+    assert len(gaps) > 0
+    assert not compressions.isOverTime()
+    assert behaviour == None
+
+
+def test_score_all_caches_the_scores_of_get_score(monkeypatch:pytest.MonkeyPatch):
+    monkeypatch.setattr(MAP.PTKE, "GAP_RATIO", 1.0, raising=False)
+    monkeypatch.setattr(NonOverlappedEpisode, "WEIGHT_SUPPORT", 0.5, raising=False)
+    monkeypatch.setattr(NonOverlappedEpisode, "PROXIMITY_BALANCING", 1.0, raising=False)
+    episodes:list[NonOverlappedEpisode] = MAP.PTKE().getBestEpisodes(calls(TRACE))
+    scores:np.ndarray = NonOverlappedEpisode.scoreAll(episodes)
+    for score, episode in zip(scores, episodes):
+        assert not episode.isDurty() or episode.getSupport() < 2
+        assert episode.getScore() == score
+
+
+def test_ranking_cache_gives_the_plain_compressions(monkeypatch:pytest.MonkeyPatch):
+    grid:list[tuple[float, float, float]] = [(gr, ws, pb) for gr in (0.0, 1.0) for ws in (0.0, 0.2, 0.5, 0.8, 1.0) for pb in (0.0, 0.5, 1.0)]
+    plain:list[CompressionSet] = [MAP.MAP(calls(SWEEP_TRACE), *parameters) for parameters in grid]
+    cache:RankingCache = RankingCache()
+    monkeypatch.setattr(PTKE, "RANKING_CACHE", cache)
+    assert [MAP.MAP(calls(SWEEP_TRACE), *parameters) for parameters in grid] == plain
+    assert cache.hits > 0
+
+
+def test_sweep_skipping_equivalent_points_gives_the_plain_results(monkeypatch:pytest.MonkeyPatch, tmp_path, small_grid:None):
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, str(tmp_path/"plain.jsonl"), "exhaustive", None)
+    # Option -x
+    monkeypatch.setattr(exploreParameters, "g_skipEquivalent", True)
+    monkeypatch.setattr(PTKE, "RANKING_CACHE", RankingCache())
+    runMAPWithBehaviour = exploreParameters.MAPWithBehaviour
+    runs:list[tuple[float, float, float]] = []
+    def countedMAPWithBehaviour(event_list:list[Event], gr:float, ws:float, pb:float, target:str | None = None) -> tuple[CompressionSet, Behaviour | None]:
+        runs.append((gr, ws, pb))
+        return runMAPWithBehaviour(event_list, gr, ws, pb, target)
+    monkeypatch.setattr(exploreParameters, "MAPWithBehaviour", countedMAPWithBehaviour)
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, str(tmp_path/"skip.jsonl"), "exhaustive", None)
+    with open(tmp_path/"plain.jsonl", "rb") as plain, open(tmp_path/"skip.jsonl", "rb") as skip:
+        assert skip.read() == plain.read()
+    # Des points équivalents à un point déjà exploré n'ont pas été recompressés
+    assert len(runs) < exploreParameters.g_nbPoints**3
@@ -0,0 +1,41 @@
+import random
+
+import pytest
+
+import MAP
+from conftest import NESTED_LOOPS_PARAMETERS
+from Episode import NonOverlappedEpisode
+from Event import Call, Event
+from PTKE import PTKE, buildBitmap, iterBits
+
+
+def test_bitmap_round_trip():
+    generator:random.Random = random.Random(0)
+    for _ in range(50):
+        positions:list[int] = sorted(generator.sample(range(300), generator.randrange(0, 40)))
+        assert list(iterBits(buildBitmap(positions))) == positions
+
+
+def bestEpisodes(trace:str) -> list[tuple[str, list[tuple[int, int]]]]:
+    return [(str(episode), list(episode.boundlist)) for episode in PTKE().getBestEpisodes([Call(c) for c in trace])]
+
+
+@pytest.mark.parametrize("gr", [0.0, 1.0, 2.0])
+def test_bitmap_extensions_give_the_same_episodes(monkeypatch:pytest.MonkeyPatch, gr:float):
+    monkeypatch.setattr(PTKE, "GAP_RATIO", gr, raising=False)
+    monkeypatch.setattr(NonOverlappedEpisode, "WEIGHT_SUPPORT", 0.5, raising=False)
+    monkeypatch.setattr(NonOverlappedEpisode, "PROXIMITY_BALANCING", 0.5, raising=False)
+    generator:random.Random = random.Random(int(gr))
+    for _ in range(20):
+        trace:str = "".join(generator.choice("ABCD") for _ in range(generator.randrange(2, 80)))
+        monkeypatch.setattr(PTKE, "BITSET_MIN_LENGTH", len(trace)+1)
+        withLists:list[tuple[str, list[tuple[int, int]]]] = bestEpisodes(trace)
+        monkeypatch.setattr(PTKE, "BITSET_MIN_LENGTH", 0)
+        assert bestEpisodes(trace) == withLists
+
+
+def test_bitmap_extensions_give_the_same_compressions(monkeypatch:pytest.MonkeyPatch, nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    withLists:MAP.CompressionSet = MAP.MAP(trace, *NESTED_LOOPS_PARAMETERS)
+    monkeypatch.setattr(PTKE, "BITSET_MIN_LENGTH", 0)
+    assert MAP.MAP(trace, *NESTED_LOOPS_PARAMETERS) == withLists
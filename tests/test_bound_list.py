@@ -0,0 +1,68 @@
+import pickle
+import random
+
+import pytest
+
+from Episode import BoundList
+
+BOUNDS:list[tuple[int, int]] = [(0, 2), (4, 5), (9, 9), (12, 15), (20, 21)]
+
+
+def counters(bounds:list[tuple[int, int]]) -> tuple[int, int]:
+    inside:int = sum(end-start+1 for start, end in bounds)
+    between:int = sum(current[0]-previous[1]-1 for previous, current in zip(bounds, bounds[1:]))
+    return inside, between
+
+
+def test_counters_of_lists_and_views():
+    boundlist:BoundList = BoundList(BOUNDS)
+    assert list(boundlist) == BOUNDS
+    assert (boundlist.nbEventsInsideBounds, boundlist.nbEventsBetweenBounds) == counters(BOUNDS)
+    for start in range(len(BOUNDS)+1):
+        for stop in range(len(BOUNDS)+1):
+            view:BoundList = boundlist.slice(start, stop)
+            assert list(view) == BOUNDS[start:stop]
+            assert (view.nbEventsInsideBounds, view.nbEventsBetweenBounds) == counters(BOUNDS[start:stop])
+    assert list(boundlist.slice(0, len(BOUNDS), 2)) == BOUNDS[::2]
+
+
+def test_appending_to_a_view_leaves_the_list_unchanged():
+    boundlist:BoundList = BoundList(BOUNDS)
+    head:BoundList = boundlist.slice(0, 2)
+    head.append((30, 31))
+    tail:BoundList = boundlist.slice(3, len(BOUNDS))
+    tail.append((40, 40))
+    boundlist.append((50, 52))
+    assert list(head) == BOUNDS[:2]+[(30, 31)]
+    assert list(tail) == BOUNDS[3:]+[(40, 40)]
+    assert list(boundlist) == BOUNDS+[(50, 52)]
+    assert (head.nbEventsInsideBounds, head.nbEventsBetweenBounds) == counters(BOUNDS[:2]+[(30, 31)])
+
+
+@pytest.mark.parametrize("protocol", range(2, pickle.HIGHEST_PROTOCOL+1))
+def test_pickle_round_trip(protocol:int):
+    generator:random.Random = random.Random(protocol)
+    bounds:list[tuple[int, int]] = []
+    for _ in range(100):
+        start:int = (bounds[-1][1] if len(bounds) > 0 else 0) + generator.randrange(1, 5)
+        bounds.append((start, start+generator.randrange(0, 4)))
+    # Une vue ne sérialise que ses propres bounds
+    view:BoundList = BoundList(bounds).slice(10, 60)
+    view.durty = False
+    copied:BoundList = pickle.loads(pickle.dumps(view, protocol=protocol))
+    assert copied == view and list(copied) == bounds[10:60]
+    assert (copied.nbEventsInsideBounds, copied.nbEventsBetweenBounds) == counters(bounds[10:60])
+    assert not copied.durty
+    copied.append((10000, 10001))
+    assert list(view) == bounds[10:60]
+
+
+def test_pickle_with_out_of_band_buffers():
+    boundlist:BoundList = BoundList(BOUNDS)
+    buffers:list[pickle.PickleBuffer] = []
+    data:bytes = pickle.dumps(boundlist, protocol=5, buffer_callback=buffers.append)
+    # Les tableaux des débuts et des fins sont transmis hors du flux, sans copie
+    assert len(buffers) == 2
+    copied:BoundList = pickle.loads(data, buffers=buffers)
+    assert list(copied) == BOUNDS
+    assert (copied.nbEventsInsideBounds, copied.nbEventsBetweenBounds) == counters(BOUNDS)
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+import MAP
+from conftest import NESTED_LOOPS_PARAMETERS
+from Event import Event
+from MAP import CompressionSet, iterMAP
+
+
+def test_resumed_exploration_gives_the_uninterrupted_compressions(monkeypatch:pytest.MonkeyPatch, tmp_path, nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    uninterrupted:CompressionSet = MAP.MAP(trace, *NESTED_LOOPS_PARAMETERS)
+    checkpointFile:str = str(tmp_path/"map.json")
+    # Sauvegarde avant chaque expansion de root, puis interruption après quelques compressions
+    monkeypatch.setattr(MAP, "CHECKPOINT_INTERVAL", 0)
+    found:int = 0
+    for _ in iterMAP(trace, *NESTED_LOOPS_PARAMETERS, checkpointFile=checkpointFile):
+        found += 1
+        if found == 10:
+            break
+    assert os.path.exists(checkpointFile)
+    assert MAP.MAP(trace, *NESTED_LOOPS_PARAMETERS, checkpointFile=checkpointFile) == uninterrupted
+    # L'état final est sauvegardé : une nouvelle reprise restitue les compressions sans rien explorer
+    assert MAP.MAP(trace, *NESTED_LOOPS_PARAMETERS, checkpointFile=checkpointFile) == uninterrupted
+
+
+def test_checkpoint_of_another_exploration_is_rejected(tmp_path, nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    checkpointFile:str = str(tmp_path/"map.json")
+    MAP.MAP(trace, *NESTED_LOOPS_PARAMETERS, checkpointFile=checkpointFile)
+    with pytest.raises(ValueError):
+        MAP.MAP(trace, 0.5, 0.5, 0.5, checkpointFile=checkpointFile)
+    with pytest.raises(ValueError):
+        MAP.MAP(trace[1:], *NESTED_LOOPS_PARAMETERS, checkpointFile=checkpointFile)
@@ -0,0 +1,41 @@
+from Event import Call, Event, Sequence
+from MAP import appendChunk, chunkedMAP, getBestCompression, splitTrace
+
+
+def calls(trace:str) -> list[Event]:
+    return [Call(c) for c in trace]
+
+
+def loop(trace:str) -> Sequence:
+    sequence:Sequence = Sequence()
+    sequence.event_list = calls(trace)
+    return sequence
+
+
+def test_split_trace_cuts_a_loop_at_the_same_place_of_an_iteration():
+    trace:list[Event] = calls("xy" + "ABC"*60 + "z")
+    chunks:list[tuple[int, int]] = splitTrace(trace, 40)
+    assert len(chunks) > 2
+    assert all(str(trace[start]) == "A" for start, _ in chunks[1:])
+
+
+def test_append_chunk_merges_loops_across_the_cut():
+    stitched:list[Event] = [Call("x"), loop("ABC")]
+    appendChunk(stitched, calls("ABC") + [loop("ABC"), Call("y")])
+    assert [str(e) for e in stitched] == ["x", "[ABC]", "y"]
+    stitched = calls("xABC")
+    appendChunk(stitched, [loop("ABC"), Call("y")])
+    assert [str(e) for e in stitched] == ["x", "[ABC]", "y"]
+
+
+def test_append_chunk_keeps_different_loops():
+    stitched:list[Event] = [loop("ABC")]
+    appendChunk(stitched, [loop("BCA")] + calls("AB"))
+    assert [str(e) for e in stitched] == ["[ABC]", "[BCA]", "A", "B"]
+
+
+def test_chunked_map_finds_a_loop_crossing_chunks_as_one_pattern():
+    trace:list[Event] = calls("xy" + "ABC"*30 + "z")
+    assert len(splitTrace(trace, 40)) > 1
+    best = getBestCompression(chunkedMAP(trace, 1.0, 0.5, 0.5, 40))
+    assert best != None and str(best.compression) == "xy[ABC]z"
@@ -0,0 +1,64 @@
+import pytest
+
+import MAP
+from Event import Call, Event, Sequence, decodeEvents, encodeEvents
+from MAP import CompressionCache, CompressionSet, CompressionStats
+
+TRACE:str = "ABCDxyABCDxyABCD"
+
+
+def calls(trace:str) -> list[Event]:
+    return [Call(c) for c in trace]
+
+
+def test_cache_returns_a_copy():
+    cache:CompressionCache = CompressionCache()
+    compressions:CompressionSet = MAP.MAP(calls("ABAB"), 1.0, 0.5, 0.5)
+    key:tuple[str, float, float, float, float] = MAP.getGapKey(calls("ABAB"), 1.0, 0.5, 0.5)
+    cache.put(key, compressions)
+    cached:CompressionSet | None = cache.get(key)
+    assert cached == compressions and cached is not compressions
+    cached.set.clear()
+    assert cache.get(key) == compressions
+    assert cache.get(MAP.getGapKey(calls("AB"), 1.0, 0.5, 0.5)) == None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cached_gaps_give_the_compressions_of_a_fresh_run(monkeypatch:pytest.MonkeyPatch):
+    fresh:CompressionSet = MAP.MAP(calls(TRACE), 1.0, 0.5, 1.0)
+    gaps:dict[tuple[str, float, float, float, float], CompressionSet] = {}
+    compressGap = MAP.compressGap
+
+    def recordGap(event_list:list[Event], gr:float, ws:float, pb:float, cache:CompressionCache) -> CompressionSet:
+        result:CompressionSet = compressGap(event_list, gr, ws, pb, cache)
+        gaps[MAP.getGapKey(event_list, gr, ws, pb)] = result
+        return result
+
+    monkeypatch.setattr(MAP, "compressGap", recordGap)
+    assert MAP.MAP(calls(TRACE), 1.0, 0.5, 1.0) == fresh
+    assert len(gaps) > 0
+    # Le marqueur "OverTime" ajouté aux compressions en cache ne doit jamais être choisi
+    cache:CompressionCache = CompressionCache()
+    for key, result in gaps.items():
+        result.set.add(CompressionStats(Sequence(), 0, 0, 0))
+        cache.put(key, result)
+    assert MAP.MAP(calls(TRACE), 1.0, 0.5, 1.0, cache=cache) == fresh
+    assert cache.hits > 0
+
+
+def test_encoded_events_decode_to_the_same_events():
+    compressions:CompressionSet = MAP.MAP(calls(TRACE), 1.0, 0.5, 1.0)
+    events:list[list[Event]] = [stats.compression.event_list for stats in compressions.set]
+    # Noms d'appels de plusieurs caractères ou contenant des caractères réservés
+    events.append([Call("main"), Call("["), Call("*"), Call("{x}"), Call("a\\}b\\"), Call(""), Call("A")])
+    for event_list in events:
+        encoding:str = encodeEvents(event_list)
+        assert decodeEvents(encoding) == event_list
+        assert encodeEvents(decodeEvents(encoding)) == encoding
+    assert len({encodeEvents(event_list) for event_list in events}) == len(events)
+
+
+@pytest.mark.parametrize("encoding", ["[AB", "AB]", "{AB", "{AB\\}", "*A"])
+def test_malformed_encodings_are_rejected(encoding:str):
+    with pytest.raises(ValueError):
+        decodeEvents(encoding)
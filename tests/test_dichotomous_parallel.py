@@ -0,0 +1,21 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import exploreParameters
+from conftest import SWEEP_SOLUTION, SWEEP_TRACE
+
+
+def test_speculative_corners_give_the_serial_dichotomous_search(tmp_path, small_grid:None):
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, str(tmp_path/"serial.jsonl"), "dichotomous", None)
+    codes:np.ndarray = exploreParameters.g_tab_parametersToBestResultPos.copy()
+    explored:list[str] = list(exploreParameters.g_exploredMap)
+    # La recherche dichotomique n'explore pas toute la grille
+    assert len(explored) < exploreParameters.g_nbPoints**3
+    with ProcessPoolExecutor(2) as executor:
+        exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, str(tmp_path/"parallel.jsonl"), "dichotomous", executor)
+    assert np.array_equal(exploreParameters.g_tab_parametersToBestResultPos, codes)
+    # Les points explorés et leur ordre sont ceux du parcours en série
+    assert list(exploreParameters.g_exploredMap) == explored
+    with open(tmp_path/"serial.jsonl", "rb") as serial, open(tmp_path/"parallel.jsonl", "rb") as parallel:
+        assert parallel.read() == serial.read()
@@ -0,0 +1,40 @@
+import pytest
+
+import exploreParameters
+from conftest import SWEEP_SOLUTION, SWEEP_TRACE
+from Event import Call, Event
+from MAP import MAP, CompressionSet
+from PTKE import PTKE, EnumerationCache
+
+GRID:list[tuple[float, float, float]] = [(gr, ws, pb) for gr in (0.0, 1.0, 2.0) for ws in (0.0, 0.5, 1.0) for pb in (0.0, 0.5, 1.0)]
+
+
+def sweep() -> list[CompressionSet]:
+    # gr en boucle externe, comme l'exploration exhaustive
+    trace:list[Event] = [Call(c) for c in SWEEP_TRACE]
+    return [MAP(trace, gr, ws, pb) for gr, ws, pb in GRID]
+
+
+def test_reused_enumerations_give_the_plain_compressions(monkeypatch:pytest.MonkeyPatch):
+    plain:list[CompressionSet] = sweep()
+    cache:EnumerationCache = EnumerationCache()
+    monkeypatch.setattr(PTKE, "ENUMERATION_CACHE", cache)
+    assert sweep() == plain
+    assert cache.hits > 0 and 0 < cache.hitRate < 1
+
+
+def test_enumeration_cache_is_bounded(monkeypatch:pytest.MonkeyPatch):
+    plain:list[CompressionSet] = sweep()
+    cache:EnumerationCache = EnumerationCache(maxSize=2)
+    monkeypatch.setattr(PTKE, "ENUMERATION_CACHE", cache)
+    assert sweep() == plain
+    assert len(cache) <= 2
+
+
+def test_sweep_with_reused_enumerations_gives_the_plain_results(monkeypatch:pytest.MonkeyPatch, tmp_path, small_grid:None):
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, str(tmp_path/"plain.jsonl"), "exhaustive", None)
+    # Option -u
+    monkeypatch.setattr(PTKE, "ENUMERATION_CACHE", EnumerationCache())
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, str(tmp_path/"reuse.jsonl"), "exhaustive", None)
+    with open(tmp_path/"plain.jsonl", "rb") as plain, open(tmp_path/"reuse.jsonl", "rb") as reuse:
+        assert reuse.read() == plain.read()
@@ -0,0 +1,104 @@
+import copy
+import pickle
+
+import pytest
+
+import MAP
+from Episode import NonOverlappedEpisode
+from Event import Call, Event, EventRope
+from MAP import getBestCompression
+from PTKE import PTKE
+
+
+def calls(trace:str) -> list[Event]:
+    return [Call(c) for c in trace]
+
+
+def rope(*parts:list[Event]) -> EventRope:
+    result:EventRope = EventRope()
+    for part in parts:
+        result.appendSlice(part, 0, len(part))
+    return result
+
+
+def test_rope_reads_like_a_list():
+    source:list[Event] = calls("ABCDEF")
+    events:EventRope = rope(source[:0], source)
+    events.appendSlice(source, 1, 3)
+    events.append(Call("x"))
+    expected:list[Event] = calls("ABCDEFBCx")
+    assert len(events) == len(expected) and list(events) == expected and events == expected
+    assert [events[i] for i in range(-len(expected), len(expected))] == expected+expected
+    assert events.pop() == Call("x") and events == expected[:-1]
+
+
+def test_slicing_returns_a_rope_view():
+    source:list[Event] = calls("ABCDEF")
+    events:EventRope = rope(source, calls("xyz"))
+    sliced:EventRope = events[2:8]
+    assert isinstance(sliced, EventRope) and sliced == calls("CDEFxy")
+    assert sliced[1:-1] == calls("DEFx") and sliced[::2] == calls("CEx") and sliced[5:2] == []
+    # Une coupure suivie d'un ajout remplace une portion de la table sans recopier les autres évènements
+    spliced:EventRope = events[:2]
+    spliced.append(Call("w"))
+    spliced.appendSlice(events, 4, len(events))
+    assert spliced == calls("ABwEFxyz") and events == calls("ABCDEFxyz")
+
+
+def test_rope_copies_and_pickles_as_a_list():
+    events:EventRope = rope(calls("ABC"), calls("DE"))
+    copied:list[Event] = copy.deepcopy(events)
+    assert type(copied) is list and copied == events
+    assert pickle.loads(pickle.dumps(events)) == calls("ABCDE")
+
+
+def test_rope_positions_match_its_events():
+    source:list[Event] = calls("ABACABAD"*4)
+    events:EventRope = rope(source)[3:20]
+    events.append(Call("A"))
+    events.appendSlice(source, 0, 5)
+    expected:dict[Event, list[int]] = {}
+    for i, event in enumerate(events):
+        expected.setdefault(event.getMainStructure(), []).append(i)
+    assert events.getPositions() == expected
+    assert list(expected) == list(events.getPositions())
+    assert events.getMainStructures() == [event.getMainStructure() for event in events]
+
+
+def test_compressions_do_not_depend_on_later_changes_of_the_trace():
+    trace:list[Event] = calls("ABCxABCyABCz")
+    best = getBestCompression(MAP.MAP(trace, 1.0, 0.5, 1.0))
+    assert best != None
+    before:str = str(best.compression)
+    trace[:] = calls("Q"*len(trace))
+    assert str(best.compression) == before
+
+
+def test_derived_ropes_reuse_the_main_structures_of_their_sources(monkeypatch:pytest.MonkeyPatch):
+    source:list[Event] = calls("ABCABCxABCy")
+    parent:EventRope = rope(source)
+    assert parent.getMainStructures() == source
+    computed:list[Event] = []
+    getMainStructure = Call.getMainStructure
+    def countedGetMainStructure(self:Call) -> Event:
+        computed.append(self)
+        return getMainStructure(self)
+    monkeypatch.setattr(Call, "getMainStructure", countedGetMainStructure)
+    # Un root dérivé ne calcule que les structures principales des évènements qu'il insère
+    child:EventRope = parent[:3]
+    child.append(Call("z"))
+    child.appendSlice(source, 6, len(source))
+    assert child.getMainStructures() == calls("ABCzxABCy")
+    assert computed == calls("z")
+
+
+def test_best_episodes_of_a_rope_are_those_of_its_list(monkeypatch:pytest.MonkeyPatch):
+    monkeypatch.setattr(PTKE, "GAP_RATIO", 1.0, raising=False)
+    monkeypatch.setattr(NonOverlappedEpisode, "WEIGHT_SUPPORT", 0.5, raising=False)
+    monkeypatch.setattr(NonOverlappedEpisode, "PROXIMITY_BALANCING", 1.0, raising=False)
+    source:list[Event] = calls("ABCxABCyABCz")
+    events:EventRope = rope(source)[2:]
+    events.appendSlice(source, 0, 4)
+    fromRope:list[tuple[str, list[tuple[int, int]]]] = [(str(episode), list(episode.boundlist)) for episode in PTKE().getBestEpisodes(events)]
+    fromList:list[tuple[str, list[tuple[int, int]]]] = [(str(episode), list(episode.boundlist)) for episode in PTKE().getBestEpisodes(list(events))]
+    assert fromRope == fromList
@@ -0,0 +1,30 @@
+from concurrent.futures import Executor
+from typing import Optional
+
+import numpy as np
+import pytest
+
+import exploreParameters
+from conftest import SWEEP_SOLUTION, SWEEP_TRACE
+from MAP import CompressionSet
+
+
+def exhaustive(tmp_path, name:str, executor:Optional[Executor]) -> tuple[np.ndarray, list[tuple[str, CompressionSet]], bytes]:
+    path:str = str(tmp_path/(name+".jsonl"))
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, path, "exhaustive", executor)
+    with open(path, "rb") as file:
+        return exploreParameters.g_tab_parametersToBestResultPos.copy(), list(exploreParameters.g_exploredMap.items()), file.read()
+
+
+def test_parallel_exhaustive_sweep_gives_the_serial_results(monkeypatch:pytest.MonkeyPatch, tmp_path, small_grid:None):
+    codes, explored, log = exhaustive(tmp_path, "serial", None)
+    assert set(np.unique(codes)) == {1, 2}
+    monkeypatch.setattr(exploreParameters, "g_nbWorkers", 2)
+    executor:Optional[Executor] = exploreParameters.create_executor()
+    assert executor != None
+    with executor:
+        parallelCodes, parallelExplored, parallelLog = exhaustive(tmp_path, "parallel", executor)
+    assert np.array_equal(parallelCodes, codes)
+    # Les points sont ajoutés et enregistrés dans l'ordre de la grille, comme en série
+    assert parallelExplored == explored
+    assert parallelLog == log
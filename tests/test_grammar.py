@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from Event import Call
+from MAP import MAP, CompressionSet
+from PTKE import PTKE
+from Grammar import buildRePairRules, expandSymbol, findOccurrences, getRepeats
+
+
+def applyRules(symbols:list[int], rules:dict[int, tuple[int, int]]) -> list[int]:
+    sequence:list[int] = list(symbols)
+    for symbol, pair in rules.items():
+        newSequence:list[int] = []
+        i:int = 0
+        while i < len(sequence):
+            if sequence[i:i+2] == list(pair):
+                newSequence.append(symbol)
+                i += 2
+            else:
+                newSequence.append(sequence[i])
+                i += 1
+        sequence = newSequence
+    return sequence
+
+
+def test_grammar_expands_back_to_the_sequence():
+    generator:random.Random = random.Random(0)
+    for _ in range(50):
+        symbols:list[int] = [generator.randrange(3) for _ in range(generator.randrange(0, 60))]
+        rules:dict[int, tuple[int, int]] = buildRePairRules(symbols)
+        assert all(symbol > max(symbols) for symbol in rules)
+        compressed:list[int] = applyRules(symbols, rules)
+        assert [terminal for symbol in compressed for terminal in expandSymbol(symbol, rules)] == symbols
+        # Plus aucune paire n'apparaît deux fois sans chevauchement dans la séquence compressée
+        pairs:list[tuple[int, int]] = list(zip(compressed, compressed[1:]))
+        assert all(len(findOccurrences(compressed, list(pair))) < 2 for pair in pairs)
+
+
+def test_repeats_are_found_where_they_occur():
+    generator:random.Random = random.Random(1)
+    for _ in range(50):
+        symbols:list[int] = [generator.randrange(3) for _ in range(generator.randrange(0, 60))]
+        for expansion, occurrences in getRepeats(symbols):
+            assert len(occurrences) > 1
+            assert all(symbols[start:end+1] == expansion for start, end in occurrences)
+            assert all(previous[1] < current[0] for previous, current in zip(occurrences, occurrences[1:]))
+
+
+def test_loop_body_is_a_repeat():
+    # x y puis quatre tours de la boucle 0 1 2, puis z
+    symbols:list[int] = [7, 8] + [0, 1, 2]*4 + [9]
+    assert ([0, 1, 2], [(2, 4), (5, 7), (8, 10), (11, 13)]) in getRepeats(symbols)
+
+
+def test_seeding_finds_a_loop_missed_by_the_gapped_extensions(monkeypatch:pytest.MonkeyPatch):
+    trace:list[Call] = [Call(c) for c in "IJTIJTIJTIJTIJTIJT"]
+    # Sans amorce, les extensions à trous préfèrent [IJ*T] avec ces paramètres
+    assert {str(stats.compression) for stats in MAP(trace, 1.0, 0.2, 0.8).set} == {"[IJ*T]"}
+    monkeypatch.setattr(PTKE, "GRAMMAR_SEEDING", True)
+    compressions:CompressionSet = MAP(trace, 1.0, 0.2, 0.8)
+    assert compressions.getCode("[IJT]") == 1
@@ -0,0 +1,38 @@
+import pytest
+
+import MAP
+from conftest import NESTED_LOOPS_PARAMETERS
+from Event import Event
+from MAP import CompressionSet, CompressionStats, MAPProgress, iterMAP
+
+
+def test_iter_map_yields_the_compressions_of_map(nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    results:list[tuple[CompressionStats, MAPProgress]] = list(iterMAP(trace, *NESTED_LOOPS_PARAMETERS))
+    compressions:CompressionSet = CompressionSet()
+    compressions.set.update(stats for stats, _ in results)
+    assert compressions == MAP.MAP(trace, *NESTED_LOOPS_PARAMETERS)
+    assert len(results) == len(compressions.set)
+    expanded:list[int] = [progress.rootsExpanded for _, progress in results]
+    assert expanded == sorted(expanded)
+    assert not any(progress.overTime for _, progress in results)
+
+
+def test_stopping_iter_map_early_gives_the_first_compressions(nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    full:list[str] = [str(stats.compression) for stats, _ in iterMAP(trace, *NESTED_LOOPS_PARAMETERS)]
+    first:list[str] = []
+    for stats, _ in iterMAP(trace, *NESTED_LOOPS_PARAMETERS):
+        first.append(str(stats.compression))
+        if len(first) == 5:
+            break
+    assert first == full[:5]
+
+
+def test_iter_map_ends_with_the_over_time_marker(monkeypatch:pytest.MonkeyPatch, nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    monkeypatch.setattr(MAP, "TIME_LIMIT", 0)
+    results:list[tuple[CompressionStats, MAPProgress]] = list(iterMAP(trace, *NESTED_LOOPS_PARAMETERS))
+    stats, progress = results[-1]
+    assert len(stats.compression.event_list) == 0 and progress.overTime
+    assert MAP.MAP(trace, *NESTED_LOOPS_PARAMETERS).isOverTime()
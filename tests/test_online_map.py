@@ -0,0 +1,30 @@
+from conftest import NESTED_LOOPS_PARAMETERS
+from Event import Event
+from MAP import MAP, CompressionStats, OnlineMAP, getBestCompression
+
+
+def test_appending_everything_at_once_gives_the_best_compression(nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    assert OnlineMAP(*NESTED_LOOPS_PARAMETERS).append(trace) == getBestCompression(MAP(trace, *NESTED_LOOPS_PARAMETERS))
+
+
+def test_appending_in_parts_keeps_previous_compressions(nested_loops:tuple[list[Event], str]):
+    trace, solution = nested_loops
+    online:OnlineMAP = OnlineMAP(*NESTED_LOOPS_PARAMETERS)
+    compressions:list[tuple[CompressionStats, str]] = []
+    for start in range(0, len(trace), 7):
+        stats:CompressionStats = online.append(trace[start:start+7])
+        compressions.append((stats, str(stats.compression)))
+    assert online.length == len(trace)
+    assert str(online.getCompression().compression) == solution
+    # Les compressions déjà retournées référencent les mêmes évènements que les suivantes mais ne sont pas modifiées par les ajouts
+    for stats, compression in compressions:
+        assert str(stats.compression) == compression
+
+
+def test_appending_nothing_keeps_the_compression(nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    online:OnlineMAP = OnlineMAP(*NESTED_LOOPS_PARAMETERS)
+    stats:CompressionStats = online.append(trace)
+    assert online.append([]) == stats
+    assert online.length == len(trace)
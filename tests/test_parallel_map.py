@@ -0,0 +1,44 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import pytest
+
+from conftest import NESTED_LOOPS_PARAMETERS
+from Episode import NonOverlappedEpisode
+from Event import Call, Event, Sequence
+from MAP import MAP, CompressionCache, CompressionSet, Root, getGapKey, listFusedGaps, simulateCompression
+from PTKE import PTKE
+
+
+@pytest.fixture(scope="module")
+def executor() -> Iterator[ProcessPoolExecutor]:
+    with ProcessPoolExecutor(2) as executor:
+        yield executor
+
+
+def test_executor_gives_the_serial_compressions(executor:ProcessPoolExecutor, nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    serial:CompressionSet = MAP(trace, *NESTED_LOOPS_PARAMETERS)
+    assert MAP(trace, *NESTED_LOOPS_PARAMETERS, executor=executor) == serial
+
+
+def test_distributed_frontier_gives_the_serial_compressions(executor:ProcessPoolExecutor, nested_loops:tuple[list[Event], str]):
+    trace, solution = nested_loops
+    serial:CompressionSet = MAP(trace, *NESTED_LOOPS_PARAMETERS)
+    assert MAP(trace, *NESTED_LOOPS_PARAMETERS, executor=executor, distributeFrontier=True) == serial
+    assert MAP(trace, *NESTED_LOOPS_PARAMETERS, target=solution, executor=executor, distributeFrontier=True).getCode(solution) == 1
+
+
+def test_gaps_compressed_on_an_executor_give_the_serial_root(monkeypatch:pytest.MonkeyPatch, executor:ProcessPoolExecutor):
+    gr, ws, pb = 2.0, 0.5, 1.0
+    monkeypatch.setattr(PTKE, "GAP_RATIO", gr)
+    monkeypatch.setattr(NonOverlappedEpisode, "WEIGHT_SUPPORT", ws, raising=False)
+    monkeypatch.setattr(NonOverlappedEpisode, "PROXIMITY_BALANCING", pb, raising=False)
+    root:Root = Root(Sequence())
+    root.content.isRoot = True
+    root.content.event_list = [Call(c) for c in "JIJIIIYIIIJIII"]
+    episodes:list[NonOverlappedEpisode] = [episode for episode in PTKE().getBestEpisodes(root.content.event_list) if episode.getSupport() > 1]
+    # Au moins un épisode a plusieurs traces intercalées distinctes : leurs compressions sont alors soumises à l'exécuteur
+    assert any(len({getGapKey(root.content.event_list[start:end], gr, ws, pb) for start, end in listFusedGaps(episode, gr, pb)}) > 1 for episode in episodes)
+    for episode in episodes:
+        assert simulateCompression(root, episode, gr, ws, pb, CompressionCache(), executor) == simulateCompression(root, episode, gr, ws, pb, CompressionCache())
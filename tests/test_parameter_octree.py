@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+import exploreParameters
+from conftest import fake_evaluate
+from exploreParameters import Cube, ParameterOctree, get_corners
+
+
+# Paysage de codes synthétique à deux régions : succès pour gr <= 4.8 et pb >= 0.4
+def regions() -> np.ndarray:
+    codes:np.ndarray = np.full((11, 11, 11), 2)
+    codes[:7, :, 4:] = 1
+    return codes
+
+
+def test_octree_finds_the_exhaustive_codes_with_fewer_points(monkeypatch:pytest.MonkeyPatch):
+    calls:list[exploreParameters.Point] = []
+    monkeypatch.setattr(exploreParameters, "evaluate_points", fake_evaluate(regions(), calls))
+    monkeypatch.setattr(exploreParameters, "g_resolution", (exploreParameters.g_gr_step, exploreParameters.g_ws_step, exploreParameters.g_pb_step))
+    exploreParameters.search_octree("trace", "S")
+    assert np.array_equal(exploreParameters.g_tab_parametersToBestResultPos, regions())
+    # Seules les cellules traversées par la frontière sont raffinées, chaque point n'est compressé qu'une fois
+    assert len(calls) == len(set(calls)) == len(exploreParameters.g_exploredMap) < regions().size
+
+
+def test_coarser_resolution_is_exported_on_the_grid(monkeypatch:pytest.MonkeyPatch):
+    calls:list[exploreParameters.Point] = []
+    monkeypatch.setattr(exploreParameters, "evaluate_points", fake_evaluate(regions(), calls))
+    # Résolution deux fois plus grossière que la grille selon ws : la matrice exportée reste celle de la grille
+    monkeypatch.setattr(exploreParameters, "g_resolution", (exploreParameters.g_gr_step, Decimal("0.20"), exploreParameters.g_pb_step))
+    exploreParameters.search_octree("trace", "S")
+    assert np.array_equal(exploreParameters.g_tab_parametersToBestResultPos, regions())
+
+
+def test_octree_cells_follow_the_cube_corners():
+    octree:ParameterOctree = ParameterOctree((Decimal(0), Decimal(0), Decimal(0)), (Decimal(8), Decimal(1), Decimal(1)), (Decimal("0.80"), Decimal("0.10"), Decimal("0.10")))
+    cell = octree.children[octree.root][0]
+    corners:list[exploreParameters.Point] = [octree.to_point(corner) for corner in ParameterOctree.corners(cell)]
+    cube:Cube = Cube(corners[0].gr, corners[-1].gr, corners[0].ws, corners[-1].ws, corners[0].pb, corners[-1].pb)
+    assert corners == get_corners(cube)
+    assert len(octree.children[octree.root]) == 8
+    # Une cellule d'un pas selon un axe n'est plus découpée selon cet axe
+    assert len(ParameterOctree.split(((0, 0, 0), (1, 2, 2)))) == 4
+    with pytest.raises(ValueError):
+        ParameterOctree.nb_steps(Decimal(0), Decimal(1), Decimal("0.3"))
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+import exploreParameters
+
+from conftest import NESTED_LOOPS_PARAMETERS, SWEEP_SOLUTION, SWEEP_TRACE
+from Event import Call, Event, Sequence
+from MAP import MAP, CompressionSet, CompressionStats
+from ResultStore import ResultStore, hashTrace
+
+
+@pytest.fixture
+def store(tmp_path):
+    store:ResultStore = ResultStore(str(tmp_path/ResultStore.FILE_NAME))
+    yield store
+    store.close()
+
+
+def test_stored_results_are_read_back_after_reopening(tmp_path, store:ResultStore, nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    compressions:CompressionSet = MAP(trace, *NESTED_LOOPS_PARAMETERS)
+    traceHash:str = hashTrace("".join(str(e) for e in trace))
+    store.put(traceHash, *NESTED_LOOPS_PARAMETERS, "MAP", 60, compressions)
+    assert store.get(traceHash, *NESTED_LOOPS_PARAMETERS, "MAP", 60) == compressions
+    store.close()
+    reopened:ResultStore = ResultStore(str(tmp_path/ResultStore.FILE_NAME))
+    assert reopened.get(traceHash, *NESTED_LOOPS_PARAMETERS, "MAP", 60) == compressions
+    reopened.close()
+
+
+def test_results_are_addressed_by_their_whole_key(store:ResultStore):
+    compressions:CompressionSet = MAP([Call(c) for c in "ABAB"], 1.0, 0.5, 0.5)
+    assert len(compressions.set) > 0
+    store.put(hashTrace("AB"), 1.0, 0.5, 0.5, "MAP", 60, compressions)
+    assert store.get(hashTrace("AB"), 1.0, 0.5, 0.5, "MAP", 60) == compressions
+    assert store.get(hashTrace("BA"), 1.0, 0.5, 0.5, "MAP", 60) == None
+    assert store.get(hashTrace("AB"), 2.0, 0.5, 0.5, "MAP", 60) == None
+    assert store.get(hashTrace("AB"), 1.0, 0.5, 0.5, "MAP;grammar=True", 60) == None
+    assert store.get(hashTrace("AB"), 1.0, 0.5, 0.5, "MAP", 120) == None
+
+
+def test_over_time_results_are_not_stored(store:ResultStore):
+    overTime:CompressionSet = CompressionSet()
+    overTime.set.add(CompressionStats(Sequence(), 0, 0, 0))
+    store.put(hashTrace("AB"), 1.0, 0.5, 0.5, "MAP", 60, overTime)
+    assert store.get(hashTrace("AB"), 1.0, 0.5, 0.5, "MAP", 60) == None
+
+
+def test_mean_runtime(store:ResultStore):
+    assert store.getMeanRuntime(hashTrace("AB")) == None
+    store.addRuntime(hashTrace("AB"), 1.0)
+    store.addRuntime(hashTrace("AB"), 2.0)
+    assert store.getMeanRuntime(hashTrace("AB")) == 1.5
+
+
+def test_sweep_reuses_stored_results(monkeypatch:pytest.MonkeyPatch, tmp_path, store:ResultStore, small_grid:None):
+    monkeypatch.setattr(exploreParameters, "g_store", store)
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, str(tmp_path/"first.jsonl"), "exhaustive", None)
+    codes:np.ndarray = exploreParameters.g_tab_parametersToBestResultPos.copy()
+    explored:dict[str, CompressionSet] = dict(exploreParameters.g_exploredMap)
+
+    # Une nouvelle exploration (autre fichier de résultats) ne calcule plus aucune compression
+    def noCompression(params:tuple[str, float, float, float, str]) -> CompressionSet:
+        raise AssertionError("MAP called for "+str(params[1:4]))
+    monkeypatch.setattr(exploreParameters, "compress_task", noCompression)
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, str(tmp_path/"second.jsonl"), "exhaustive", None)
+    assert np.array_equal(exploreParameters.g_tab_parametersToBestResultPos, codes)
+    assert exploreParameters.g_exploredMap == explored
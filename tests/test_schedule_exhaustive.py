@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+import exploreParameters
+
+# Deux fichiers de durées différentes, pour que l'ordonnanceur entrelace leurs points
+EXAMPLES:dict[str, tuple[str, str]] = {"short": ("AIJTIJTIJTZ", "A[IJT]Z"), "long": ("AIJLIJLTIJLIJLZ", "A[T*IJLT*]Z")}
+
+
+def run(mainDir:str) -> dict[str, bytes]:
+    os.makedirs(os.path.join(mainDir, "example", "solutions"))
+    for fileName, (trace, solution) in EXAMPLES.items():
+        with open(os.path.join(mainDir, "example", fileName+".log"), "w") as file:
+            file.write(trace)
+        with open(os.path.join(mainDir, "example", "solutions", fileName+".log"), "w") as file:
+            file.write(solution)
+    exploreParameters.run("exhaustive", list(EXAMPLES), mainDir)
+    outputs:dict[str, bytes] = {}
+    for directory in ("files_npy", "solutionsExplored"):
+        for fileName in sorted(os.listdir(os.path.join(mainDir, directory))):
+            with open(os.path.join(mainDir, directory, fileName), "rb") as file:
+                outputs[os.path.join(directory, fileName)] = file.read()
+    return outputs
+
+
+def test_scheduled_dataset_gives_the_serial_outputs(monkeypatch:pytest.MonkeyPatch, tmp_path, small_grid:None):
+    serial:dict[str, bytes] = run(str(tmp_path/"serial"))
+    assert len(serial) == 3*len(EXAMPLES)
+    monkeypatch.setattr(exploreParameters, "g_nbWorkers", 2)
+    assert run(str(tmp_path/"scheduled")) == serial
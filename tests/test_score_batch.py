@@ -0,0 +1,35 @@
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from Episode import BoundList, NonOverlappedEpisode
+from Event import Call, Sequence
+
+
+def randomEpisode(generator:random.Random) -> NonOverlappedEpisode:
+    sequence:Sequence = Sequence()
+    sequence.event_list = [Call(c) for c in "ABCD"[:generator.randrange(1, 5)]]
+    episode:NonOverlappedEpisode = NonOverlappedEpisode(sequence)
+    end:int = -1
+    for _ in range(generator.randrange(0, 8)):
+        start:int = end + 1 + generator.randrange(0, 4)
+        end = start + len(sequence.event_list) - 1 + generator.randrange(0, 3)
+        episode.boundlist.append((start, end))
+    return episode
+
+
+@pytest.mark.parametrize("ws", [0.0, 0.2, 0.5, 1.0])
+@pytest.mark.parametrize("pb", [0.0, 0.5, 0.8, 1.0])
+def test_score_all_gives_exactly_the_scores_of_get_score(monkeypatch:pytest.MonkeyPatch, ws:float, pb:float):
+    monkeypatch.setattr(NonOverlappedEpisode, "WEIGHT_SUPPORT", ws, raising=False)
+    monkeypatch.setattr(NonOverlappedEpisode, "PROXIMITY_BALANCING", pb, raising=False)
+    monkeypatch.setattr(NonOverlappedEpisode, "MAX_SUP", 8, raising=False)
+    generator:random.Random = random.Random(int(ws*10+pb*100))
+    episodes:list[NonOverlappedEpisode] = [randomEpisode(generator) for _ in range(200)]
+    expected:list[float] = [episode.getScore() for episode in copy.deepcopy(episodes)]
+    scores:np.ndarray = NonOverlappedEpisode.scoreAll(episodes)
+    # Egalité exacte : les scores en lot doivent ordonner les épisodes comme getScore
+    assert scores.tolist() == expected
+    assert [episode.getScore() for episode in episodes] == expected
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from Event import Call
+from MAP import MAP, CompressionSet
+from PTKE import PTKE
+from SuffixArray import buildLCP, buildSuffixArray, getMaximalRepeats, selectNonOverlapping
+
+
+def bruteForceMaximalRepeats(symbols:list[int], minLength:int) -> list[tuple[list[int], list[tuple[int, int]]]]:
+    n:int = len(symbols)
+    positions:dict[tuple[int, ...], list[int]] = {}
+    for length in range(minLength, n):
+        for start in range(n-length+1):
+            positions.setdefault(tuple(symbols[start:start+length]), []).append(start)
+    repeats:list[tuple[list[int], list[tuple[int, int]]]] = []
+    for pattern, starts in positions.items():
+        length:int = len(pattern)
+        if len(starts) < 2:
+            continue
+        rightMaximal:bool = any(s+length == n for s in starts) or len({symbols[s+length] for s in starts}) > 1
+        leftMaximal:bool = any(s == 0 for s in starts) or len({symbols[s-1] for s in starts}) > 1
+        occurrences:list[tuple[int, int]] = selectNonOverlapping(starts, length)
+        if rightMaximal and leftMaximal and len(occurrences) > 1:
+            repeats.append((list(pattern), occurrences))
+    return sorted(repeats, key=lambda repeat: (repeat[1][0][0], len(repeat[0])))
+
+
+def test_suffix_array_and_lcp_match_a_naive_sort():
+    generator:random.Random = random.Random(0)
+    for _ in range(50):
+        symbols:list[int] = [generator.randrange(3) for _ in range(generator.randrange(1, 40))]
+        suffixArray:list[int] = buildSuffixArray(symbols)
+        assert suffixArray == sorted(range(len(symbols)), key=lambda i: symbols[i:])
+        lcp:list[int] = buildLCP(symbols, suffixArray)
+        for i in range(1, len(symbols)):
+            a:list[int] = symbols[suffixArray[i-1]:]
+            b:list[int] = symbols[suffixArray[i]:]
+            common:int = 0
+            while common < min(len(a), len(b)) and a[common] == b[common]:
+                common += 1
+            assert lcp[i] == common
+
+
+def test_maximal_repeats_match_a_brute_force_enumeration():
+    generator:random.Random = random.Random(1)
+    for _ in range(50):
+        symbols:list[int] = [generator.randrange(3) for _ in range(generator.randrange(0, 40))]
+        for minLength in (1, 2, 3):
+            assert getMaximalRepeats(symbols, minLength) == bruteForceMaximalRepeats(symbols, minLength)
+
+
+def test_loop_body_is_a_maximal_repeat():
+    # x y puis quatre tours de la boucle 0 1 2, puis z
+    symbols:list[int] = [7, 8] + [0, 1, 2]*4 + [9]
+    assert ([0, 1, 2], [(2, 4), (5, 7), (8, 10), (11, 13)]) in getMaximalRepeats(symbols)
+
+
+def test_seeding_finds_a_loop_missed_by_the_gapped_extensions(monkeypatch:pytest.MonkeyPatch):
+    trace:list[Call] = [Call(c) for c in "IJTIJTIJTIJTIJTIJT"]
+    # Sans amorce, les extensions à trous préfèrent [IJ*T] avec ces paramètres
+    assert {str(stats.compression) for stats in MAP(trace, 1.0, 0.2, 0.8).set} == {"[IJ*T]"}
+    monkeypatch.setattr(PTKE, "SUFFIX_SEEDING", True)
+    compressions:CompressionSet = MAP(trace, 1.0, 0.2, 0.8)
+    assert compressions.getCode("[IJT]") == 1
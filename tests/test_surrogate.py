@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+import exploreParameters
+from conftest import fake_evaluate
+
+
+# Paysage de codes synthétique : succès dans une tranche 2.4 <= gr <= 3.2, pb >= 0.6 qu'aucun des points de départ (coins, milieux et centre) ne touche
+def slab() -> np.ndarray:
+    codes:np.ndarray = np.full((11, 11, 11), 2)
+    codes[3:5, :, 6:] = 1
+    return codes
+
+
+def test_surrogate_search_finds_a_success_region_missed_by_the_first_points(monkeypatch:pytest.MonkeyPatch):
+    calls:list[exploreParameters.Point] = []
+    monkeypatch.setattr(exploreParameters, "evaluate_points", fake_evaluate(slab(), calls))
+    exploreParameters.search_surrogate("trace", "S")
+    assert np.array_equal(exploreParameters.g_tab_parametersToBestResultPos, slab())
+    assert len(calls) < slab().size
+
+
+def test_surrogate_search_covers_the_grid_before_reporting_no_success(monkeypatch:pytest.MonkeyPatch):
+    codes:np.ndarray = np.full((11, 11, 11), 2)
+    calls:list[exploreParameters.Point] = []
+    monkeypatch.setattr(exploreParameters, "evaluate_points", fake_evaluate(codes, calls))
+    exploreParameters.search_surrogate("trace", "S")
+    assert np.array_equal(exploreParameters.g_tab_parametersToBestResultPos, codes)
+    assert exploreParameters.g_surrogateMinCoverage*codes.size <= len(calls) < codes.size
@@ -0,0 +1,79 @@
+import json
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+import exploreParameters
+from conftest import SWEEP_SOLUTION, SWEEP_TRACE
+from Event import Call
+from exploreParameters import SweepLog
+from MAP import MAP, CompressionSet
+
+
+def compressions(trace:str) -> CompressionSet:
+    return MAP([Call(c) for c in trace], 1.0, 0.5, 0.5)
+
+
+def test_truncated_last_line_is_dropped(tmp_path):
+    path:str = str(tmp_path/"sweep.jsonl")
+    log:SweepLog = SweepLog(path, "MAP")
+    log.write("a", Decimal("0.00"), Decimal("0.50"), Decimal("0.50"), 2, compressions("ABAB"))
+    log.write("b", Decimal("1.00"), Decimal("0.50"), Decimal("0.50"), 1, compressions("ABCABC"))
+    log.close()
+    with open(path, "rb") as file:
+        content:bytes = file.read()
+    # Exploration interrompue pendant l'écriture du second enregistrement
+    with open(path, "wb") as file:
+        file.write(content[:len(content)-10])
+    log = SweepLog(path, "MAP")
+    assert list(log.records) == ["a"] and log.records["a"] == compressions("ABAB")
+    log.write("b", Decimal("1.00"), Decimal("0.50"), Decimal("0.50"), 1, compressions("ABCABC"))
+    log.close()
+    with open(path, "rb") as file:
+        assert file.read() == content
+    reopened:SweepLog = SweepLog(path, "MAP")
+    assert list(reopened.records) == ["a", "b"]
+    reopened.close()
+
+
+def test_log_of_another_algorithm_is_restarted(tmp_path):
+    path:str = str(tmp_path/"sweep.jsonl")
+    log:SweepLog = SweepLog(path, "MAP")
+    log.write("a", Decimal("0.00"), Decimal("0.50"), Decimal("0.50"), 2, compressions("ABAB"))
+    log.close()
+    log = SweepLog(path, "MAP;grammar=True")
+    assert log.records == {}
+    log.close()
+    with open(path, "rb") as file:
+        assert file.read() == b""
+
+
+def test_interrupted_sweep_resumes_to_the_uninterrupted_results(monkeypatch:pytest.MonkeyPatch, tmp_path, small_grid:None):
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, str(tmp_path/"uninterrupted.jsonl"), "exhaustive", None)
+    codes:np.ndarray = exploreParameters.g_tab_parametersToBestResultPos.copy()
+
+    # Interruption après 40 compressions
+    compressTask = exploreParameters.compress_task
+    calls:list[tuple[str, float, float, float, str]] = []
+    limit:list[int] = [40]
+    def interruptedTask(params:tuple[str, float, float, float, str]) -> CompressionSet:
+        if len(calls) == limit[0]:
+            raise KeyboardInterrupt
+        calls.append(params)
+        return compressTask(params)
+    monkeypatch.setattr(exploreParameters, "compress_task", interruptedTask)
+    path:str = str(tmp_path/"interrupted.jsonl")
+    with pytest.raises(KeyboardInterrupt):
+        exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, path, "exhaustive", None)
+    # La reprise ne recalcule pas les points déjà enregistrés
+    calls.clear()
+    limit[0] = -1
+    exploreParameters.sweep(SWEEP_TRACE, SWEEP_SOLUTION, path, "exhaustive", None)
+    assert len(calls) == exploreParameters.g_nbPoints**3-40
+    assert np.array_equal(exploreParameters.g_tab_parametersToBestResultPos, codes)
+    with open(tmp_path/"uninterrupted.jsonl", "rb") as uninterrupted, open(path, "rb") as resumed:
+        assert resumed.read() == uninterrupted.read()
+    exploreParameters.convert_to_legacy(path, str(tmp_path/"legacy.txt"))
+    with open(tmp_path/"legacy.txt", encoding="utf-8") as legacy:
+        assert list(json.load(legacy)) == list(exploreParameters.g_exploredMap)
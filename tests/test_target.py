@@ -0,0 +1,23 @@
+from conftest import NESTED_LOOPS_PARAMETERS
+from Event import Event
+from MAP import MAP, CompressionSet, getSymbols
+
+
+def test_target_run_finds_the_solution_of_the_full_run(nested_loops:tuple[list[Event], str]):
+    trace, solution = nested_loops
+    full:CompressionSet = MAP(trace, *NESTED_LOOPS_PARAMETERS)
+    targeted:CompressionSet = MAP(trace, *NESTED_LOOPS_PARAMETERS, target=solution)
+    assert full.getCode(solution) == targeted.getCode(solution) == 1
+    assert len(targeted.set) < len(full.set)
+    # L'arrêt anticipé n'invente aucune compression : chacune est aussi produite par l'exploration complète
+    assert {str(stats.compression) for stats in targeted.set} <= {str(stats.compression) for stats in full.set}
+
+
+def test_target_with_foreign_symbols_prunes_the_whole_exploration(nested_loops:tuple[list[Event], str]):
+    trace, _ = nested_loops
+    # Le symbole "#" n'apparaît pas dans la trace : aucune racine ne peut mener à la cible, aucune n'est donc développée
+    assert len(MAP(trace, *NESTED_LOOPS_PARAMETERS, target="A#Z").set) == 0
+
+
+def test_get_symbols_ignores_structure():
+    assert getSymbols("A[[IJL][TSM]]Z") == frozenset("AIJLTSMZ")